@@ -1,11 +1,15 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
-"""Lean package extraction helpers for subprocess workers."""
+"""Lean package extraction helpers for subprocess workers and downloads."""
 
 from __future__ import annotations
 
+import bz2
 import os
 import pickle
+import queue
+import struct
+import threading
 
 # This module is imported in each spawned extraction worker. Keep imports here
 # limited to the standard library; importing conda runtime state defeats the
@@ -16,6 +20,7 @@ def extract_conda_package_archive(
     source_full_path: str | os.PathLike,
     destination_directory: str | os.PathLike,
     *,
+    components: str | None = None,
     ensure_picklable_errors: bool = False,
 ) -> None:
     """Extract a conda package archive without importing conda runtime state.
@@ -23,6 +28,8 @@ def extract_conda_package_archive(
     Args:
         source_full_path: Package archive to extract.
         destination_directory: Directory to extract into.
+        components: Only extract the ``"info"`` or ``"pkg"`` component of a
+            ``.conda`` archive.
         ensure_picklable_errors: Replace exceptions that cannot survive a pickle
             round trip with a plain ``RuntimeError``.
     """
@@ -32,6 +39,7 @@ def extract_conda_package_archive(
         conda_package_handling.api.extract(
             os.fspath(source_full_path),
             dest_dir=os.fspath(destination_directory),
+            components=components,
         )
     except Exception as error:
         if not ensure_picklable_errors:
@@ -43,3 +51,193 @@ def extract_conda_package_archive(
             error_type = f"{type(error).__module__}.{type(error).__qualname__}"
             raise RuntimeError(f"{error_type}: {error}") from None
         raise
+
+
+#: Chunks buffered between a download and its streaming extraction; downloading
+#: waits for extraction beyond this.
+STREAM_QUEUE_CHUNKS = 256
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_ZIP_DATA_DESCRIPTOR_FLAG = 0x08
+_ZIP_STORED = 0
+_ZIP64_LIMIT = 0xFFFFFFFF
+
+
+class StreamingExtraction:
+    """Extract a package archive on a thread from the bytes of its download.
+
+    The downloading thread passes every chunk it writes to :meth:`feed`; the
+    extraction thread reads them from a bounded queue, so that a download waits
+    for its extraction instead of buffering the archive in memory. A ``.tar.bz2``
+    is a compressed tar stream. The members of a ``.conda`` zip are stored
+    uncompressed, in order, each behind a local file header, so its zstd
+    compressed tarballs are extracted without the central directory at the end
+    of the archive.
+
+    Anything that cannot be followed as a stream, e.g. bytes that do not continue
+    the previous ones (a resumed or retried download) or zip members that are
+    compressed, fails the extraction; :meth:`close` then returns False and the
+    downloaded archive has to be extracted the usual way.
+    """
+
+    def __init__(
+        self,
+        source_full_path: str | os.PathLike,
+        destination_directory: str | os.PathLike,
+    ):
+        self.source_full_path = os.fspath(source_full_path)
+        self.destination_directory = os.fspath(destination_directory)
+        self.error: BaseException | None = None
+        self._offset = 0
+        self._closed = False
+        self._queue: queue.Queue[bytes | None] = queue.Queue(STREAM_QUEUE_CHUNKS)
+        self._buffer = b""
+        self._eof = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"extract {os.path.basename(self.source_full_path)}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def feed(self, offset: int, data: bytes) -> None:
+        """Pass ``data``, written at ``offset`` of the archive, to the extraction."""
+        if self._closed or not data:
+            return
+        if offset != self._offset:
+            self._fail(
+                ValueError(f"expected bytes at offset {self._offset}, got {offset}")
+            )
+            return
+        self._offset += len(data)
+        self._queue.put(data)
+
+    def close(self) -> bool:
+        """
+        Signal the end of the archive, wait for the extraction to finish and
+        return whether it succeeded.
+        """
+        self._end()
+        self._thread.join()
+        return self.error is None
+
+    def _end(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+
+    def _fail(self, error: BaseException) -> None:
+        if self.error is None:
+            self.error = error
+        self._end()
+
+    def _run(self) -> None:
+        try:
+            from conda_package_streaming.extract import extract_stream
+            from conda_package_streaming.package_streaming import tar_generator
+
+            if self.source_full_path.endswith(".conda"):
+                self._extract_conda(extract_stream, tar_generator)
+            elif self.source_full_path.endswith(".tar.bz2"):
+                with bz2.BZ2File(self) as reader:
+                    extract_stream(tar_generator(reader), self.destination_directory)
+            else:
+                raise ValueError(f"cannot stream {self.source_full_path}")
+        except BaseException as error:
+            if self.error is None:
+                self.error = error
+        # consume the rest, e.g. the zip central directory, so feed() never blocks
+        while not self._eof:
+            self.read()
+
+    def _extract_conda(self, extract_stream, tar_generator) -> None:
+        from conda_package_streaming.package_streaming import zstd
+
+        if zstd is None:
+            raise RuntimeError("Cannot unpack `.conda` without zstd support")
+        stem = os.path.basename(self.source_full_path)[: -len(".conda")]
+        components = set()
+        while True:
+            header = self._read_exact(_ZIP_LOCAL_HEADER.size, eof_ok=True)
+            if not header.startswith(_ZIP_LOCAL_HEADER_SIGNATURE):
+                break  # the central directory follows the members
+            fields = _ZIP_LOCAL_HEADER.unpack(header)
+            flags, method = fields[2:4]
+            size, file_size, name_length, extra_length = fields[7:]
+            name = self._read_exact(name_length).decode()
+            extra = self._read_exact(extra_length)
+            if flags & _ZIP_DATA_DESCRIPTOR_FLAG or method != _ZIP_STORED:
+                raise ValueError(f"cannot stream zip member {name}")
+            if size == _ZIP64_LIMIT:
+                size = _zip64_compressed_size(extra, file_size == _ZIP64_LIMIT)
+            member = _MemberReader(self, size)
+            component = name.partition("-")[0]
+            if component in ("info", "pkg") and name.startswith(f"{component}-{stem}"):
+                extract_stream(
+                    tar_generator(zstd.open(member)), self.destination_directory
+                )
+                components.add(component)
+            member.read()  # the rest of the member, e.g. after the end of the tar
+        if components != {"info", "pkg"}:
+            raise LookupError(f"missing components in {self.source_full_path}")
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes of the archive, waiting until they arrive."""
+        while not self._buffer and not self._eof:
+            data = self._queue.get()
+            if data is None:
+                self._eof = True
+            else:
+                self._buffer = data
+        if size < 0 or size >= len(self._buffer):
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def _read_exact(self, size: int, eof_ok: bool = False) -> bytes:
+        data = b""
+        while len(data) < size:
+            if not (chunk := self.read(size - len(data))):
+                if eof_ok and not data:
+                    return data
+                raise EOFError(f"truncated archive {self.source_full_path}")
+            data += chunk
+        return data
+
+
+class _MemberReader:
+    """Read the ``size`` bytes of a zip member from a :class:`StreamingExtraction`."""
+
+    def __init__(self, stream: StreamingExtraction, size: int):
+        self._stream = stream
+        self._remaining = size
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            chunks = []
+            while self._remaining:
+                chunks.append(self.read(self._remaining))
+            return b"".join(chunks)
+        data = self._stream.read(min(size, self._remaining))
+        if not data and self._remaining and size:
+            raise EOFError("truncated zip member")
+        self._remaining -= len(data)
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+
+def _zip64_compressed_size(extra: bytes, has_file_size: bool) -> int:
+    """Return the compressed size from the zip64 extra field of a local header."""
+    while len(extra) >= 4:
+        tag, length = struct.unpack_from("<HH", extra)
+        if tag == 0x0001:
+            return struct.unpack_from("<Q", extra, 4 + 8 * has_file_size)[0]
+        extra = extra[4 + length :]
+    raise ValueError("zip64 extra field not found")
@@ -18,6 +18,7 @@ from ..zstd import capped_decompress
 from .shards import ZSTD_MAX_SHARD_SIZE
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
     from pathlib import Path
 
     from .typing import ShardDict
@@ -45,6 +46,15 @@ class AnnotatedRawShard:
     compressed_shard: bytes
 
 
+def decode_shard(compressed_shard: bytes) -> ShardDict:
+    """
+    Decompress and unpack a shard as stored in the cache.
+    """
+    return msgpack.loads(
+        capped_decompress(compressed_shard, max_output_size=ZSTD_MAX_SHARD_SIZE)
+    )  # type: ignore
+
+
 def connect(dburi="cache.db"):
     """
     Get database connection.
@@ -155,34 +165,38 @@ class ShardCache:
     def retrieve(self, url) -> ShardDict | None:
         with self.conn as c:
             row = c.execute("SELECT shard FROM shards WHERE url = ?", (url,)).fetchone()
-            return (
-                msgpack.loads(
-                    capped_decompress(row["shard"], max_output_size=ZSTD_MAX_SHARD_SIZE)
-                )
-                if row
-                else None
-            )  # type: ignore
+            return decode_shard(row["shard"]) if row else None
 
-    def retrieve_multiple(self, urls: list[str]) -> dict[str, ShardDict | None]:
+    def retrieve_multiple_raw(self, urls: list[str]) -> dict[str, bytes]:
         """
         Query database for cached shard urls.
 
-        Return a dict of urls in cache mapping to the Shard or None if not present.
+        Return a dict of urls in cache mapping to the compressed shard; urls not
+        in the cache are left out. Decode with decode_shard().
         """
         if not urls:
             return {}  # this optimization does not save a noticeable amount of time.
 
         query = f"SELECT url, shard FROM shards WHERE url IN ({','.join(('?',) * len(urls))}) ORDER BY url"
         with self.conn as c:
-            result: dict[str, ShardDict | None] = {
-                row["url"]: msgpack.loads(
-                    capped_decompress(row["shard"], max_output_size=ZSTD_MAX_SHARD_SIZE)
-                )
-                if row
-                else None
-                for row in c.execute(query, urls)  # type: ignore
-            }
-            return result
+            return {row["url"]: row["shard"] for row in c.execute(query, urls)}
+
+    def retrieve_multiple(
+        self, urls: list[str], executor: Executor | None = None
+    ) -> dict[str, ShardDict | None]:
+        """
+        Query database for cached shard urls.
+
+        Return a dict of urls in cache mapping to the Shard or None if not present.
+
+        Args:
+            urls: shard urls to look up.
+            executor: if given, decode shards on its workers instead of serially.
+        """
+        raw = self.retrieve_multiple_raw(urls)
+        if executor is None or len(raw) < 2:
+            return {url: decode_shard(shard) for url, shard in raw.items()}
+        return dict(zip(raw, executor.map(decode_shard, raw.values())))
 
     def clear_cache(self):
         """
@@ -14,7 +14,9 @@ from __future__ import annotations
 
 import functools
 import logging
+import os
 import queue
+import sys
 from contextlib import suppress
 from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse, urlunparse, uses_relative
@@ -40,6 +42,9 @@ _URLJOIN_SAFE_SCHEMES = frozenset(uses_relative)
 
 SHARDS_CONNECTIONS_DEFAULT = 10
 
+# decoding shards stops scaling well beyond a handful of threads
+SHARDS_DECODE_THREADS_MAX = 8
+
 
 def _shards_connections() -> int:
     """
@@ -59,6 +64,22 @@ def _shards_connections() -> int:
     return SHARDS_CONNECTIONS_DEFAULT
 
 
+def _shards_decode_threads() -> int:
+    """
+    Number of threads used to decompress and unpack shards read from the
+    cache. Use context.default_threads if set.
+
+    zstd releases the GIL but msgpack does not, and unpacking dominates, so
+    extra threads only pay off on free-threaded Python; there we use one thread
+    per CPU up to SHARDS_DECODE_THREADS_MAX, otherwise a single thread.
+    """
+    if context.default_threads is not None:
+        return context.default_threads
+    if getattr(sys, "_is_gil_enabled", lambda: True)():
+        return 1
+    return min(os.cpu_count() or 1, SHARDS_DECODE_THREADS_MAX)
+
+
 def _safe_urljoin_with_slash(base_url: str, relative_url: str = "") -> str:
     """
     Join base_url with relative_url, ensuring proper handling of all URL schemes.
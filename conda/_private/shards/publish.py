@@ -0,0 +1,229 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""
+Publish a channel subdir's monolithic repodata as sharded repodata.
+
+Channels that only serve ``repodata.json`` (file:// channels, internal mirrors)
+are otherwise re-split into per-package shards in memory by ``ShardLike`` on
+every run. Writing ``repodata_shards.msgpack.zst`` plus one content-addressed
+``<sha256>.msgpack.zst`` file per package next to ``repodata.json`` lets
+``fetch_shards_index`` find them, and lets ``ShardCache`` share the shards between
+environments like for any other sharded channel.
+
+Publishing is incremental: a shard whose content did not change since the last
+run keeps its file and digest and is not compressed again.
+
+Usage::
+
+    python -m conda._private.shards.publish /path/to/channel/linux-64
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import msgpack
+
+from conda.base.constants import REPODATA_FN, REPODATA_SHARDS_FN
+from conda.common.serialize import json
+from conda.gateways.disk.update import atomic_write
+
+from .. import zstd
+from .shards import ZSTD_MAX_SHARD_INDEX_SIZE, ZSTD_MAX_SHARD_SIZE, split_repodata
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .typing import PackageRecordDict, RepodataDict, ShardDict, ShardsIndexDict
+
+log = logging.getLogger(__name__)
+
+#: zstd level for newly written shards; they are written once and read many times.
+SHARDS_COMPRESSION_LEVEL = 16
+
+SHARD_FILENAME_RE = re.compile(r"^[0-9a-f]{64}\.msgpack\.zst$")
+
+
+@dataclass
+class PublishResult:
+    """
+    Summary of a :func:`publish_shards` run.
+    """
+
+    index_path: Path
+    written: list[str] = field(default_factory=list)  # packages with new shards
+    reused: list[str] = field(default_factory=list)  # packages with unchanged shards
+    removed: list[str] = field(default_factory=list)  # stale shard filenames
+
+
+def _pack_shard(shard: ShardDict) -> bytes:
+    """
+    Serialize a shard the way sharded channels do: records sorted by filename,
+    checksums as raw bytes instead of hex strings.
+    """
+
+    def pack_record(record: PackageRecordDict) -> PackageRecordDict:
+        record = {**record}
+        for hash_type in "sha256", "md5":
+            if isinstance(hash_value := record.get(hash_type), str):
+                try:
+                    record[hash_type] = bytes.fromhex(hash_value)
+                except ValueError:
+                    pass  # leave malformed checksums alone
+        return record
+
+    return msgpack.dumps(
+        {
+            group: {fn: pack_record(shard[group][fn]) for fn in sorted(shard[group])}
+            for group in ("packages", "packages.conda")
+        }
+    )
+
+
+def _read_shards_index(index_path: Path) -> ShardsIndexDict | None:
+    try:
+        return msgpack.loads(
+            zstd.capped_decompress(
+                index_path.read_bytes(), max_output_size=ZSTD_MAX_SHARD_INDEX_SIZE
+            )
+        )  # type: ignore
+    except FileNotFoundError:
+        return None
+    except (ValueError, zstd.ZstdError, msgpack.UnpackException) as e:
+        log.warning("Ignoring unreadable shards index %s: %s", index_path, e)
+        return None
+
+
+def _read_packed_shard(path: Path) -> bytes | None:
+    try:
+        return zstd.capped_decompress(
+            path.read_bytes(), max_output_size=ZSTD_MAX_SHARD_SIZE
+        )
+    except (OSError, zstd.ZstdError):
+        return None
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write data next to path and move it into place, so that a concurrent reader
+    never sees a partial file.
+    """
+    with atomic_write(path, "wb") as f:
+        f.write(data)
+
+
+def publish_shards(
+    subdir_path: Path | str,
+    repodata: RepodataDict | None = None,
+    shards_base_url: str = "",
+    prune: bool = True,
+    level: int = SHARDS_COMPRESSION_LEVEL,
+) -> PublishResult:
+    """
+    Write ``repodata_shards.msgpack.zst`` and per-package shards for a subdir.
+
+    Args:
+        subdir_path: local directory of a channel subdir, e.g. ``channel/linux-64``.
+        repodata: parsed repodata; read from ``<subdir_path>/repodata.json`` if None.
+        shards_base_url: directory for shards, relative to ``subdir_path``; stored
+            in the index as ``info.shards_base_url``.
+        prune: remove shard files that the new index no longer references.
+        level: zstd compression level for newly written shards.
+
+    Returns:
+        A :class:`PublishResult` listing written, reused and removed shards.
+    """
+    subdir_path = Path(subdir_path)
+    if repodata is None:
+        repodata = json.loads((subdir_path / REPODATA_FN).read_bytes())
+
+    shards_dir = subdir_path / shards_base_url
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    index_path = subdir_path / REPODATA_SHARDS_FN
+    result = PublishResult(index_path)
+
+    previous = _read_shards_index(index_path)
+    previous_shards: dict[str, bytes] = {}
+    if previous and previous.get("info", {}).get("shards_base_url", "") == (
+        shards_base_url
+    ):
+        previous_shards = previous.get("shards", {})
+
+    digests: dict[str, bytes] = {}
+    for package, shard in sorted(split_repodata(repodata).items()):
+        packed = _pack_shard(shard)
+
+        if (digest := previous_shards.get(package)) is not None:
+            shard_path = shards_dir / f"{bytes(digest).hex()}.msgpack.zst"
+            if _read_packed_shard(shard_path) == packed:
+                digests[package] = bytes(digest)
+                result.reused.append(package)
+                continue
+
+        compressed = zstd.compress(packed, level=level)
+        digest = hashlib.sha256(compressed).digest()
+        shard_path = shards_dir / f"{digest.hex()}.msgpack.zst"
+        if not shard_path.exists():
+            _write_atomic(shard_path, compressed)
+        digests[package] = digest
+        result.written.append(package)
+
+    info = repodata.get("info", {})
+    shards_index: ShardsIndexDict = {
+        "info": {
+            **info,
+            "base_url": info.get("base_url", ""),
+            "shards_base_url": shards_base_url,
+            "subdir": info.get("subdir", subdir_path.name),
+        },
+        "version": 1,
+        "shards": digests,
+    }
+    _write_atomic(index_path, zstd.compress(msgpack.dumps(shards_index)))
+
+    if prune:
+        referenced = {f"{digest.hex()}.msgpack.zst" for digest in digests.values()}
+        for path in shards_dir.iterdir():
+            if SHARD_FILENAME_RE.match(path.name) and path.name not in referenced:
+                path.unlink()
+                result.removed.append(path.name)
+
+    log.debug(
+        "Published %s: %d shards written, %d reused, %d removed",
+        index_path,
+        len(result.written),
+        len(result.reused),
+        len(result.removed),
+    )
+    return result
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m conda._private.shards.publish",
+        description="Publish the repodata.json of channel subdirs as shards.",
+    )
+    parser.add_argument("subdirs", nargs="+", type=Path, metavar="SUBDIR")
+    parser.add_argument("--shards-base-url", default="")
+    parser.add_argument("--no-prune", dest="prune", action="store_false")
+    args = parser.parse_args(argv)
+
+    for subdir_path in args.subdirs:
+        result = publish_shards(
+            subdir_path, shards_base_url=args.shards_base_url, prune=args.prune
+        )
+        print(
+            f"{result.index_path}: {len(result.written)} written, "
+            f"{len(result.reused)} reused, {len(result.removed)} removed"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,9 @@ import abc
 import concurrent.futures
 import json  # noqa
 import logging
+import mmap
 from collections import defaultdict
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import msgpack
@@ -22,6 +24,7 @@ from conda.base.constants import REPODATA_SHARDS_FN
 from conda.base.context import context
 from conda.core.subdir_data import SubdirData
 from conda.gateways.connection.session import get_session
+from conda.gateways.disk.update import atomic_write
 from conda.gateways.repodata import (
     FORMAT_JSON,
     FORMAT_SHARDS,
@@ -36,6 +39,7 @@ from .misc import (
     _is_http_error_most_400_codes,
     _safe_urljoin_with_slash,
     _shards_connections,
+    _shards_decode_threads,
     ensure_hex_hash,
     spec_to_package_name,
 )
@@ -48,7 +52,7 @@ if TYPE_CHECKING:
 
     from requests import Response
 
-    from conda.gateways.repodata import RepodataCache
+    from conda.gateways.repodata import RepodataCache, RepodataState
 
     from .typing import RepodataDict, ShardDict, ShardsIndexDict
 
@@ -61,6 +65,10 @@ ZSTD_MAX_SHARD_INDEX_SIZE = (
     2**23 * 16
 )  # maximum size necessary when compressed data has no size header
 
+# per-package grouping of a cached repodata.json, see write_shardlike_index()
+SHARDLIKE_INDEX_SUFFIX = ".shardlike"
+SHARDLIKE_INDEX_MAGIC = b"CONDASL1"
+
 
 # For reference, the largest shard "conda-forge/linux-64/vim" is 2608283 bytes
 # or < 2**19*5 decompressed (486155 bytes compressed); the index is 575219 bytes
@@ -249,6 +257,21 @@ def shard_mentioned_packages(
     yield from extra
 
 
+def split_repodata(repodata: ShardDict) -> dict[str, ShardDict]:
+    """
+    Split the "packages" and "packages.conda" groups of monolithic repodata into
+    per-package-name shards. Records are shared with the input, not copied.
+    """
+    shards = defaultdict(lambda: {"packages": {}, "packages.conda": {}})
+
+    for group_name in ("packages", "packages.conda"):
+        for package, record in repodata.get(group_name, {}).items():
+            shards[record["name"]][group_name][package] = record
+
+    # defaultdict behavior no longer wanted
+    return dict(shards)  # type: ignore
+
+
 class ShardBase(abc.ABC):
     """
     Abstract base class for shard-like objects.
@@ -385,21 +408,9 @@ class ShardLike(ShardBase):
             "packages": {},
             "packages.conda": {},
         }
-        all_packages = {
-            "packages": repodata.get("packages", {}),
-            "packages.conda": repodata.get("packages.conda", {}),
-        }
         self.url = url
 
-        shards = defaultdict(lambda: {"packages": {}, "packages.conda": {}})
-
-        for group_name, group in all_packages.items():
-            for package, record in group.items():
-                name = record["name"]
-                shards[name][group_name][package] = record
-
-        # defaultdict behavior no longer wanted
-        self.shards: dict[str, ShardDict] = dict(shards)  # type: ignore
+        self.shards: dict[str, ShardDict] = split_repodata(repodata)
 
         # used to write out repodata subset
         self.visited: dict[str, ShardDict | None] = {}
@@ -449,6 +460,160 @@ class ShardLike(ShardBase):
         return shard
 
 
+class IndexedShardLike(ShardLike):
+    """
+    A ``ShardLike`` read from a sidecar file written by :func:`write_shardlike_index`
+    next to the cached ``repodata.json``.
+
+    Only the small header (package names and byte ranges) is read up front; each
+    package's shard is decoded from its byte range the first time it is visited,
+    so neither the JSON is parsed nor all records regrouped. The file is mapped
+    once, so the byte ranges keep referring to the file they were read from even
+    if the sidecar is replaced meanwhile.
+    """
+
+    def __init__(self, data: mmap.mmap, header: dict, data_offset: int, url: str = ""):
+        self.repodata_no_packages: RepodataDict = header["repodata_no_packages"]
+        self.url = url
+        self._base_url = header["base_url"]
+        self._data = data
+        self._data_offset = data_offset
+        self._ranges: dict[str, tuple[int, int]] = header["ranges"]
+
+        # decoded shards
+        self.shards: dict[str, ShardDict] = {}
+
+        # used to write out repodata subset
+        self.visited: dict[str, ShardDict | None] = {}
+
+    @property
+    def package_names(self) -> KeysView[str]:
+        return self._ranges.keys()
+
+    def shard_url(self, package: str) -> str:
+        """
+        Return shard URL for a given package.
+
+        Raise KeyError if package is not in the index.
+        """
+        self._ranges[package]
+        return f"{self.url}#{package}"
+
+    def shard_loaded(self, package: str) -> bool:
+        """
+        Return True if the given package's shard can be visited without a fetch.
+        """
+        return package in self._ranges
+
+    def visit_package(self, package: str) -> ShardDict:
+        """
+        Decode the package's shard if necessary, and mark as visited.
+        """
+        shard = self.shards.get(package)
+        if shard is None:
+            start = self._data_offset + self._ranges[package][0]
+            end = start + self._ranges[package][1]
+            shard = self.shards[package] = msgpack.loads(self._data[start:end])
+        self.visited[package] = shard
+        return shard
+
+
+def _shardlike_index_key(state: RepodataState) -> list | None:
+    """
+    Identify the cached repodata.json a sidecar index was built from, or None
+    if the cache state does not record it.
+
+    Prefer the server's validators: the cache file itself is rewritten (with a
+    new mtime) on every fetch of a file:// channel even when it did not change.
+    """
+    if state.etag or state.mod:
+        return [state.etag, state.mod, state.get("size")]
+    elif mtime_ns := state.get("mtime_ns"):
+        return [mtime_ns, state.get("size")]
+    return None
+
+
+def write_shardlike_index(path: Path, shardlike: ShardLike, key: list) -> None:
+    """
+    Persist the per-package grouping of a ShardLike as
+    ``MAGIC, header length, msgpack header, concatenated msgpack shards``.
+    """
+    ranges = {}
+    blobs = []
+    offset = 0
+    for package, shard in shardlike.shards.items():
+        blob = msgpack.dumps(shard)
+        ranges[package] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+    header = msgpack.dumps(
+        {
+            "key": key,
+            "repodata_no_packages": shardlike.repodata_no_packages,
+            "base_url": shardlike._base_url,
+            "ranges": ranges,
+        }
+    )
+
+    with atomic_write(path, "wb") as f:
+        f.write(SHARDLIKE_INDEX_MAGIC)
+        f.write(len(header).to_bytes(8, "big"))
+        f.write(header)
+        f.writelines(blobs)
+
+
+def read_shardlike_index(path: Path, key: list, url: str) -> IndexedShardLike | None:
+    """
+    Return an IndexedShardLike if the sidecar at path exists and was built from
+    the repodata identified by key, else None.
+    """
+    header_offset = len(SHARDLIKE_INDEX_MAGIC) + 8
+    try:
+        with path.open("rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[: len(SHARDLIKE_INDEX_MAGIC)] != SHARDLIKE_INDEX_MAGIC:
+            return None
+        header_length = int.from_bytes(
+            data[len(SHARDLIKE_INDEX_MAGIC) : header_offset], "big"
+        )
+        header = msgpack.loads(data[header_offset : header_offset + header_length])
+    except (OSError, ValueError, msgpack.UnpackException) as e:
+        # an empty file cannot be mapped (ValueError)
+        if not isinstance(e, FileNotFoundError):
+            log.debug("Ignoring unreadable ShardLike index %s: %s", path, e)
+        return None
+    if header.get("key") != key:
+        return None
+    return IndexedShardLike(data, header, header_offset + header_length, url)
+
+
+def load_shardlike(sd: SubdirData, url: str) -> ShardLike:
+    """
+    Fetch (or load from cache) a subdir's monolithic repodata as a ShardLike.
+
+    The per-package grouping is persisted next to the repodata cache and reused
+    while the cached repodata.json is unchanged.
+    """
+    fetch = sd.repo_fetch
+    raw_repodata, state = fetch.fetch_latest()
+    index_path = fetch.cache_path_json.with_suffix(SHARDLIKE_INDEX_SUFFIX)
+
+    key = _shardlike_index_key(state)
+    if key and (found := read_shardlike_index(index_path, key, url)):
+        log.debug("Using ShardLike index %s for %s", index_path, url)
+        return found
+
+    if isinstance(raw_repodata, str):
+        raw_repodata = json.loads(raw_repodata)
+    shardlike = ShardLike(raw_repodata, url)
+    if key:
+        try:
+            write_shardlike_index(index_path, shardlike, key)
+        except OSError as e:
+            log.debug("Could not write ShardLike index %s: %s", index_path, e)
+    return shardlike
+
+
 def _shards_base_url(url, shards_base_url) -> str:
     """
     Return shards_base_url joined with base_url and url.
@@ -779,7 +944,12 @@ def batch_retrieve_from_cache(
                     result.append(ShardFetch(shardlike, package_name, shard_cache))
         return result
 
-    from_cache = shard_cache.retrieve_multiple([shard_url for *_, shard_url in wanted])
+    urls = [shard_url for *_, shard_url in wanted]
+    if (decode_threads := _shards_decode_threads()) > 1:
+        with concurrent.futures.ThreadPoolExecutor(decode_threads) as executor:
+            from_cache = shard_cache.retrieve_multiple(urls, executor)
+    else:
+        from_cache = shard_cache.retrieve_multiple(urls)
 
     # add fetched Shard objects to Shards objects visited dict
     needs_network = []
@@ -855,19 +1025,17 @@ def fetch_channels(url_to_channel: dict[str, Channel]) -> dict[str, ShardBase] |
             # Skip classic when has_repodata_json is False until
             # CHECK_ALTERNATE_FORMAT_INTERVAL (should_check_format) expires
             if cache.state.should_check_format(FORMAT_JSON):
-                futures_non_sharded[
-                    executor.submit(sd.repo_fetch.fetch_latest_parsed)
-                ] = channel_url
+                # the filename is not strictly repodata.json since we could have
+                # fetched the same data from repodata.json.zst; but makes the
+                # urljoin consistent with shards which end with
+                # /repodata_shards.msgpack.zst
+                url = f"{channel_url}/repodata.json"
+                futures_non_sharded[executor.submit(load_shardlike, sd, url)] = (
+                    channel_url
+                )
 
         for future in concurrent.futures.as_completed(futures_non_sharded):
             channel_url = futures_non_sharded[future]
-            repodata_json, _ = future.result()
-            # the filename is not strictly repodata.json since we could have
-            # fetched the same data from repodata.json.zst; but makes the
-            # urljoin consistent with shards which end with
-            # /repodata_shards.msgpack.zst
-            url = f"{channel_url}/repodata.json"
-            found = ShardLike(repodata_json, url)
-            channel_data[channel_url] = found
+            channel_data[channel_url] = future.result()
 
     return {url: shard for url, shard in channel_data.items() if shard is not None}
@@ -64,12 +64,14 @@ import msgpack
 
 import conda.gateways.repodata
 from conda.base.context import context
+from conda.common.tracing import span
 
 from ..zstd import capped_decompress
 from . import cache
 from .cache import AnnotatedRawShard
 from .misc import (
     _shards_connections,
+    _shards_decode_threads,
     combine_batches_until_none,
     exception_to_queue,
     filter_redundant_packages,
@@ -584,7 +586,8 @@ def build_repodata_subset(
         None if there are no shards available, or a mapping of channel URL's to
         ShardBase objects where build_repodata() returns the computed subset.
     """
-    channel_data = fetch_channels(channels)
+    with span("shards_fetch_channels", "repodata", channels=len(channels)):
+        channel_data = fetch_channels(channels)
     if channel_data is not None:
         subset = RepodataSubset(
             (*channel_data.values(),),
@@ -592,7 +595,9 @@ def build_repodata_subset(
             repodata_version=repodata_version,
             depth=depth,
         )
-        subset.reachable(root_packages, strategy=algorithm)
+        with span("shards_traversal", "repodata", strategy=algorithm) as s:
+            subset.reachable(root_packages, strategy=algorithm)
+            s.set(nodes=subset.node_count)
         log.debug("%d (channel, package) nodes discovered", subset.node_count)
 
     return channel_data
@@ -626,10 +631,19 @@ class QueueCache:
         return
 
 
+def _decode_shards(
+    rows: Sequence[tuple[NodeId, bytes]],
+) -> list[tuple[NodeId, ShardDict]]:
+    """
+    Decode a chunk of cached shards; run on cache_fetch_thread's decode pool.
+    """
+    return [(node_id, cache.decode_shard(raw)) for node_id, raw in rows]
+
+
 @exception_to_queue
 def cache_fetch_thread(
     in_queue: Queue[Sequence[NodeId] | None],
-    shard_out_queue: Queue[Sequence[tuple[NodeId, ShardDict] | Exception]],
+    shard_out_queue: Queue[Sequence[tuple[NodeId, ShardDict]] | Exception],
     network_out_queue: Queue[Sequence[NodeId] | None],
     cache: ShardCache,
 ):
@@ -637,7 +651,14 @@ def cache_fetch_thread(
     Fetch batches of shards from cache until in_queue sees None. Enqueue found
     shards to shard_out_queue, and not found shards to network_out_queue.
 
-    When we see None on in_queue, send None to both out queues and exit.
+    Compressed shards are read from the database on this thread, but decoded in
+    chunks on a pool of _shards_decode_threads() workers; each chunk is sent to
+    shard_out_queue as soon as it is ready, so the traversal can continue while
+    the rest of a large batch is decoded. Cache misses are forwarded before
+    decoding starts.
+
+    When we see None on in_queue, wait for pending decodes, send None to the
+    network queue and exit.
 
     Args:
         in_queue: NodeId (URLs) to fetch.
@@ -646,7 +667,20 @@ def cache_fetch_thread(
             network_fetch_thread's in_queue.
         cache: used to retrieve shards.
     """
-    with cache.copy() as cache:
+
+    def result_to_out_queue(future: Future):
+        try:
+            shard_out_queue.put(future.result())
+        except Exception as e:  # a corrupt shard; raise in the main thread
+            shard_out_queue.put(e)
+
+    decode_threads = _shards_decode_threads()
+    with (
+        cache.copy() as cache,
+        ThreadPoolExecutor(
+            max_workers=decode_threads, thread_name_prefix="shard-decode"
+        ) as executor,
+    ):
         for batch in combine_batches_until_none(in_queue):
             node_ids = []
             for item in batch:
@@ -655,24 +689,31 @@ def cache_fetch_thread(
                     cache.insert(item)
                 else:
                     node_ids.append(item)
-            cached = cache.retrieve_multiple(
+            cached = cache.retrieve_multiple_raw(
                 [node_id.shard_url for node_id in node_ids]
             )
 
-            # should we add this into retrieve_multiple?
-            found: list[tuple[NodeId, ShardDict]] = []
+            found: list[tuple[NodeId, bytes]] = []
             not_found: list[NodeId] = []
             for node_id in node_ids:
-                if shard := cached.get(node_id.shard_url):
-                    found.append((node_id, shard))
+                if raw := cached.get(node_id.shard_url):
+                    found.append((node_id, raw))
                 else:
                     not_found.append(node_id)
 
             # Might wake up the network thread by calling it first:
             if not_found:
                 network_out_queue.put(not_found)
-            if found:
-                shard_out_queue.put(found)
+            if len(found) == 1:
+                # not worth a round trip through the pool
+                shard_out_queue.put(_decode_shards(found))
+            elif found:
+                # a few chunks per worker balances uneven shard sizes
+                chunk_size = -(-len(found) // (decode_threads * 4))
+                for i in range(0, len(found), chunk_size):
+                    executor.submit(
+                        _decode_shards, found[i : i + chunk_size]
+                    ).add_done_callback(result_to_out_queue)
 
     network_out_queue.put(None)
     # no shard_out_queue.put(None); this is during mainloop shutdown.
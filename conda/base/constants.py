@@ -327,6 +327,7 @@ class SatSolverChoice(ValueEnum):
     PYCOSAT = "pycosat"
     PYCRYPTOSAT = "pycryptosat"
     PYSAT = "pysat"
+    PORTFOLIO = "portfolio"
 
 
 DEFAULT_SOLVER: Final = "libmamba"
@@ -326,6 +326,12 @@ class Context(Configuration):
     use_index_cache = ParameterLoader(PrimitiveParameter(False))
 
     separate_format_cache = ParameterLoader(PrimitiveParameter(False))
+    prefix_rewrite_cache_max_mb = ParameterLoader(
+        PrimitiveParameter(0, element_type=int)
+    )
+    extract_while_downloading = ParameterLoader(PrimitiveParameter(False))
+    deduplicate_extracted_files = ParameterLoader(PrimitiveParameter(False))
+    delete_in_background = ParameterLoader(PrimitiveParameter(False))
 
     _root_prefix = ParameterLoader(
         PrimitiveParameter(""), aliases=("root_dir", "root_prefix")
@@ -534,6 +540,7 @@ class Context(Configuration):
 
     unsatisfiable_hints = ParameterLoader(PrimitiveParameter(True))
     unsatisfiable_hints_check_depth = ParameterLoader(PrimitiveParameter(2))
+    unsatisfiable_hints_timeout_secs = ParameterLoader(PrimitiveParameter(0.0))
 
     # conda_build
     bld_path = ParameterLoader(PrimitiveParameter(""))
@@ -1389,6 +1396,10 @@ class Context(Configuration):
             "shortcuts_only",
             "non_admin_enabled",
             "separate_format_cache",
+            "prefix_rewrite_cache_max_mb",
+            "extract_while_downloading",
+            "deduplicate_extracted_files",
+            "delete_in_background",
             "verify_threads",
             "execute_threads",
         ),
@@ -1415,6 +1426,7 @@ class Context(Configuration):
             "verbosity",
             "unsatisfiable_hints",
             "unsatisfiable_hints_check_depth",
+            "unsatisfiable_hints_timeout_secs",
             "number_channel_notices",
             "envvars_force_uppercase",
             "export_platforms",
@@ -1505,7 +1517,9 @@ class Context(Configuration):
             always_copy=dals(
                 """
                 Register a preference that files be copied into a prefix during install rather
-                than hard-linked.
+                than hard-linked. Where the file system supports it (e.g. btrfs, XFS, APFS),
+                files are copied as reflinks, which share their data with the package cache
+                until either is modified.
                 """
             ),
             always_softlink=dals(
@@ -1919,6 +1933,9 @@ class Context(Configuration):
                 """
                 Threads to use when downloading and reading repodata.  When not set,
                 defaults to None, which uses the default ThreadPoolExecutor behavior.
+                Sharded repodata is downloaded with this many threads (10 when not
+                set), and each HTTP session keeps at least this many connections per
+                host alive.
                 """
             ),
             report_errors=dals(
@@ -1950,10 +1967,52 @@ class Context(Configuration):
                 to True.
                 """
             ),
+            prefix_rewrite_cache_max_mb=dals(
+                """
+                Size limit, in megabytes, of a cache of files with their prefix
+                rewritten in the 'prefix_rewrites' directory of the package cache.
+                Files installed again into the same prefix are then hard linked from
+                the cache instead of being rewritten; the least recently used ones
+                are removed beyond the limit. Useful when environments are recreated
+                at the same path many times, e.g. in CI. Disabled when 0 (the
+                default).
+                """
+            ),
+            extract_while_downloading=dals(
+                """
+                Extract .conda and .tar.bz2 packages downloaded from a channel while
+                their bytes arrive, instead of reading the archive again once it is
+                written. The extracted package is only added to the package cache
+                after the checksum of the whole archive is verified; anything that
+                cannot be streamed, e.g. a resumed download, is extracted the usual
+                way.
+                """
+            ),
+            deduplicate_extracted_files=dals(
+                """
+                Hard link the files of extracted packages that are identical to files
+                of other packages, as recorded by the sha256 values of their
+                info/paths.json, to a single copy in the 'blobs' directory of the
+                package cache. Saves disk space in package caches holding many
+                builds of the same packages. 'conda clean --deduplicate' does the same
+                for the packages already in the cache.
+                """
+            ),
+            delete_in_background=dals(
+                """
+                Move the files of unlinked packages and the packages removed by
+                'conda clean' into a '.trash' directory of their environment or
+                package cache, and delete them on background threads, so that
+                removing large packages does not delay the transaction. Whatever is
+                left when conda exits is deleted the next time.
+                """
+            ),
             extra_safety_checks=dals(
                 """
                 Spend extra time validating package contents.  Currently, runs sha256 verification
-                on every file within each package during installation.
+                on every file within each package during installation.  The sha256 values
+                of extracted packages are remembered in the package cache until their
+                files change.
                 """
             ),
             signing_metadata_url_base=dals(
@@ -2059,6 +2118,13 @@ class Context(Configuration):
                 longer the generation of the unsat hint will take. Defaults to 3.
                 """
             ),
+            unsatisfiable_hints_timeout_secs=dals(
+                """
+                The maximum number of seconds to spend searching for unsatisfiable
+                dependencies. Once exceeded, the conflicts found so far are reported. A
+                value of 0 (the default) means no limit.
+                """
+            ),
             solver=dals(
                 """
                 A string to choose between the different solver logics implemented in
@@ -2133,8 +2199,10 @@ def reset_context(
     context.__init__(search_path, argparse_args)
     context.__dict__.pop("_Context__conda_build", None)
     from ..models.channel import Channel
+    from ..models.version import spec_cache_clear
 
     Channel._reset_state()
+    spec_cache_clear()
 
     # need to import here to avoid circular dependency
 
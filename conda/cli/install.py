@@ -397,10 +397,16 @@ def install(args, parser, command="install"):
                 raise e
 
     defer_json = context.json and bool(env.external_packages)
+    solve_stats = getattr(solver, "solve_stats", None)
 
     conda_actions = (
         handle_txn(
-            unlink_link_transaction, prefix, args, newenv, defer_json_success=defer_json
+            unlink_link_transaction,
+            prefix,
+            args,
+            newenv,
+            defer_json_success=defer_json,
+            solve_stats=solve_stats,
         )
         or {}
     )
@@ -434,7 +440,9 @@ def install(args, parser, command="install"):
         PrefixData(prefix).set_environment_env_vars(env.variables)
 
     if defer_json:
-        common.stdout_json_success(prefix=prefix, actions=conda_actions)
+        common.stdout_json_success(
+            prefix=prefix, actions=conda_actions, **_solver_stats_json(solve_stats)
+        )
 
 
 def install_clone(args, parser):
@@ -541,6 +549,13 @@ def revert_actions(prefix, revision=-1, index: Index | None = None):
     return UnlinkLinkTransaction(setup)
 
 
+def _solver_stats_json(solve_stats) -> dict:
+    """Return the ``solver_stats`` entry of the JSON output, if there are stats."""
+    if solve_stats is None:
+        return {}
+    return {"solver_stats": solve_stats.dump()}
+
+
 def handle_txn(
     unlink_link_transaction,
     prefix,
@@ -548,6 +563,7 @@ def handle_txn(
     newenv,
     remove_op=False,
     defer_json_success=False,
+    solve_stats=None,
 ) -> dict | None:
     """
     Handles executing an unlink_link_transaction, and reporting changes. If `defer_json_success`
@@ -561,7 +577,9 @@ def handle_txn(
     :param remove_op: defaults to false, boolean noting that the user is requesting to remove
                       a package from the environment
     :param defer_json_success: when true, will return the set of actions executed in dict form
+    :param solve_stats: ``Solver.solve_stats`` of the solve, included in JSON output
     """
+    stats_json = _solver_stats_json(solve_stats)
     if unlink_link_transaction.nothing_to_do:
         if remove_op:
             # No packages found to remove from environment
@@ -571,7 +589,7 @@ def handle_txn(
                 if defer_json_success:
                     return {}
                 common.stdout_json_success(
-                    message="All requested packages already installed."
+                    message="All requested packages already installed.", **stats_json
                 )
             else:
                 print("\n# All requested packages already installed.\n")
@@ -583,7 +601,9 @@ def handle_txn(
 
     elif context.dry_run:
         actions = unlink_link_transaction._make_legacy_action_groups()[0]
-        common.stdout_json_success(prefix=prefix, actions=actions, dry_run=True)
+        common.stdout_json_success(
+            prefix=prefix, actions=actions, dry_run=True, **stats_json
+        )
         raise DryRunExit()
 
     try:
@@ -609,4 +629,4 @@ def handle_txn(
         actions = unlink_link_transaction._make_legacy_action_groups()[0]
         if defer_json_success:
             return actions
-        common.stdout_json_success(prefix=prefix, actions=actions)
+        common.stdout_json_success(prefix=prefix, actions=actions, **stats_json)
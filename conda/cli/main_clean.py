@@ -3,12 +3,14 @@
 """CLI implementation for `conda clean`.
 
 Removes cached package tarballs, index files, package metadata, temporary files, and log files.
+Deduplicates the files of extracted packages.
 """
 
 from __future__ import annotations
 
 import os
 import sys
+from collections import Counter
 from logging import getLogger
 from os.path import isdir, join
 from typing import TYPE_CHECKING
@@ -96,6 +98,14 @@ def configure_parser(sub_parsers: _SubParsersAction, **kwargs) -> ArgumentParser
         action="store_true",
         help="Remove log files.",
     )
+    removal_target_options.add_argument(
+        "--deduplicate",
+        action="store_true",
+        help="Hard link identical files of extracted packages in writable package "
+        "caches to a single copy, and remove the copies no package uses anymore. "
+        "Files linked into environments are left alone. This option is not included "
+        "with the --all flag.",
+    )
 
     add_output_and_prompt_options(p)
 
@@ -104,10 +114,10 @@ def configure_parser(sub_parsers: _SubParsersAction, **kwargs) -> ArgumentParser
     return p
 
 
-def _get_size(*parts: str, warnings: list[str] | None) -> int:
+def _lstat(*parts: str, warnings: list[str] | None) -> os.stat_result:
     path = join(*parts)
     try:
-        stat = os.lstat(path)
+        return os.lstat(path)
     except OSError as e:
         if warnings is None:
             raise
@@ -115,13 +125,16 @@ def _get_size(*parts: str, warnings: list[str] | None) -> int:
 
         # let the user deal with the issue
         raise NotImplementedError
-    else:
-        # TODO: This doesn't handle packages that have hard links to files within
-        # themselves, like bin/python3.3 and bin/python3.3m in the Python package
-        if stat.st_nlink > 1:
-            raise NotImplementedError
 
-        return stat.st_size
+
+def _get_size(*parts: str, warnings: list[str] | None) -> int:
+    stat = _lstat(*parts, warnings=warnings)
+    # TODO: This doesn't handle packages that have hard links to files within
+    # themselves, like bin/python3.3 and bin/python3.3m in the Python package
+    if stat.st_nlink > 1:
+        raise NotImplementedError
+
+    return stat.st_size
 
 
 def _get_pkgs_dirs(pkg_sizes: dict[str, dict[str, int]]) -> dict[str, tuple[str, ...]]:
@@ -132,12 +145,14 @@ def _get_total_size(pkg_sizes: dict[str, dict[str, int]]) -> int:
     return sum(sum(pkgs.values()) for pkgs in pkg_sizes.values())
 
 
-def _rm_rf(*parts: str, quiet: bool, verbose: bool) -> None:
-    from ..gateways.disk.delete import rm_rf
+def _rm_rf(
+    *parts: str, quiet: bool, verbose: bool, trash_dir: str | None = None
+) -> None:
+    from ..gateways.disk.delete import rm_rf, rm_rf_in_background
 
     path = join(*parts)
     try:
-        if rm_rf(path):
+        if rm_rf(path) if trash_dir is None else rm_rf_in_background(path, trash_dir):
             if not quiet and verbose:
                 print(f"Removed {path}")
         elif not quiet:
@@ -181,9 +196,23 @@ def find_tarballs() -> dict[str, Any]:
 
 
 def find_pkgs() -> dict[str, Any]:
+    from ..core.content_store import CONTENT_STORE_DIRNAME, ContentStore
+
     warnings: list[str] = []
     pkg_sizes: dict[str, dict[str, int]] = {}
     for pkgs_dir in find_pkgs_dirs():
+        # deduplicated files are also linked from the content store and from other
+        # packages; links within the package cache do not mean a package is in use
+        store = ContentStore(join(pkgs_dir, CONTENT_STORE_DIRNAME))
+        cache_links = {}
+        for blob in store.blobs():
+            try:
+                stat = blob.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            cache_links[(stat.st_dev, stat.st_ino)] = 1
+        pkg_stats: dict[str, list[os.stat_result]] = {}
+
         # pkgs are directories in pkgs_dir
         _, pkgs, _ = next(os.walk(pkgs_dir))
         for pkg in pkgs:
@@ -191,17 +220,50 @@ def find_pkgs() -> dict[str, Any]:
             if not isdir(join(pkgs_dir, pkg, "info")):
                 continue
 
-            # get size
             try:
-                size = sum(
-                    _get_size(root, file, warnings=warnings)
+                pkg_stats[pkg] = stats = [
+                    _lstat(root, file, warnings=warnings)
                     for root, _, files in os.walk(join(pkgs_dir, pkg))
                     for file in files
-                )
+                ]
             except NotImplementedError:
-                pass
-            else:
-                pkg_sizes.setdefault(pkgs_dir, {})[pkg] = size
+                continue
+            if cache_links:
+                for stat in stats:
+                    if (inode := (stat.st_dev, stat.st_ino)) in cache_links:
+                        cache_links[inode] += 1
+
+        # TODO: This doesn't handle packages that have hard links to files within
+        # themselves, like bin/python3.3 and bin/python3.3m in the Python package
+        unused = {
+            pkg: stats
+            for pkg, stats in pkg_stats.items()
+            if all(
+                stat.st_nlink <= cache_links.get((stat.st_dev, stat.st_ino), 1)
+                for stat in stats
+            )
+        }
+        # a deduplicated file is only released with the last package linking to it
+        # (its blob is removed along with the packages); count it once, if at all
+        unused_links = Counter(
+            (stat.st_dev, stat.st_ino)
+            for stats in unused.values()
+            for stat in stats
+            if stat.st_nlink > 1
+        )
+        counted = set()
+        for pkg, stats in unused.items():
+            size = 0
+            for stat in stats:
+                if stat.st_nlink > 1:
+                    inode = (stat.st_dev, stat.st_ino)
+                    if inode in counted or stat.st_nlink > unused_links[inode] + (
+                        inode in cache_links
+                    ):
+                        continue
+                    counted.add(inode)
+                size += stat.st_size
+            pkg_sizes.setdefault(pkgs_dir, {})[pkg] = size
 
     return {
         "warnings": warnings,
@@ -223,6 +285,12 @@ def rm_pkgs(
     name: str,
 ) -> None:
     from ..base.context import context
+    from ..core.content_store import CONTENT_STORE_DIRNAME, ContentStore
+    from ..gateways.disk.delete import (
+        TRASH_DIRNAME,
+        empty_trash_dir,
+        wait_for_background_deletion,
+    )
     from ..reporters import confirm_yn
     from ..utils import human_bytes
 
@@ -256,9 +324,52 @@ def rm_pkgs(
     if not context.json or not context.always_yes:
         confirm_yn()
 
+    # with delete_in_background, packages are moved into the trash directory of
+    # their package cache and deleted in parallel
     for pkgs_dir, pkgs in pkg_sizes.items():
+        trash_dir = join(pkgs_dir, TRASH_DIRNAME)
+        empty_trash_dir(trash_dir)
+        for pkg in pkgs:
+            _rm_rf(pkgs_dir, pkg, quiet=quiet, verbose=verbose, trash_dir=trash_dir)
+    wait_for_background_deletion()
+
+    # release the deduplicated files that were only linked from removed packages
+    for pkgs_dir in pkg_sizes:
+        removed = ContentStore(join(pkgs_dir, CONTENT_STORE_DIRNAME)).remove_unused()
+        if removed and not quiet and verbose:
+            print(f"Removed {removed} unused file(s) from {pkgs_dir}")
+
+
+def deduplicate_pkgs(*, quiet: bool, verbose: bool, dry_run: bool) -> dict[str, Any]:
+    from ..core.content_store import CONTENT_STORE_DIRNAME, ContentStore
+    from ..utils import human_bytes
+
+    result = {"packages": 0, "saved_size": 0, "removed_blobs": 0}
+    for pkgs_dir in find_pkgs_dirs():
+        store = ContentStore(join(pkgs_dir, CONTENT_STORE_DIRNAME))
+        # pkgs are directories in pkgs_dir with an info directory
+        _, pkgs, _ = next(os.walk(pkgs_dir))
+        pkgs = [pkg for pkg in pkgs if isdir(join(pkgs_dir, pkg, "info"))]
+        result["packages"] += len(pkgs)
+        if dry_run:
+            continue
         for pkg in pkgs:
-            _rm_rf(pkgs_dir, pkg, quiet=quiet, verbose=verbose)
+            saved_size = store.add_package(join(pkgs_dir, pkg))
+            if saved_size and not quiet and verbose:
+                print(f"Deduplicated {human_bytes(saved_size)} of {pkg}")
+            result["saved_size"] += saved_size
+        result["removed_blobs"] += store.remove_unused()
+
+    if not quiet:
+        if dry_run:
+            print(f"Will deduplicate the files of {result['packages']} package(s).")
+        else:
+            print(
+                f"Deduplicated the files of {result['packages']} package(s), saving "
+                f"{human_bytes(result['saved_size'])}; removed "
+                f"{result['removed_blobs']} unused file(s)."
+            )
+    return result
 
 
 def find_index_cache() -> list[str]:
@@ -376,6 +487,7 @@ def _execute(args, parser):
         or args.packages
         or args.tempfiles
         or args.logfiles
+        or args.deduplicate
     ):
         from ..exceptions import ArgumentError
 
@@ -404,6 +516,10 @@ def _execute(args, parser):
         json_result["logfiles"] = logs = find_logfiles()
         rm_items(logs, **kwargs, name="logfile(s)")
 
+    # after --packages, so that the files of removed packages are not kept
+    if args.deduplicate:
+        json_result["deduplicate"] = deduplicate_pkgs(**kwargs)
+
     return json_result
 
 
@@ -151,7 +151,11 @@ def execute(args: Namespace, parser: ArgumentParser) -> int:
         CondaValueError,
         PackagesNotFoundError,
     )
-    from ..gateways.disk.delete import path_is_clean, rm_rf
+    from ..gateways.disk.delete import (
+        path_is_clean,
+        rm_rf,
+        wait_for_background_deletion,
+    )
     from ..models.match_spec import MatchSpec
     from .common import check_non_admin, specs_from_args
     from .install import handle_txn
@@ -215,6 +219,8 @@ def execute(args: Namespace, parser: ArgumentParser) -> int:
                         default="no",
                         dry_run=False,
                     )
+                # the unlinked files may still be deleted in the background
+                wait_for_background_deletion()
                 rm_rf(prefix)
                 unregister_env(prefix)
 
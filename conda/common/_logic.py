@@ -1,7 +1,11 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 import sys
+import time
 from array import array
+from collections import Counter
+from functools import cache
+from importlib.util import find_spec
 from itertools import combinations
 from logging import DEBUG, getLogger
 
@@ -240,6 +244,156 @@ _sat_solver_str_to_cls = {
     "pysat": _PySatSolver,
 }
 
+
+@cache
+def _sat_backend_available(sat_solver_str):
+    """Return whether the Python module backing a SAT solver interface is importable."""
+    return find_spec(sat_solver_str) is not None
+
+
+def _portfolio_worker(sat_solver_str, clause_bytes, m, limit, queue):
+    """
+    Solve the clauses (given as the bytes of a flat, 0-terminated int array) with
+    one backend and put `(sat_solver_str, solution, conclusive)` on the queue;
+    `conclusive` is None if the backend failed.
+    """
+    try:
+        clause_array = _ClauseArray()
+        clause_array.as_array().frombytes(clause_bytes)
+        sat_solver = _sat_solver_str_to_cls[sat_solver_str]()
+        sat_solver.add_clauses(clause_array.as_list())
+        sat_solution = sat_solver.invoke(sat_solver.setup(m, limit=limit))
+        # pycosat reports "UNKNOWN" when the propagation limit is hit; any other
+        # answer (a solution or UNSAT) is final.
+        conclusive = not (isinstance(sat_solution, str) and sat_solution == "UNKNOWN")
+        queue.put((sat_solver_str, sat_solver.process_solution(sat_solution), conclusive))
+    except Exception:
+        queue.put((sat_solver_str, None, None))
+
+
+class _PortfolioSatSolver(_SatSolver):
+    """
+    Run all available SAT backends in parallel processes on the same clauses and
+    take the first conclusive answer, terminating the others.
+
+    Spawning processes and shipping the clauses costs far more than solving small
+    instances, so below `min_clause_count` the first available backend runs
+    in-process instead. It also does if every backend process fails, e.g. because
+    it crashed or was killed.
+    """
+
+    backends = tuple(_sat_solver_str_to_cls)
+    min_clause_count = 50_000
+    # seconds between checks whether the backend processes are still alive
+    poll_interval = 0.5
+    worker = staticmethod(_portfolio_worker)
+
+    def __init__(self, **run_kwargs):
+        super().__init__(**run_kwargs)
+        # Number of solves won by each backend; useful for tuning `sat_solver`.
+        self.winners = Counter()
+
+    def setup(self, m, limit=0, **kwargs):
+        backends = [name for name in self.backends if _sat_backend_available(name)]
+        if not backends:
+            raise RuntimeError("No SAT backend available for the portfolio.")
+        return m, limit, backends
+
+    def invoke(self, setup):
+        m, limit, backends = setup
+        start = time.monotonic()
+        if len(backends) == 1 or self.get_clause_count() < self.min_clause_count:
+            winner, sat_solution = self._solve_in_process(m, limit, backends[0])
+        else:
+            winner, sat_solution, failed = self._race(m, limit, backends)
+            if winner is None and failed == len(backends):
+                log.debug("SAT portfolio: all backends failed; solving in-process")
+                winner, sat_solution = self._solve_in_process(m, limit, backends[0])
+            elif winner is None:
+                log.debug("SAT portfolio: no backend gave a conclusive answer")
+                return None
+        self.winners[winner] += 1
+        log.debug(
+            "SAT portfolio answer from '%s' after %.3fs", winner, time.monotonic() - start
+        )
+        return sat_solution
+
+    def _solve_in_process(self, m, limit, backend):
+        sat_solver = _sat_solver_str_to_cls[backend]()
+        sat_solver.add_clauses(self._clauses.as_list())
+        sat_solution = sat_solver.process_solution(
+            sat_solver.invoke(sat_solver.setup(m, limit=limit))
+        )
+        return backend, sat_solution
+
+    def _race(self, m, limit, backends):
+        """
+        Return the first backend with a conclusive answer and that answer, or None
+        and None, and the number of backends that failed.
+        """
+        import multiprocessing
+        from queue import Empty
+
+        # "spawn" avoids forking a (possibly multi-threaded) conda process.
+        mp_context = multiprocessing.get_context("spawn")
+        queue = mp_context.Queue()
+        clause_bytes = self._clauses.as_array().tobytes()
+        processes = [
+            mp_context.Process(
+                target=self.worker,
+                args=(name, clause_bytes, m, limit, queue),
+                daemon=True,
+            )
+            for name in backends
+        ]
+        for process in processes:
+            process.start()
+        winner, sat_solution, failed = None, None, 0
+        # backends may repeat; track the processes that have not answered
+        pending = dict(enumerate(processes))
+        names = dict(enumerate(backends))
+        try:
+            while pending:
+                try:
+                    name, solution, conclusive = queue.get(timeout=self.poll_interval)
+                except Empty:
+                    # a worker that exited normally has put its answer on the queue;
+                    # one that died (segfault, OOM kill) never will
+                    for idx, process in tuple(pending.items()):
+                        if not process.is_alive() and process.exitcode != 0:
+                            log.debug(
+                                "SAT portfolio backend '%s' died with exit code %s",
+                                names[idx],
+                                process.exitcode,
+                            )
+                            del pending[idx]
+                            failed += 1
+                    continue
+                idx = next((idx for idx in pending if names[idx] == name), None)
+                if idx is None:
+                    continue
+                del pending[idx]
+                if conclusive:
+                    winner, sat_solution = name, solution
+                    break
+                if conclusive is None:
+                    failed += 1
+                log.debug("SAT portfolio backend '%s' gave no conclusive answer", name)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            queue.close()
+        return winner, sat_solution, failed
+
+    def process_solution(self, sat_solution):
+        return sat_solution
+
+
+_sat_solver_str_to_cls["portfolio"] = _PortfolioSatSolver
+
 _sat_solver_cls_to_str = {cls: string for string, cls in _sat_solver_str_to_cls.items()}
 
 
@@ -251,6 +405,8 @@ class Clauses:
     def __init__(self, m=0, sat_solver_str=_sat_solver_cls_to_str[_PycoSatSolver]):
         self.unsat = False
         self.m = m
+        # number of SAT solver invocations, reported in solver statistics
+        self.sat_calls = 0
 
         try:
             sat_solver_cls = _sat_solver_str_to_cls[sat_solver_str]
@@ -655,6 +811,7 @@ class Clauses:
                 if not additional[-1]:
                     return None
                 self.add_clauses(additional)
+        self.sat_calls += 1
         solution = self._run_sat(self.m, limit=limit)
         if additional and (solution is None or not includeIf):
             self._sat_solver.restore_state(saved_state)
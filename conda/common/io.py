@@ -596,6 +596,11 @@ def get_instrumentation_record_file() -> str:
     )
 
 
+@deprecated(
+    "27.3",
+    "27.9",
+    addendum="Use `conda.common.tracing.span` or `conda.common.tracing.traced`.",
+)
 class time_recorder(ContextDecorator):  # pragma: no cover
     """Context decorator for recording execution times to a CSV file."""
 
@@ -671,6 +676,11 @@ class time_recorder(ContextDecorator):  # pragma: no cover
             os.makedirs(dirname(self.record_file))
 
 
+@deprecated(
+    "27.3",
+    "27.9",
+    addendum="Use `python -m conda.common.tracing <trace file>` instead.",
+)
 def print_instrumentation_data() -> None:  # pragma: no cover
     """Print aggregated instrumentation data from the record file as JSON."""
     record_file = get_instrumentation_record_file()
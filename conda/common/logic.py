@@ -31,6 +31,7 @@ from itertools import chain
 
 from ._logic import FALSE, TRUE
 from ._logic import Clauses as _Clauses
+from .tracing import span
 
 # TODO: We may want to turn the user-facing {TRUE,FALSE} values into an Enum and
 #       hide the _logic.{TRUE,FALSE} values as an implementation detail.
@@ -43,18 +44,24 @@ FALSE = FALSE
 PycoSatSolver = "pycosat"
 PyCryptoSatSolver = "pycryptosat"
 PySatSolver = "pysat"
+PortfolioSatSolver = "portfolio"
 
 
 class Clauses:
     def __init__(self, m=0, sat_solver=PycoSatSolver):
         self.names = {}
         self.indices = {}
+        self.sat_solver = sat_solver
         self._clauses = _Clauses(m=m, sat_solver_str=sat_solver)
 
     @property
     def m(self):
         return self._clauses.m
 
+    @property
+    def sat_calls(self):
+        return self._clauses.sat_calls
+
     @property
     def unsat(self):
         return self._clauses.unsat
@@ -265,7 +272,12 @@ class Clauses:
         literals = self._convert(list(objective.keys()))
         coeffs = list(objective.values())
 
-        return self._clauses.minimize(literals, coeffs, bestsol=bestsol, trymax=trymax)
+        with span("minimize", "solver", terms=len(literals), trymax=trymax) as s:
+            solution, value = self._clauses.minimize(
+                literals, coeffs, bestsol=bestsol, trymax=trymax
+            )
+            s.set(value=value)
+        return solution, value
 
 
 def minimal_unsatisfiable_subset(clauses, sat, explicit_specs):
@@ -293,20 +305,26 @@ def minimal_unsatisfiable_subset(clauses, sat, explicit_specs):
         # we succeeded, so we'll add the spec to our future constraints
         working_set = set(explicit_specs)
 
-    for spec in set(clauses) - working_set:
-        if (
-            sat(
-                working_set
-                | {
-                    spec,
-                },
-                True,
-            )
-            is None
-        ):
-            found_conflicts.add(spec)
+    # Adding the candidates one at a time costs one SAT call per spec. Since
+    # satisfiability is monotone (every subset of a satisfiable set is
+    # satisfiable), a whole run of candidates that is satisfiable together with
+    # the working set would have been accepted one by one as well.  So we try
+    # runs at once and only bisect the runs that fail, which yields the same
+    # result with O(k log n) SAT calls for k conflicts among n candidates.
+    pending = [list(set(clauses) - working_set)]
+    while pending:
+        candidates = pending.pop()
+        if not candidates:
+            continue
+        if sat(working_set | set(candidates), True) is not None:
+            # we succeeded, so we'll add the specs to our future constraints
+            working_set.update(candidates)
+        elif len(candidates) == 1:
+            found_conflicts.add(candidates[0])
         else:
-            # we succeeded, so we'll add the spec to our future constraints
-            working_set.add(spec)
+            half = len(candidates) // 2
+            # process the first half before the second one
+            pending.append(candidates[half:])
+            pending.append(candidates[:half])
 
     return found_conflicts
@@ -0,0 +1,335 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""Hierarchical tracing of conda operations.
+
+Spans nest per thread: a span opened while another one is open on the same
+thread becomes its child, so a trace shows where the time of e.g. a solve goes
+(repodata fetch, shard traversal, index reduction, clause generation, each
+``minimize`` pass) rather than only its total.
+
+Tracing is disabled by default; :func:`span` then returns a shared no-op object
+and costs one global lookup. Enable it for a process with the
+``CONDA_TRACE_FILE`` environment variable::
+
+    CONDA_TRACE_FILE=trace.json conda create -n test python
+
+At exit the trace is written as Chrome trace-event JSON, which can be opened in
+https://ui.perfetto.dev or ``chrome://tracing``, and a summary table is logged
+at the INFO level. ``python -m conda.common.tracing trace.json`` prints the
+summary table of a written trace.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from functools import wraps
+from logging import getLogger
+from time import perf_counter_ns
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from typing import Any, TypeVar
+
+    T = TypeVar("T")
+
+log = getLogger(__name__)
+
+#: Environment variable naming the file a trace is written to at exit.
+TRACE_FILE_ENV = "CONDA_TRACE_FILE"
+
+_tracer: Tracer | None = None
+
+
+class _NullSpan:
+    """The span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed region of a :class:`Tracer`; use as a context manager."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start", "child_time")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+        self.child_time = 0
+
+    def set(self, **args: Any) -> None:
+        """Attach arguments, e.g. sizes or results, to the span."""
+        self.args.update(args)
+
+    def __enter__(self) -> Span:
+        self.tracer._stack().append(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        end = perf_counter_ns()
+        stack = self.tracer._stack()
+        stack.pop()
+        duration = end - self.start
+        if stack:
+            stack[-1].child_time += duration
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self, duration)
+
+
+class Tracer:
+    """Collects the spans and counters of all threads of a process."""
+
+    def __init__(self):
+        self.origin = perf_counter_ns()
+        self.pid = os.getpid()
+        # (name, category, tid, start, duration, self time, args); nanoseconds
+        self.spans: list[tuple[str, str, int, int, int, int, dict]] = []
+        # (name, tid, timestamp, values)
+        self.counters: list[tuple[str, int, int, dict]] = []
+        self.thread_names: dict[int, str] = {}
+        self._local = threading.local()
+
+    def _stack(self) -> list[Span]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = stack = []
+            thread = threading.current_thread()
+            self.thread_names[thread.ident] = thread.name
+            return stack
+
+    def _record(self, span: Span, duration: int) -> None:
+        self.spans.append(
+            (
+                span.name,
+                span.category,
+                threading.get_ident(),
+                span.start - self.origin,
+                duration,
+                duration - span.child_time,
+                span.args,
+            )
+        )
+
+    def span(self, name: str, category: str = "conda", **args: Any) -> Span:
+        return Span(self, name, category, args)
+
+    def counter(self, name: str, **values: float) -> None:
+        self._stack()  # register the thread name
+        self.counters.append(
+            (name, threading.get_ident(), perf_counter_ns() - self.origin, values)
+        )
+
+    def chrome_trace(self) -> dict:
+        """Return the trace in the Chrome trace-event format."""
+        events: list[dict] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in self.thread_names.items()
+        ]
+        for name, category, tid, start, duration, _, args in self.spans:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start / 1e3,
+                "dur": duration / 1e3,
+                "pid": self.pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = {key: _jsonable(value) for key, value in args.items()}
+            events.append(event)
+        for name, tid, timestamp, values in self.counters:
+            events.append(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": timestamp / 1e3,
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": values,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str | os.PathLike) -> None:
+        """Write :meth:`chrome_trace` to path as JSON."""
+        from .serialize import json
+
+        with open(path, "w") as fh:
+            fh.write(json.dumps(self.chrome_trace(), indent=None))
+
+    def summary(self) -> str:
+        """Return a table of calls and total, self and mean time per span name."""
+        return format_summary(
+            (name, duration, self_time)
+            for name, _, _, _, duration, self_time, _ in self.spans
+        )
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def format_summary(spans: Iterable[tuple[str, int, int]]) -> str:
+    """
+    Format (name, duration, self time) triples, in nanoseconds, as a table
+    sorted by total time.
+    """
+    totals: dict[str, list[int]] = {}
+    for name, duration, self_time in spans:
+        total = totals.setdefault(name, [0, 0, 0])
+        total[0] += 1
+        total[1] += duration
+        total[2] += self_time
+    width = max((len(name) for name in totals), default=4)
+    lines = [
+        f"{'span':<{width}} {'calls':>7} {'total ms':>11} {'self ms':>11}"
+        f" {'mean ms':>10}"
+    ]
+    for name, (calls, duration, self_time) in sorted(
+        totals.items(), key=lambda item: item[1][1], reverse=True
+    ):
+        lines.append(
+            f"{name:<{width}} {calls:>7} {duration / 1e6:>11.3f}"
+            f" {self_time / 1e6:>11.3f} {duration / calls / 1e6:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def span(name: str, category: str = "conda", **args: Any) -> Span | _NullSpan:
+    """
+    Return a context manager timing its block as a span named ``name``. Keyword
+    arguments, and those later passed to its ``set()`` method, are attached to
+    the span; compute expensive ones only if :func:`is_tracing`.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, category, **args)
+
+
+def traced(
+    name: str | None = None, category: str = "conda"
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorate a function to run in a span named ``name`` or its qualname."""
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def counter(name: str, **values: float) -> None:
+    """Record the current values of a counter track, e.g. bytes downloaded."""
+    if _tracer is not None:
+        _tracer.counter(name, **values)
+
+
+def is_tracing() -> bool:
+    return _tracer is not None
+
+
+def start_tracing() -> Tracer:
+    """Start collecting spans, replacing any running tracer."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing() -> Tracer | None:
+    """Stop collecting spans; return the tracer that collected them."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def _write_trace_at_exit(path: str) -> None:
+    if (tracer := stop_tracing()) is None:
+        return
+    try:
+        tracer.write(path)
+    except OSError as e:
+        log.warning("Could not write trace to %s: %s", path, e)
+    else:
+        log.info("Trace written to %s\n%s", path, tracer.summary())
+
+
+def _start_tracing_from_env() -> None:
+    if path := os.environ.get(TRACE_FILE_ENV):
+        start_tracing()
+        atexit.register(_write_trace_at_exit, os.path.abspath(path))
+
+
+_start_tracing_from_env()
+
+
+def print_trace_summary(path: str) -> None:
+    """Print the summary table of a Chrome trace written by a :class:`Tracer`."""
+    from .serialize import json
+
+    with open(path) as fh:
+        events = json.loads(fh.read())["traceEvents"]
+    spans = [event for event in events if event.get("ph") == "X"]
+    # self time is the duration minus that of the direct children on the thread
+    spans.sort(key=lambda event: (event["tid"], event["ts"], -event["dur"]))
+    child_time = [0.0] * len(spans)
+    stack: list[int] = []
+    for index, event in enumerate(spans):
+        end = event["ts"] + event["dur"]
+        while stack and (
+            spans[stack[-1]]["tid"] != event["tid"]
+            # allow for rounding of the microsecond timestamps
+            or spans[stack[-1]]["ts"] + spans[stack[-1]]["dur"] < end - 1e-3
+        ):
+            stack.pop()
+        if stack:
+            child_time[stack[-1]] += event["dur"]
+        stack.append(index)
+    print(
+        format_summary(
+            (event["name"], event["dur"] * 1e3, (event["dur"] - child) * 1e3)
+            for event, child in zip(spans, child_time)
+        )
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    print_trace_summary(sys.argv[1])
@@ -0,0 +1,141 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""Content-addressed store deduplicating the files of extracted packages.
+
+Successive builds of a package, and many noarch packages, contain byte-identical
+files that every extracted package in the package cache stores again. The store, the
+``blobs`` directory of a package cache, keeps one file (a blob) per sha256 and
+permission bits; identical files of extracted packages are replaced by hard links to
+it. With ``deduplicate_extracted_files`` set, :class:`ExtractPackageAction
+<conda.core.path_actions.ExtractPackageAction>` deduplicates every package it
+extracts; ``conda clean --deduplicate`` deduplicates a whole package cache and removes
+the blobs no package links to anymore.
+
+The sha256 values of ``info/paths.json`` name the blobs, and every file is hashed
+before it is linked so that a package with wrong metadata cannot replace the contents
+of others. Only files without other hard links take part: a file linked into an
+environment keeps its inode, so that ``conda clean --packages`` still sees the
+package as in use.
+"""
+
+from __future__ import annotations
+
+import os
+from logging import getLogger
+from os.path import dirname, join
+from stat import S_IMODE, S_ISREG
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from .. import CondaError
+from ..base.constants import CONDA_TEMP_EXTENSION
+from ..base.context import context
+from ..common.constants import TRACE
+from ..gateways.disk import mkdir_p
+from ..gateways.disk.read import compute_sum, read_paths_json
+from ..models.enums import PathEnum
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+log = getLogger(__name__)
+
+CONTENT_STORE_DIRNAME = "blobs"
+
+
+class ContentStore:
+    """The content-addressed store of a package cache directory."""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+
+    @classmethod
+    def for_pkgs_dir(cls, pkgs_dir: str) -> ContentStore | None:
+        """
+        Return the store of ``pkgs_dir`` if extracted packages are to be deduplicated,
+        otherwise None.
+        """
+        if not context.deduplicate_extracted_files:
+            return None
+        return cls(join(pkgs_dir, CONTENT_STORE_DIRNAME))
+
+    def _blob_path(self, sha256: str, mode: int) -> str:
+        return join(self.store_dir, sha256[:2], f"{sha256}-{mode:o}")
+
+    def add(self, path: str, sha256: str) -> int:
+        """
+        Replace the file at ``path``, whose contents have the digest ``sha256``, by a
+        hard link to its blob, or make it the blob if there is none yet. Return the
+        number of bytes saved. Failures are logged, not raised.
+        """
+        temp = None
+        try:
+            stat = os.lstat(path)
+            if not S_ISREG(stat.st_mode) or stat.st_nlink != 1 or not stat.st_size:
+                return 0
+            if compute_sum(path, "sha256") != sha256:
+                log.debug("Not deduplicating %s: sha256 does not match", path)
+                return 0
+            blob = self._blob_path(sha256, S_IMODE(stat.st_mode))
+            try:
+                blob_stat = os.lstat(blob)
+            except FileNotFoundError:
+                mkdir_p(dirname(blob))
+                os.link(path, blob)
+                return 0
+            if blob_stat.st_size != stat.st_size:
+                return 0
+            temp = f"{path}.{uuid4().hex}{CONDA_TEMP_EXTENSION}"
+            os.link(blob, temp)
+            os.replace(temp, path)
+        except (OSError, CondaError) as e:
+            log.debug("Could not deduplicate %s: %r", path, e)
+            if temp:
+                try:
+                    os.unlink(temp)
+                except OSError:
+                    pass
+            return 0
+        log.log(TRACE, "deduplicated %s", path)
+        return stat.st_size
+
+    def add_package(self, extracted_package_dir: str) -> int:
+        """
+        Deduplicate the files of an extracted package that have a sha256 in its
+        ``info/paths.json``. Return the number of bytes saved.
+        """
+        try:
+            paths_data = read_paths_json(extracted_package_dir)
+        except (OSError, CondaError) as e:
+            log.debug("Could not deduplicate %s: %r", extracted_package_dir, e)
+            return 0
+        return sum(
+            self.add(join(extracted_package_dir, path_data.path), path_data.sha256)
+            for path_data in paths_data.paths
+            if path_data.sha256 and path_data.path_type == PathEnum.hardlink
+        )
+
+    def blobs(self) -> Iterator[os.DirEntry]:
+        for subdir in _scandir(self.store_dir):
+            if subdir.is_dir(follow_symlinks=False):
+                yield from _scandir(subdir.path)
+
+    def remove_unused(self) -> int:
+        """Remove the blobs that no extracted package links to; return their number."""
+        removed = 0
+        for blob in self.blobs():
+            try:
+                if blob.stat(follow_symlinks=False).st_nlink == 1:
+                    os.unlink(blob.path)
+                    removed += 1
+            except OSError as e:
+                log.debug("Could not remove %s: %r", blob.path, e)
+        return removed
+
+
+def _scandir(path: str) -> list[os.DirEntry]:
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except OSError:
+        return []
@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING
 
 from ..base.context import context
 from ..common.iterators import unique
+from ..common.tracing import traced
 from ..exceptions import (
     CondaKeyError,
     InvalidSpec,
@@ -484,6 +485,7 @@ class ReducedIndex(Index):
         channels = ", ".join(self.channels.keys())
         return f"<{self.__class__.__name__}(spec={self.specs}, channels=[{channels}])>"
 
+    @traced("reduced_index")
     def _derive_reduced_index(self) -> None:
         records = {}
         collected_names = set()
@@ -24,12 +24,7 @@ from ..auxlib.ish import dals
 from ..base.constants import DEFAULTS_CHANNEL_NAME, PREFIX_MAGIC_FILE, SafetyChecks
 from ..base.context import context
 from ..common.compat import ensure_text_type, on_win
-from ..common.io import (
-    DummyExecutor,
-    ThreadLimitedThreadPoolExecutor,
-    dashlist,
-    time_recorder,
-)
+from ..common.io import DummyExecutor, ThreadLimitedThreadPoolExecutor, dashlist
 from ..common.path import (
     BIN_DIRECTORY,
     explode_directories,
@@ -38,6 +33,7 @@ from ..common.path import (
     get_python_site_packages_short_path,
 )
 from ..common.signals import signal_handler
+from ..common.tracing import span, traced
 from ..exceptions import (
     CondaSystemExit,
     DisallowedPackageError,
@@ -55,10 +51,11 @@ from ..gateways.disk.delete import rm_rf
 from ..gateways.disk.read import isfile, lexists, read_package_info
 from ..gateways.disk.test import (
     hardlink_supported,
+    reflink_supported,
     softlink_supported,
 )
 from ..gateways.subprocess import subprocess_call
-from ..models.enums import LinkType
+from ..models.enums import LinkType, PathEnum
 from ..models.version import VersionOrder
 from ..reporters import confirm_yn, get_spinner
 from ..resolve import MatchSpec
@@ -80,6 +77,7 @@ from .path_actions import (
     UpdateHistoryAction,
 )
 from .prefix_data import PrefixData
+from .verified_hashes import hash_in_bulk
 
 if TYPE_CHECKING:
     from collections.abc import Generator, Iterable
@@ -90,17 +88,28 @@ if TYPE_CHECKING:
 
 log = getLogger(__name__)
 
+#: Link and unlink action groups with more file actions than this are split into
+#: chunks of this many file actions, which run in parallel like whole groups do.
+EXECUTE_CHUNK_SIZE = 1000
+
 
 def determine_link_type(extracted_package_dir, target_prefix):
     source_test_file = join(extracted_package_dir, "info", "index.json")
     if context.always_copy:
-        return LinkType.copy
+        return _copy_link_type(source_test_file, target_prefix)
     if context.always_softlink:
         return LinkType.softlink
     if hardlink_supported(source_test_file, target_prefix):
         return LinkType.hardlink
     if context.allow_softlinks and softlink_supported(source_test_file, target_prefix):
         return LinkType.softlink
+    return _copy_link_type(source_test_file, target_prefix)
+
+
+def _copy_link_type(source_test_file, target_prefix):
+    # reflinks are copies that share the data blocks of their source until modified
+    if reflink_supported(source_test_file, target_prefix):
+        return LinkType.reflink
     return LinkType.copy
 
 
@@ -139,6 +148,48 @@ def make_unlink_actions(transaction_context, target_prefix, prefix_record):
     )
 
 
+def _is_file_action(action) -> bool:
+    return (
+        isinstance(action, (LinkPathAction, UnlinkPathAction))
+        and not isinstance(action, RemoveLinkedPackageRecordAction)
+        and action.link_type != LinkType.directory
+    )
+
+
+def _verifies_sha256(action) -> bool:
+    source_path_data = getattr(action, "source_path_data", None)
+    return (
+        isinstance(action, LinkPathAction)
+        and not action.verified
+        and action.link_type not in (LinkType.directory, LinkType.softlink)
+        and getattr(source_path_data, "path_type", None) == PathEnum.hardlink
+        and bool(getattr(source_path_data, "sha256", None))
+    )
+
+
+def split_path_actions(
+    actions: Iterable[Action],
+) -> tuple[tuple[Action, ...], tuple[Action, ...], tuple[Action, ...]]:
+    """
+    Split the actions of a link or unlink action group into the actions that must
+    run first (creating directories), the file actions, which do not depend on each
+    other, and the actions that must run last (removing directories and the package
+    record).
+    """
+    actions = tuple(actions)
+    start = 0
+    while (
+        start < len(actions)
+        and isinstance(actions[start], LinkPathAction)
+        and actions[start].link_type == LinkType.directory
+    ):
+        start += 1
+    end = start
+    while end < len(actions) and _is_file_action(actions[end]):
+        end += 1
+    return actions[:start], actions[start:end], actions[end:]
+
+
 def match_specs_to_dists(packages_info_to_link, specs) -> tuple[list[MatchSpec], ...]:
     """
     Find which specs belong to each package to link
@@ -270,14 +321,23 @@ class UnlinkLinkTransaction:
         if self._pfe is None:
             self._get_pfe()
         if not self._pfe._executed:
-            self._pfe.execute()
+            # plan the transaction from the info/ metadata of the packages while
+            # their payloads are extracted; nothing to plan for --download-only
+            self._pfe.execute(
+                metadata_callback=None
+                if context.download_only
+                else self._prepare_actions
+            )
 
+    @traced("unlink_link_prepare")
     def prepare(self):
         if self._pfe is None:
             self._get_pfe()
         if not self._pfe._executed:
             self._pfe.execute()
+        self._prepare_actions()
 
+    def _prepare_actions(self):
         if self._prepared:
             return
 
@@ -297,7 +357,7 @@ class UnlinkLinkTransaction:
 
         self._prepared = True
 
-    @time_recorder("unlink_link_prepare_and_verify")
+    @traced("unlink_link_verify")
     def verify(self):
         if not self._prepared:
             self.prepare()
@@ -623,12 +683,22 @@ class UnlinkLinkTransaction:
 
     @staticmethod
     def _verify_individual_level(prefix_action_group):
-        all_actions = chain.from_iterable(
-            axngroup.actions
-            for action_groups in prefix_action_group
-            for axngroup in action_groups
+        all_actions = tuple(
+            chain.from_iterable(
+                axngroup.actions
+                for action_groups in prefix_action_group
+                for axngroup in action_groups
+            )
         )
 
+        if context.extra_safety_checks:
+            # hash the files that verify() checks against their sha256 in bulk
+            hash_in_bulk(
+                (axn.source_prefix, axn.source_short_path)
+                for axn in all_actions
+                if _verifies_sha256(axn)
+            )
+
         error_results = []
         with batch_codesign_calls():
             # run all per-action (per-package) verify methods
@@ -950,7 +1020,7 @@ class UnlinkLinkTransaction:
             group for group in all_action_groups if group.type == "final"
         )
 
-        with signal_handler(conda_signal_handler), time_recorder("unlink_link_execute"):
+        with signal_handler(conda_signal_handler), span("unlink_link_execute"):
             exceptions = []
             with get_spinner("Executing transaction"):
                 # Execute any user-defined pre-transaction actions
@@ -984,11 +1054,7 @@ class UnlinkLinkTransaction:
                         )
 
                     # parallel block 1:
-                    for exc in self.execute_executor.map(
-                        UnlinkLinkTransaction._execute_actions, group
-                    ):
-                        if exc:
-                            exceptions.append(exc)
+                    exceptions.extend(self._execute_path_action_groups(group))
 
                     # post link scripts may employ entry points.  Do them before post-link.
                     if install_side:
@@ -1097,6 +1163,80 @@ class UnlinkLinkTransaction:
                     for action in axngroup.actions:
                         action.cleanup()
 
+    def _execute_path_action_groups(self, action_groups):
+        """
+        Execute link or unlink action groups; return the exceptions of the packages
+        that failed.
+
+        Packages are executed in parallel. The file actions of packages with more
+        than ``EXECUTE_CHUNK_SIZE`` of them are split into chunks that are executed
+        in parallel too, largest first, so that a single large package is not
+        linked by one thread while the others idle. A package that fails is
+        reversed as a whole, as if it had not been split.
+        """
+        if isinstance(self.execute_executor, DummyExecutor):
+            return [
+                exc
+                for exc in self.execute_executor.map(
+                    UnlinkLinkTransaction._execute_actions, action_groups
+                )
+                if exc
+            ]
+
+        action_groups = tuple(action_groups)
+        heads, tails, parts = [], [], []
+        split = set()
+        for idx, axngroup in enumerate(action_groups):
+            head, body, tail = split_path_actions(axngroup.actions)
+            if len(body) <= EXECUTE_CHUNK_SIZE:
+                parts.append((idx, axngroup))
+                continue
+            if head:
+                heads.append((idx, axngroup._replace(actions=head)))
+            if tail:
+                tails.append((idx, axngroup._replace(actions=tail)))
+            split.add(idx)
+            parts.extend(
+                (idx, axngroup._replace(actions=body[q : q + EXECUTE_CHUNK_SIZE]))
+                for q in range(0, len(body), EXECUTE_CHUNK_SIZE)
+            )
+        parts.sort(key=lambda part: len(part[1].actions), reverse=True)
+
+        failed = {}
+        executed = defaultdict(list)
+        for stage in (heads, parts, tails):
+            stage = [(idx, axngroup) for idx, axngroup in stage if idx not in failed]
+            results = self.execute_executor.map(
+                UnlinkLinkTransaction._execute_actions,
+                [axngroup for _, axngroup in stage],
+            )
+            for (idx, axngroup), exc in zip(stage, results):
+                if exc:
+                    # the failed part has reversed itself
+                    failed.setdefault(idx, exc)
+                else:
+                    executed[idx].append(axngroup)
+
+        exceptions = []
+        for idx, exc in sorted(failed.items()):
+            if idx in split:
+                reverse_excs = []
+                if context.rollback_enabled:
+                    for axngroup in reversed(executed[idx]):
+                        reverse_excs.extend(
+                            UnlinkLinkTransaction._reverse_actions(axngroup)
+                        )
+                exc = CondaMultiError(
+                    (
+                        exc.errors[0],
+                        action_groups[idx],
+                        *exc.errors[2:],
+                        *reverse_excs,
+                    )
+                )
+            exceptions.append(exc)
+        return exceptions
+
     @staticmethod
     def _execute_actions(axngroup):
         target_prefix = axngroup.target_prefix
@@ -1122,8 +1262,9 @@ class UnlinkLinkTransaction:
                     prec.extracted_package_dir,
                 )
 
-            for action in axngroup.actions:
-                action.execute()
+            with span(axngroup.type, "link", package=prec):
+                for action in axngroup.actions:
+                    action.execute()
         except Exception as e:  # this won't be a multi error
             # reverse this package
             reverse_excs = ()
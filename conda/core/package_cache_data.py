@@ -36,12 +36,12 @@ from ..base.constants import (
 )
 from ..base.context import context
 from ..common.constants import NULL, TRACE
-from ..common.io import time_recorder
 from ..common.iterators import groupby_to_dict as groupby
 from ..common.path import expand, strip_pkg_extension, url_to_path
 from ..common.serialize import json
 from ..common.signals import signal_handler
 from ..common.terminal import is_tty, term_dumb
+from ..common.tracing import span, traced
 from ..common.url import path_to_url
 from ..exceptions import NotWritableError, NoWritablePkgsDirError, PluginError
 from ..gateways.disk.create import (
@@ -115,11 +115,16 @@ class PackageCacheData(metaclass=PackageCacheType):
 
         self._urls_data = UrlsData(pkgs_dir)
 
-    def insert(self, package_cache_record):
-        meta = join(
-            package_cache_record.extracted_package_dir, "info", "repodata_record.json"
-        )
-        write_as_json_to_file(meta, PackageRecord.from_objects(package_cache_record))
+    def insert(self, package_cache_record, write_repodata_record=True):
+        if write_repodata_record:
+            meta = join(
+                package_cache_record.extracted_package_dir,
+                "info",
+                "repodata_record.json",
+            )
+            write_as_json_to_file(
+                meta, PackageRecord.from_objects(package_cache_record)
+            )
 
         self._package_cache_records[package_cache_record] = package_cache_record
 
@@ -776,7 +781,7 @@ class ProgressiveFetchExtract:
         self._prepared = False
         self._executed = False
 
-    @time_recorder("fetch_extract_prepare")
+    @traced("fetch_extract_prepare")
     def prepare(self):
         if self._prepared:
             return
@@ -805,10 +810,15 @@ class ProgressiveFetchExtract:
     def extract_actions(self):
         return tuple(axns[1] for axns in self.paired_actions.values() if axns[1])
 
-    def execute(self):
+    def execute(self, metadata_callback=None):
         """
         Run each action in self.paired_actions. Each action in cache_actions
         runs before its corresponding extract_actions.
+
+        With ``metadata_callback``, only the info/ metadata of downloaded .conda
+        packages is extracted before their payload, and ``metadata_callback`` is
+        called once the metadata of every package is in the package cache, while
+        the payloads are still being extracted.
         """
         if self._executed:
             return
@@ -844,6 +854,8 @@ class ProgressiveFetchExtract:
             progress_bars = {}
             futures: list[Future] = []
             extract_futures = {}
+            # extractions of packages whose info/ metadata was extracted first
+            payload_futures = set()
             extract_actions = self.extract_actions
             use_process_pool = (
                 bool(extract_actions) and EXTRACT_PROCESSES > 1 and not context.debug
@@ -883,6 +895,7 @@ class ProgressiveFetchExtract:
                     use_process_pool = False
             if not use_process_pool:
                 extract_executor = ThreadPoolExecutor(EXTRACT_THREADS)
+            extract_while_downloading = context.extract_while_downloading
 
             cancelled_flag = False
 
@@ -895,7 +908,7 @@ class ProgressiveFetchExtract:
 
             with (
                 signal_handler(conda_signal_handler),
-                time_recorder("fetch_extract_execute"),
+                span("fetch_extract_execute"),
                 ThreadPoolExecutor(context.fetch_threads) as fetch_executor,
                 extract_executor,
             ):
@@ -919,6 +932,13 @@ class ProgressiveFetchExtract:
                         cache_action,
                         progress_bar,
                         cancelled=cancelled,
+                        extract_action=(
+                            extract_action
+                            if extract_while_downloading
+                            and cache_action
+                            and _uses_builtin_extractor(extract_action)
+                            else None
+                        ),
                     )
 
                     future.add_done_callback(
@@ -944,25 +964,57 @@ class ProgressiveFetchExtract:
                             do_cleanup(actions)
                             progress_bar.finish()
                             progress_bar.refresh()
-                        elif use_process_pool:
+                            continue
+                        if extract_while_downloading and extract_action.streamed:
+                            # only moving the extracted package into place is left
+                            try:
+                                do_extract_action(
+                                    prec_or_spec, extract_action, progress_bar
+                                )
+                            except Exception as e:
+                                do_reverse(reversed(actions))
+                                exceptions.append(e)
+                            else:
+                                do_cleanup(actions)
+                                progress_bar.finish()
+                                progress_bar.refresh()
+                            continue
+
+                        info_first = metadata_callback is not None and (
+                            _extracts_info_first(extract_action)
+                        )
+                        if info_first:
                             try:
                                 extract_action.verify()
-                                extract_action._prepare_extract()
+                                with span(
+                                    "extract_info", "extract", package=prec_or_spec
+                                ):
+                                    extract_action.extract_info()
+                            except Exception as e:
+                                do_reverse(reversed(actions))
+                                exceptions.append(e)
+                                continue
+                        if use_process_pool:
+                            try:
+                                extract_action.verify()
+                                if not info_first:
+                                    extract_action._prepare_extract()
                                 extract_future = extract_executor.submit(
                                     extract_conda_package_archive,
                                     extract_action.source_full_path,
                                     extract_action.target_full_path,
+                                    components="pkg" if info_first else None,
                                     ensure_picklable_errors=True,
                                 )
                             except Exception as e:
                                 do_reverse(reversed(actions))
                                 exceptions.append(e)
-                            else:
-                                extract_futures[extract_future] = (
-                                    actions,
-                                    extract_action,
-                                    progress_bar,
-                                )
+                                continue
+                            extract_futures[extract_future] = (
+                                actions,
+                                extract_action,
+                                progress_bar,
+                            )
                         else:
                             extract_future = extract_executor.submit(
                                 do_extract_action,
@@ -975,6 +1027,8 @@ class ProgressiveFetchExtract:
                                 None,
                                 progress_bar,
                             )
+                        if info_first:
+                            payload_futures.add(extract_future)
                 except BaseException as e:
                     # We are interested in KeyboardInterrupt delivered to
                     # as_completed() while waiting, or any exception raised from
@@ -989,6 +1043,10 @@ class ProgressiveFetchExtract:
                     fetch_executor.shutdown(wait=False)
                     exceptions.append(e)
                 finally:
+                    # packages that are not waiting for their payload only
+                    pending_metadata = len(extract_futures) - len(payload_futures)
+                    if not pending_metadata:
+                        self._metadata_extracted(metadata_callback, exceptions)
                     for extract_future in as_completed(extract_futures):
                         actions, process_extract_action, progress_bar = extract_futures[
                             extract_future
@@ -1006,6 +1064,10 @@ class ProgressiveFetchExtract:
                             do_cleanup(actions)
                             progress_bar.finish()
                             progress_bar.refresh()
+                        if extract_future not in payload_futures:
+                            pending_metadata -= 1
+                            if not pending_metadata:
+                                self._metadata_extracted(metadata_callback, exceptions)
 
             for bar in progress_bars.values():
                 bar.close()
@@ -1027,6 +1089,16 @@ class ProgressiveFetchExtract:
 
             self._executed = True
 
+    @staticmethod
+    def _metadata_extracted(metadata_callback, exceptions):
+        if metadata_callback is None or exceptions:
+            return
+        try:
+            metadata_callback()
+        except Exception as e:
+            # the caller runs into the error again once everything is extracted
+            log.debug("metadata_callback failed: %r", e)
+
     @staticmethod
     def _progress_bar(
         prec_or_spec, position=None, leave=False, context_manager=None
@@ -1063,8 +1135,20 @@ class ProgressiveFetchExtract:
         return hash(self) == hash(other)
 
 
-def do_cache_action(prec, cache_action, progress_bar, download_total=1.0, *, cancelled):
-    """This function gets called from `ProgressiveFetchExtract.execute`."""
+def do_cache_action(
+    prec,
+    cache_action,
+    progress_bar,
+    download_total=1.0,
+    *,
+    cancelled,
+    extract_action=None,
+):
+    """
+    This function gets called from `ProgressiveFetchExtract.execute`. With
+    ``extract_action``, a package downloaded from a channel is extracted while
+    it is downloaded.
+    """
     # pass None if already cached (simplifies code)
     if not cache_action:
         return prec
@@ -1084,19 +1168,57 @@ def do_cache_action(prec, cache_action, progress_bar, download_total=1.0, *, can
         download_total = 0
         progress_update_cache_action = None
 
-    cache_action.execute(progress_update_cache_action)
+    if not (extract_action and progress_update_cache_action):
+        with span("fetch", "fetch", package=prec):
+            cache_action.execute(progress_update_cache_action)
+        return prec
+
+    with span("fetch", "fetch", package=prec, streaming=True):
+        chunk_callback = extract_action.start_streaming()
+        try:
+            cache_action.execute(progress_update_cache_action, chunk_callback)
+        except BaseException:
+            extract_action.finish_streaming(downloaded=False)
+            raise
+        extract_action.finish_streaming()
     return prec
 
 
+def _uses_builtin_extractor(extract_action) -> bool:
+    """
+    Whether conda's built-in extractor extracts the package, so that it can be
+    extracted while it is downloaded, or its info/ metadata first.
+    """
+    if not extract_action:
+        return False
+    source_full_path = os.fspath(extract_action.source_full_path)
+    if not source_full_path.lower().endswith(EXTRACT_PROCESS_EXTENSIONS):
+        return False
+    try:
+        extractor = context.plugin_manager.get_package_extractor(source_full_path)
+    except PluginError:
+        return False
+    return extractor.name == CONDA_PACKAGE_EXTRACTOR_NAME
+
+
+def _extracts_info_first(extract_action) -> bool:
+    """Whether the info/ metadata of the package can be extracted on its own."""
+    source_full_path = os.fspath(extract_action.source_full_path)
+    return source_full_path.lower().endswith(
+        CONDA_PACKAGE_EXTENSION_V2
+    ) and _uses_builtin_extractor(extract_action)
+
+
 def do_extract_action(prec, extract_action, progress_bar):
     """This function gets called after do_cache_action completes."""
     # pass None if already extracted (simplifies code)
     if not extract_action:
         return prec
-    extract_action.verify()
-    # currently unable to do updates on extract;
-    # likely too fast to bother
-    extract_action.execute(None)
+    with span("extract", "extract", package=prec):
+        extract_action.verify()
+        # currently unable to do updates on extract;
+        # likely too fast to bother
+        extract_action.execute(None)
     progress_bar.update_to(1.0)
     return prec
 
@@ -15,6 +15,7 @@ from typing import TYPE_CHECKING
 from uuid import uuid4
 
 from .. import CONDA_PACKAGE_ROOT, CondaError
+from .._private.extract import StreamingExtraction, extract_conda_package_archive
 from ..auxlib.ish import dals
 from ..base.constants import CONDA_TEMP_EXTENSION, WINDOWS_LAUNCHER_STUB_PATH
 from ..base.context import context
@@ -51,13 +52,20 @@ from ..gateways.disk.create import (
     mkdir_p,
     write_as_json_to_file,
 )
-from ..gateways.disk.delete import rm_rf
+from ..gateways.disk.delete import TRASH_DIRNAME, rm_rf, rm_rf_in_background
 from ..gateways.disk.permissions import make_writable
-from ..gateways.disk.read import compute_sum, islink, lexists, read_index_json
+from ..gateways.disk.read import (
+    compute_sum,
+    islink,
+    lexists,
+    read_index_json,
+    read_paths_json,
+    read_placeholder_offsets,
+)
 from ..gateways.disk.update import backoff_rename, touch
 from ..history import History
 from ..models.channel import Channel
-from ..models.enums import LinkType, NoarchType, PathEnum
+from ..models.enums import FileMode, LinkType, NoarchType, PathEnum
 from ..models.match_spec import MatchSpec
 from ..models.records import (
     Link,
@@ -67,9 +75,17 @@ from ..models.records import (
     PathsData,
     PrefixRecord,
 )
+from .content_store import ContentStore
 from .envs_manager import get_user_environments_txt_file, register_env, unregister_env
-from .portability import _PaddingError, update_prefix
+from .portability import (
+    _PaddingError,
+    _subdir_is_win,
+    placeholder_offsets,
+    rewrite_prefix,
+)
 from .prefix_data import PrefixData
+from .prefix_rewrite_cache import PrefixRewriteCache
+from .verified_hashes import VerifiedHashes
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -81,6 +97,9 @@ except NameError:
 
 log = getLogger(__name__)
 
+#: Directory of the package cache that packages are extracted into while downloading.
+STREAMING_EXTRACT_DIRNAME = ".streaming"
+
 _MENU_RE = re.compile(r"^menu/.*\.json$", re.IGNORECASE)
 REPR_IGNORE_KWARGS = (
     "transaction_context",
@@ -261,7 +280,12 @@ class LinkPathAction(CreateInPrefixPathAction):
                 prefix_placehoder = source_path_data.prefix_placeholder
                 file_mode = source_path_data.file_mode
             elif source_path_data.no_link:
-                link_type = LinkType.copy
+                # a reflink is as independent of its source as a copy
+                link_type = (
+                    LinkType.reflink
+                    if requested_link_type == LinkType.reflink
+                    else LinkType.copy
+                )
                 prefix_placehoder, file_mode = "", None
             else:
                 link_type = requested_link_type
@@ -487,7 +511,9 @@ class LinkPathAction(CreateInPrefixPathAction):
                 and reported_size_in_bytes == source_size_in_bytes
                 and context.extra_safety_checks
             ):
-                source_sha256 = compute_sum(self.source_full_path, "sha256")
+                source_sha256 = VerifiedHashes.for_package(self.source_prefix).sha256(
+                    self.source_short_path
+                )
 
                 if reported_sha256 and reported_sha256 != source_sha256:
                     return SafetyError(
@@ -546,7 +572,8 @@ class PrefixReplaceLinkAction(LinkPathAction):
         source_path_data,
     ):
         # This link_type used in execute(). Make sure we always respect LinkType.copy request.
-        link_type = LinkType.copy if link_type == LinkType.copy else LinkType.hardlink
+        if link_type not in (LinkType.copy, LinkType.reflink):
+            link_type = LinkType.hardlink
         super().__init__(
             transaction_context,
             package_info,
@@ -577,34 +604,49 @@ class PrefixReplaceLinkAction(LinkPathAction):
                 f"Ignoring prefix update for symlink with source path {self.source_full_path}"
             )
 
-        mkdir_p(self.transaction_context["temp_dir"])
-        self.intermediate_path = join(
-            self.transaction_context["temp_dir"], str(uuid4())
-        )
-
-        log.log(
-            TRACE, "copying %s => %s", self.source_full_path, self.intermediate_path
-        )
-        create_link(self.source_full_path, self.intermediate_path, LinkType.copy)
-        make_writable(self.intermediate_path)
-
-        try:
-            log.log(TRACE, "rewriting prefixes in %s", self.target_full_path)
-            update_prefix(
-                self.intermediate_path,
-                context.target_prefix_override or self.target_prefix,
-                self.prefix_placeholder,
-                self.file_mode,
-                subdir=self.package_info.repodata_record.subdir,
-            )
-        except _PaddingError:
-            raise PaddingError(
-                self.target_full_path,
-                self.prefix_placeholder,
-                len(self.prefix_placeholder),
-            )
-
-        sha256_in_prefix = compute_sum(self.intermediate_path, "sha256")
+        new_prefix = context.target_prefix_override or self.target_prefix
+        subdir = self.package_info.repodata_record.subdir
+        rewrite_cache, cache_key = self._prefix_rewrite_cache(new_prefix, subdir)
+        temp_dir = self.transaction_context["temp_dir"]
+        mkdir_p(temp_dir)
+        self.intermediate_path = join(temp_dir, str(uuid4()))
+        sha256_in_prefix = None
+        if rewrite_cache and (cached := rewrite_cache.get(cache_key)):
+            # linked into temp_dir like a rewritten file, so that the entry may be
+            # evicted before execute()
+            cached_path, cached_sha256 = cached
+            try:
+                create_hard_link_or_copy(cached_path, self.intermediate_path)
+                sha256_in_prefix = cached_sha256
+            except OSError as e:
+                log.debug("Could not use prefix rewrite cache entry: %r", e)
+                rm_rf(self.intermediate_path)
+        if sha256_in_prefix is None:
+            try:
+                log.log(
+                    TRACE,
+                    "rewriting prefixes in %s => %s",
+                    self.source_full_path,
+                    self.intermediate_path,
+                )
+                sha256_in_prefix = rewrite_prefix(
+                    self.source_full_path,
+                    self.intermediate_path,
+                    new_prefix,
+                    self.prefix_placeholder,
+                    self.file_mode,
+                    subdir=subdir,
+                    recorded_offsets=self._recorded_offsets(),
+                )
+            except _PaddingError:
+                raise PaddingError(
+                    self.target_full_path,
+                    self.prefix_placeholder,
+                    len(self.prefix_placeholder),
+                )
+            make_writable(self.intermediate_path)
+            if rewrite_cache:
+                rewrite_cache.put(cache_key, self.intermediate_path, sha256_in_prefix)
 
         self.prefix_path_data = PathDataV1.from_objects(
             self.prefix_path_data,
@@ -616,6 +658,43 @@ class PrefixReplaceLinkAction(LinkPathAction):
 
         self._verified = True
 
+    def _recorded_offsets(self) -> dict | None:
+        """
+        Return where the placeholder occurs in the source, as recorded at extraction.
+        Read when verifying, not on creation: the actions of a package may be created
+        from its metadata while its payload is still being extracted, before the
+        offsets are recorded.
+        """
+        if self.file_mode != FileMode.binary:
+            return None
+        # read once per package and transaction
+        recorded = self.transaction_context.setdefault("placeholder_offsets", {})
+        extracted_package_dir = self.package_info.extracted_package_dir
+        if (offsets := recorded.get(extracted_package_dir)) is None:
+            offsets = recorded[extracted_package_dir] = read_placeholder_offsets(
+                extracted_package_dir
+            )
+        return offsets.get(self.source_short_path)
+
+    def _prefix_rewrite_cache(
+        self, new_prefix: str, subdir: str
+    ) -> tuple[PrefixRewriteCache | None, str | None]:
+        """Return the prefix rewrite cache to use, if any, and the key of the file."""
+        source_sha256 = getattr(self.source_path_data, "sha256", None)
+        if not source_sha256 or (
+            # binaries are codesigned after they are rewritten
+            self.file_mode == FileMode.binary and subdir == "osx-arm64"
+        ):
+            return None, None
+        rewrite_cache = PrefixRewriteCache.for_pkgs_dir(
+            dirname(self.package_info.extracted_package_dir)
+        )
+        if rewrite_cache is None:
+            return None, None
+        return rewrite_cache, PrefixRewriteCache.key(
+            source_sha256, self.prefix_placeholder, new_prefix, self.file_mode, subdir
+        )
+
     def execute(self):
         if not self._verified:
             self.verify()
@@ -985,7 +1064,10 @@ class CreatePrefixRecordAction(CreateInPrefixPathAction):
     def execute(self):
         link = Link(
             source=self.package_info.extracted_package_dir,
-            type=self.requested_link_type,
+            # recorded as copies for conda versions without reflinks
+            type=LinkType.copy
+            if self.requested_link_type == LinkType.reflink
+            else self.requested_link_type,
         )
         extracted_package_dir = self.package_info.extracted_package_dir
         package_tarball_full_path = self.package_info.package_tarball_full_path
@@ -1226,7 +1308,11 @@ class UnlinkPathAction(RemoveFromPrefixPathAction):
 
     def cleanup(self):
         if not isdir(self.holding_full_path):
-            rm_rf(self.holding_full_path, clean_empty_parents=True)
+            rm_rf_in_background(
+                self.holding_full_path,
+                join(self.target_prefix, TRASH_DIRNAME),
+                clean_empty_parents=True,
+            )
 
 
 class RemoveMenuAction(RemoveFromPrefixPathAction):
@@ -1329,7 +1415,7 @@ class CacheUrlAction(PathAction):
             raise ValueError("URL cannot contain '::'")
         self._verified = True
 
-    def execute(self, progress_update_callback=None):
+    def execute(self, progress_update_callback=None, chunk_callback=None):
         # I hate inline imports, but I guess it's ok since we're importing from the conda.core
         # The alternative is passing the PackageCache class to CacheUrlAction __init__
         from .package_cache_data import PackageCacheData
@@ -1356,7 +1442,9 @@ class CacheUrlAction(PathAction):
                 source_path, target_package_cache, progress_update_callback
             )
         else:
-            self._execute_channel(target_package_cache, progress_update_callback)
+            self._execute_channel(
+                target_package_cache, progress_update_callback, chunk_callback
+            )
 
     def _execute_local(
         self, source_path, target_package_cache, progress_update_callback=None
@@ -1414,7 +1502,9 @@ class CacheUrlAction(PathAction):
             else:
                 target_package_cache._urls_data.add_url(self.url)
 
-    def _execute_channel(self, target_package_cache, progress_update_callback=None):
+    def _execute_channel(
+        self, target_package_cache, progress_update_callback=None, chunk_callback=None
+    ):
         kwargs = {}
         if self.size is not None:
             kwargs["size"] = self.size
@@ -1426,6 +1516,7 @@ class CacheUrlAction(PathAction):
             self.url,
             self.target_full_path,
             progress_update_callback=progress_update_callback,
+            chunk_callback=chunk_callback,
             **kwargs,
         )
         target_package_cache._urls_data.add_url(self.url)
@@ -1465,16 +1556,81 @@ class ExtractPackageAction(PathAction):
         self.sha256 = sha256
         self.size = size
         self.md5 = md5
+        self._streaming = None
+        self.streamed = False
+        self.info_extracted = False
+        self._info_package_cache_record = None
 
     def verify(self):
         self._verified = True
 
-    def execute(self, progress_update_callback=None):
+    def extract_info(self):
+        """
+        Extract only the info/ metadata of a .conda package and add the package to
+        the in-memory PackageCacheData, so that a transaction can be planned while
+        :meth:`execute` extracts the payload. info/repodata_record.json, which marks
+        the package as extracted on disk, is only written after the payload.
+        """
+        from .package_cache_data import PackageCacheData
+
         self._prepare_extract()
-        context.plugin_manager.extract_package(
-            self.source_full_path,
-            self.target_full_path,
+        extract_conda_package_archive(
+            self.source_full_path, self.target_full_path, components="info"
+        )
+        self.info_extracted = True
+        self._info_package_cache_record = PackageCacheRecord.from_objects(
+            self._repodata_record(),
+            package_tarball_full_path=self.source_full_path,
+            extracted_package_dir=self.target_full_path,
         )
+        PackageCacheData(self.target_pkgs_dir).insert(
+            self._info_package_cache_record, write_repodata_record=False
+        )
+
+    def start_streaming(self):
+        """
+        Start extracting the package from the bytes of its download; return the
+        callback to pass them to. See :meth:`finish_streaming`.
+        """
+        rm_rf(self.streaming_path)
+        self._streaming = StreamingExtraction(
+            self.source_full_path, self.streaming_path
+        )
+        return self._streaming.feed
+
+    def finish_streaming(self, downloaded=True):
+        """
+        Wait for the extraction started by :meth:`start_streaming`. If the download
+        succeeded and so did the extraction, :meth:`execute` only has to move the
+        extracted package into place; otherwise it extracts the downloaded archive.
+        """
+        streaming, self._streaming = self._streaming, None
+        self.streamed = streaming.close() and downloaded
+        if not self.streamed:
+            if downloaded:
+                log.debug(
+                    "Could not extract %s while downloading: %r",
+                    self.source_full_path,
+                    streaming.error,
+                )
+            rm_rf(self.streaming_path)
+
+    def execute(self, progress_update_callback=None):
+        if self.info_extracted:
+            extract_conda_package_archive(
+                self.source_full_path, self.target_full_path, components="pkg"
+            )
+            self._finish_extract()
+            return
+        self._prepare_extract()
+        if self.streamed:
+            # the download, and with it the extracted files, passed its checksum
+            backoff_rename(self.streaming_path, self.target_full_path)
+        else:
+            context.plugin_manager.extract_package(
+                self.source_full_path,
+                self.target_full_path,
+            )
         self._finish_extract()
 
     def _prepare_extract(self):
@@ -1490,6 +1646,25 @@ class ExtractPackageAction(PathAction):
         # The alternative is passing the the classes to ExtractPackageAction __init__
         from .package_cache_data import PackageCacheData
 
+        repodata_record = self._repodata_record()
+        repodata_record_path = join(
+            self.target_full_path, "info", "repodata_record.json"
+        )
+        write_as_json_to_file(repodata_record_path, repodata_record)
+        content_store = ContentStore.for_pkgs_dir(self.target_pkgs_dir)
+        if content_store is not None:
+            content_store.add_package(self.target_full_path)
+        self._write_placeholder_offsets(repodata_record.subdir)
+
+        target_package_cache = PackageCacheData(self.target_pkgs_dir)
+        package_cache_record = PackageCacheRecord.from_objects(
+            repodata_record,
+            package_tarball_full_path=self.source_full_path,
+            extracted_package_dir=self.target_full_path,
+        )
+        target_package_cache.insert(package_cache_record)
+
+    def _repodata_record(self):
         try:
             raw_index_json = read_index_json(self.target_full_path)
         except (OSError, json.JSONDecodeError, FileNotFoundError):
@@ -1532,21 +1707,43 @@ class ExtractPackageAction(PathAction):
             repodata_record = PackageRecord.from_objects(
                 self.record_or_spec, raw_index_json
             )
+        return repodata_record
 
-        repodata_record_path = join(
-            self.target_full_path, "info", "repodata_record.json"
-        )
-        write_as_json_to_file(repodata_record_path, repodata_record)
-
-        target_package_cache = PackageCacheData(self.target_pkgs_dir)
-        package_cache_record = PackageCacheRecord.from_objects(
-            repodata_record,
-            package_tarball_full_path=self.source_full_path,
-            extracted_package_dir=self.target_full_path,
-        )
-        target_package_cache.insert(package_cache_record)
+    def _write_placeholder_offsets(self, subdir):
+        """
+        Record where the placeholder occurs in the binary files of the package, so that
+        PrefixReplaceLinkAction does not scan them again for every environment.
+        """
+        if _subdir_is_win(subdir):
+            return
+        paths = {}
+        try:
+            for path_data in read_paths_json(self.target_full_path).paths:
+                if (
+                    path_data.prefix_placeholder
+                    and path_data.file_mode == FileMode.binary
+                    and path_data.path_type != PathEnum.softlink
+                ):
+                    paths[path_data.path] = placeholder_offsets(
+                        join(self.target_full_path, path_data.path),
+                        path_data.prefix_placeholder,
+                    )
+            if paths:
+                write_as_json_to_file(
+                    join(self.target_full_path, "info", "placeholder_offsets.json"),
+                    {"version": 1, "paths": paths},
+                )
+        except (OSError, CondaError) as e:
+            # linking falls back to scanning the files
+            log.debug("Could not record placeholder offsets: %r", e)
 
     def reverse(self):
+        from .package_cache_data import PackageCacheData
+
+        if self._info_package_cache_record is not None:
+            PackageCacheData(self.target_pkgs_dir).remove(
+                self._info_package_cache_record, None
+            )
         rm_rf(self.target_full_path)
         if lexists(self.hold_path):
             log.log(TRACE, "moving %s => %s", self.hold_path, self.target_full_path)
@@ -1560,5 +1757,13 @@ class ExtractPackageAction(PathAction):
     def target_full_path(self):
         return join(self.target_pkgs_dir, self.target_extracted_dirname)
 
+    @property
+    def streaming_path(self):
+        return join(
+            self.target_pkgs_dir,
+            STREAMING_EXTRACT_DIRNAME,
+            self.target_extracted_dirname,
+        )
+
     def __str__(self):
         return f"ExtractPackageAction<source_full_path={self.source_full_path!r}, target_full_path={self.target_full_path!r}>"
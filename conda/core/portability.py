@@ -4,14 +4,19 @@
 
 from __future__ import annotations
 
+import hashlib
+import mmap
 import os
 import re
 import struct
 import subprocess
 import threading
-from contextlib import contextmanager
+from bisect import bisect
+from contextlib import contextmanager, nullcontext
+from functools import cache
 from logging import getLogger
 from os.path import basename, realpath
+from shutil import copystat
 from typing import TYPE_CHECKING
 
 from ..auxlib.ish import dals
@@ -25,7 +30,10 @@ from ..models.enums import FileMode
 log = getLogger(__name__)
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
+
+    # (start, end, encoding) of a null-terminated string containing the placeholder
+    PlaceholderOffset = tuple[int, int, str]
 
 
 # three capture groups: whole_shebang, executable, options
@@ -50,6 +58,10 @@ POPULAR_ENCODINGS = (
     "utf-32-be",
 )
 
+# Binary files of at least this size are memory mapped instead of read by
+# rewrite_prefix().
+MMAP_THRESHOLD = 1 << 20  # 1 MiB
+
 
 class _PaddingError(Exception):
     pass
@@ -132,6 +144,83 @@ def update_prefix(
         _codesign_or_enqueue(realpath(path))
 
 
+def rewrite_prefix(
+    source: str,
+    target: str,
+    new_prefix: str,
+    placeholder: str = PREFIX_PLACEHOLDER,
+    mode: FileMode = FileMode.text,
+    subdir: str = context.subdir,
+    recorded_offsets: dict | None = None,
+) -> str:
+    """
+    Write ``source`` to ``target`` with the prefix updated like :func:`update_prefix`.
+
+    Unlike copying the file and calling :func:`update_prefix` on the copy, the source
+    is read once and the result is hashed while it is written. Large binary files are
+    memory mapped and streamed to ``target``.
+
+    Binary files are not scanned at all if ``recorded_offsets`` records where the
+    placeholder occurs in ``source`` (see :func:`placeholder_offsets`) and ``source``
+    has not changed since.
+
+    Args:
+        source: The path to the file with the placeholder.
+        target: The path to write the updated file to. Must not exist.
+        new_prefix: The new prefix to replace the placeholder with.
+        placeholder: The placeholder to replace. Defaults to PREFIX_PLACEHOLDER.
+        mode: The file mode. Defaults to FileMode.text.
+        subdir: The subdirectory. Defaults to context.subdir.
+        recorded_offsets: Where the placeholder occurs in ``source``, as returned by
+            :func:`placeholder_offsets`. Defaults to scanning for it.
+
+    Returns:
+        The sha256 hex digest of the contents written to ``target``.
+    """
+    if _subdir_is_win(subdir) and mode == FileMode.text:
+        # force all prefix replacements to forward slashes to simplify need to escape backslashes
+        new_prefix = new_prefix.replace("\\", "/")
+
+    hasher = hashlib.sha256()
+    with open(source, "rb") as src, open(target, "xb") as dst:
+
+        def write(chunk) -> None:
+            hasher.update(chunk)
+            dst.write(chunk)
+
+        if mode == FileMode.binary and not _subdir_is_win(subdir):
+            stat = os.fstat(src.fileno())
+            with (
+                mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+                if stat.st_size >= MMAP_THRESHOLD
+                else nullcontext(src.read())
+            ) as data:
+                offsets = _recorded_offsets(recorded_offsets, stat, data, placeholder)
+                updated = _stream_binary_replace(
+                    data, write, placeholder, new_prefix, subdir, offsets
+                )
+        else:
+            original_data = src.read()
+            data = replace_prefix(mode, original_data, placeholder, new_prefix, subdir)
+            if not _subdir_is_win(subdir):
+                data = replace_long_shebang(mode, data)
+            if mode == FileMode.binary and len(data) != len(original_data):
+                raise BinaryPrefixReplacementError(
+                    source, placeholder, new_prefix, len(original_data), len(data)
+                )
+            updated = data != original_data
+            write(data)
+
+    try:
+        copystat(source, target)
+    except OSError as e:  # pragma: no cover
+        log.debug("%r", e)
+
+    if updated and mode == FileMode.binary and subdir == "osx-arm64" and on_mac:
+        _codesign_or_enqueue(realpath(target))
+    return hasher.hexdigest()
+
+
 _codesign_batch_state = threading.local()
 
 
@@ -200,8 +289,8 @@ def replace_prefix(
 
     We use the `POPULAR_ENCODINGS` module level constant defined above to make several
     passes at replacing the placeholder. We do this to account for as many encodings as
-    possible. If this causes any performance problems in the future, it could potentially
-    be removed (i.e. just using the most popular "utf-8" encoding").
+    possible. The passes are made in order, so the replacement in one encoding is seen
+    by the next; encodings in which the placeholder does not occur are skipped.
 
     More information/discussion available here: https://github.com/conda/conda/pull/9946
 
@@ -215,7 +304,12 @@ def replace_prefix(
     Returns:
         The updated data after prefix replacement.
     """
+    if mode not in (FileMode.text, FileMode.binary):
+        raise CondaIOError(f"Invalid mode: {mode!r}")
     for encoding in POPULAR_ENCODINGS:
+        if data.find(placeholder.encode(encoding)) == -1:
+            # a literal search is much faster than any of the passes below
+            continue
         if mode == FileMode.text:
             if not _subdir_is_win(subdir):
                 # if new_prefix contains spaces, it might break the shebang!
@@ -237,7 +331,7 @@ def replace_prefix(
             data = data.replace(
                 placeholder.encode(encoding), new_prefix.encode(encoding)
             )
-        elif mode == FileMode.binary:
+        else:
             data = binary_replace(
                 data,
                 placeholder.encode(encoding),
@@ -245,11 +339,191 @@ def replace_prefix(
                 encoding=encoding,
                 subdir=subdir,
             )
-        else:
-            raise CondaIOError(f"Invalid mode: {mode!r}")
     return data
 
 
+@cache
+def _null_terminated_regex(search: bytes, encoding: str) -> re.Pattern[bytes]:
+    """
+    Return a pattern matching ``search`` up to the end of the null-terminated string
+    of ``encoding`` containing it.
+    """
+    zeros = "\0".encode(encoding)
+    return re.compile(
+        re.escape(search) + b"(?:(?!(?:" + zeros + b")).)*" + zeros, flags=re.DOTALL
+    )
+
+
+def _binary_replacement(
+    placeholder: str, new_prefix: str
+) -> Callable[[bytes, str], bytes]:
+    """
+    Return a function replacing the placeholder in a null-terminated string of an
+    encoding, which keeps the length of the string like :func:`binary_replace`.
+    """
+    encoded = {
+        encoding: (placeholder.encode(encoding), new_prefix.encode(encoding))
+        for encoding in POPULAR_ENCODINGS
+    }
+
+    def replace(string: bytes, encoding: str) -> bytes:
+        search, replacement = encoded[encoding]
+        occurrences = string.count(search)
+        padding = (len(search) - len(replacement)) * occurrences
+        if padding < 0:
+            raise _PaddingError
+        return string.replace(search, replacement) + b"\0" * padding
+
+    return replace
+
+
+def placeholder_offsets(path: str, placeholder: str = PREFIX_PLACEHOLDER) -> dict:
+    """
+    Record where ``placeholder`` occurs in the binary file at ``path`` (not on
+    Windows). Where the placeholder occurs is a property of a file in an extracted
+    package, so it can be found once and passed to :func:`rewrite_prefix` for every
+    environment the file is linked to.
+
+    Returns:
+        A JSON-serializable dict with the placeholder, the size and modification time
+        of the file, and the start, end and encoding of each null-terminated string
+        containing the placeholder, or None if the strings of different encodings
+        interfere and the file has to be scanned when it is linked.
+    """
+    with open(path, "rb") as fh:
+        stat = os.fstat(fh.fileno())
+        with (
+            mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            if stat.st_size >= MMAP_THRESHOLD
+            else nullcontext(fh.read())
+        ) as data:
+            offsets = _find_placeholder_offsets(data, placeholder)
+    return {
+        "placeholder": placeholder,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "offsets": offsets,
+    }
+
+
+def _find_placeholder_offsets(
+    data: bytes | mmap.mmap, placeholder: str
+) -> list[PlaceholderOffset] | None:
+    """
+    Return the start, end and encoding of each null-terminated string containing
+    ``placeholder`` in the binary ``data``, ordered by start.
+
+    :func:`replace_prefix` replaces the placeholder in one encoding after the other,
+    so what it finds in an encoding depends on what was replaced before. A string
+    starting at (or in the zeros just before) a string of an earlier encoding loses
+    its placeholder to that replacement and is left out. Return None if the strings
+    cannot be told without replacing, e.g. where a string extends past one of an
+    earlier encoding; the data then has to be passed to :func:`replace_prefix`.
+    """
+    offsets: list[PlaceholderOffset] = []
+    for encoding in POPULAR_ENCODINGS:
+        search = placeholder.encode(encoding)
+        if (pos := data.find(search)) == -1:
+            continue
+        leading_zeros = len(search) - len(search.lstrip(b"\0"))
+        starts = [start for start, _, _ in offsets]
+        found = []
+        for match in _null_terminated_regex(search, encoding).finditer(data, pos):
+            start, pos = match.span()
+            # the strings of earlier encodings do not overlap; check the neighbours
+            i = bisect(starts, start)
+            neighbours = offsets[max(i - 1, 0) : i + 1]
+            if all(end <= start or pos <= begin for begin, end, _ in neighbours):
+                found.append((start, pos, encoding))
+            elif data.find(search, start + 1, pos) != -1 or not any(
+                begin - leading_zeros <= start <= begin and pos <= end
+                for begin, end, _ in neighbours
+            ):
+                return None
+        if offsets:
+            # the padding of an earlier replacement may terminate a placeholder that
+            # is not null-terminated yet, or precede one as its leading zeros
+            unterminated = data.find(search, pos)
+            if unterminated != -1 and unterminated < offsets[-1][1]:
+                return None
+            core = search[leading_zeros:]
+            if leading_zeros > 1 and any(
+                data.find(core, end, end + leading_zeros - 2 + len(core)) != -1
+                for _, end, _ in offsets
+            ):
+                return None
+        offsets = sorted(offsets + found)
+    return offsets
+
+
+def _recorded_offsets(
+    recorded: dict | None,
+    stat: os.stat_result,
+    data: bytes | mmap.mmap,
+    placeholder: str,
+) -> list[PlaceholderOffset] | None:
+    """
+    Return the offsets in ``recorded`` if they still apply to ``data``: the file was
+    not modified since and each offset points at the placeholder. Otherwise return
+    None, which means the data has to be scanned.
+    """
+    if (
+        not recorded
+        or recorded.get("placeholder") != placeholder
+        or recorded.get("size") != stat.st_size
+        or recorded.get("mtime_ns") != stat.st_mtime_ns
+    ):
+        return None
+    offsets = []
+    pos = 0
+    try:
+        for start, end, encoding in recorded["offsets"]:
+            search = placeholder.encode(encoding)
+            zeros = "\0".encode(encoding)
+            if not (
+                pos <= start < end <= len(data)
+                and data[start : start + len(search)] == search
+                and data[end - len(zeros) : end] == zeros
+            ):
+                return None
+            offsets.append((start, end, encoding))
+            pos = end
+    except (KeyError, TypeError, ValueError, LookupError):
+        return None
+    return offsets
+
+
+def _stream_binary_replace(
+    data: bytes | mmap.mmap,
+    write: Callable[[memoryview | bytes], None],
+    placeholder: str,
+    new_prefix: str,
+    subdir: str,
+    offsets: list[PlaceholderOffset] | None = None,
+) -> bool:
+    """
+    Pass ``data`` with the prefix replaced in binary mode (not on Windows) to ``write``
+    in chunks, scanning for the placeholder unless its ``offsets`` are given. Return
+    whether the placeholder was found.
+    """
+    if offsets is None:
+        offsets = _find_placeholder_offsets(data, placeholder)
+    if offsets is None:
+        # strings of different encodings interfere; replace one encoding at a time
+        data = bytes(data)
+        write(replace_prefix(FileMode.binary, data, placeholder, new_prefix, subdir))
+        return True
+    replace = _binary_replacement(placeholder, new_prefix)
+    pos = 0
+    with memoryview(data) as view:
+        for start, end, encoding in offsets:
+            write(view[pos:start])
+            write(replace(bytes(view[start:end]), encoding))
+            pos = end
+        write(view[pos:])
+    return bool(offsets)
+
+
 def binary_replace(
     data: bytes,
     search: bytes,
@@ -276,7 +550,6 @@ def binary_replace(
     This function performs replacements only for pyzzer-type entry points on Windows.
     For all other cases, it returns the original byte string unchanged.
     """
-    zeros = "\0".encode(encoding)
     if _subdir_is_win(subdir):
         # on Windows for binary files, we currently only replace a pyzzer-type entry point
         #   we skip all other prefix replacement
@@ -305,10 +578,7 @@ def binary_replace(
         return match.group().replace(search, replacement) + b"\0" * padding
 
     original_data_len = len(data)
-    pat = re.compile(
-        re.escape(search) + b"(?:(?!(?:" + zeros + b")).)*" + zeros, flags=re.DOTALL
-    )
-    data = pat.sub(replace, data)
+    data = _null_terminated_regex(search, encoding).sub(replace, data)
     if len(data) != original_data_len:
         raise RuntimeError("Replaced data has different length than original.")
 
@@ -32,9 +32,9 @@ from ..base.constants import (
 from ..base.context import context, locate_prefix_by_name
 from ..common.compat import on_mac, on_win
 from ..common.constants import NULL
-from ..common.io import time_recorder
 from ..common.path import expand, paths_equal
 from ..common.serialize import json
+from ..common.tracing import traced
 from ..common.url import mask_anaconda_token
 from ..common.url import remove_auth as url_remove_auth
 from ..exceptions import (
@@ -52,6 +52,7 @@ from ..exceptions import (
 from ..gateways.disk.create import first_writable_envs_dir, write_as_json_to_file
 from ..gateways.disk.delete import rm_rf
 from ..gateways.disk.test import file_path_is_writable
+from ..gateways.disk.update import atomic_write
 from ..models.enums import PackageType
 from ..models.match_spec import MatchSpec
 from ..models.prefix_graph import PrefixGraph
@@ -68,6 +69,11 @@ if TYPE_CHECKING:
 
 log = getLogger(__name__)
 
+#: Bump when the layout of the prefix records summary changes.
+PREFIX_RECORDS_SUMMARY_VERSION = 1
+#: Not a ``.json`` file, which conda-meta reserves for the records of packages.
+PREFIX_RECORDS_SUMMARY_FILE = ".prefix-records-summary"
+
 
 class PrefixDataType(type):
     """Basic caching of PrefixData instance objects."""
@@ -94,16 +100,41 @@ class PrefixDataType(type):
             return prefix_data_instance
 
 
+class _RecordSummary(dict):
+    """
+    Contents of a ``conda-meta`` JSON file without its file manifest, see
+    :meth:`PrefixRecord.from_summary`.
+    """
+
+    __slots__ = ("manifest_path",)
+
+    def __init__(self, summary: dict[str, Any], manifest_path: str):
+        super().__init__(summary)
+        self.manifest_path = manifest_path
+
+
 class PrefixRecordDict(UserDict):
     """Lazily convert dict entries to PrefixRecord."""
 
     def __getitem__(self, package_name: str) -> PrefixRecord:
         record = self.data[package_name]
-        if not isinstance(record, PrefixRecord):
+        if isinstance(record, _RecordSummary):
+            self.data[package_name] = record = PrefixRecord.from_summary(
+                record, record.manifest_path
+            )
+        elif not isinstance(record, PrefixRecord):
             self.data[package_name] = record = PrefixRecord(**record)
         return record
 
 
+def get_prefix_records_summary_path(prefix_path: PathType) -> Path:
+    """
+    Return the file summarizing the ``conda-meta`` records of a prefix. It is kept
+    in ``conda-meta`` itself, so that it goes away with the environment.
+    """
+    return Path(prefix_path, "conda-meta", PREFIX_RECORDS_SUMMARY_FILE)
+
+
 class PrefixData(metaclass=PrefixDataType):
     """
     The PrefixData class aims to be the representation of the state
@@ -468,18 +499,47 @@ class PrefixData(metaclass=PrefixDataType):
     # endregion
     # region Records
 
-    @time_recorder(module_name=__name__)
+    @traced()
     def load(self) -> None:
+        """
+        Load the records in ``conda-meta``.
+
+        The records without their file manifests (see
+        :attr:`PrefixRecord.manifest_fields`) are summarized in a file next to
+        them (see :func:`get_prefix_records_summary_path`). Records whose
+        JSON file is unchanged since it was summarized are created from the
+        summary, and their file manifest is only read when accessed.
+        """
         self.__prefix_records = PrefixRecordDict()
         _conda_meta_dir = self.prefix_path / "conda-meta"
         if lexists(_conda_meta_dir):
-            conda_meta_json_paths = (
-                entry.path
-                for entry in os.scandir(_conda_meta_dir)
-                if entry.name.endswith(".json") and not entry.name.startswith("._")
-            )
-            for meta_file in conda_meta_json_paths:
-                self._load_single_record(meta_file)
+            summary_path = get_prefix_records_summary_path(self.prefix_path)
+            summary = self._read_records_summary(summary_path)
+            new_summary = {}
+            for entry in os.scandir(_conda_meta_dir):
+                if not entry.name.endswith(".json") or entry.name.startswith("._"):
+                    continue
+                try:
+                    stat = entry.stat()
+                    key = [stat.st_mtime_ns, stat.st_size]
+                except OSError:
+                    key = None
+                cached = summary.get(entry.name)
+                if key and cached and cached["key"] == key:
+                    new_summary[entry.name] = cached
+                    record = _RecordSummary(cached["record"], entry.path)
+                    self.__prefix_records[record["name"]] = record
+                elif (data := self._load_single_record(entry.path)) and key:
+                    new_summary[entry.name] = {
+                        "key": key,
+                        "record": {
+                            field: value
+                            for field, value in data.items()
+                            if field not in PrefixRecord.manifest_fields
+                        },
+                    }
+            if new_summary != summary:
+                self._write_records_summary(summary_path, new_summary)
         if self.interoperability:
             for loader in context.plugin_manager.get_prefix_data_loaders():
                 loader(self.prefix_path, self.__prefix_records)
@@ -589,11 +649,7 @@ class PrefixData(metaclass=PrefixDataType):
                     # type for all queries
                     return (r for r in (record,))
                 return (_ for _ in ())  # empty generator
-            return (
-                prefix_rec
-                for prefix_rec in self.iter_records()
-                if param.match(prefix_rec)
-            )
+            return param.filter(self.iter_records())
         elif not isinstance(param, PackageRecord):
             raise TypeError("`package_ref_or_match_spec` is not a valid record.")
         return (prefix_rec for prefix_rec in self.iter_records() if prefix_rec == param)
@@ -634,7 +690,34 @@ class PrefixData(metaclass=PrefixDataType):
     def _prefix_records(self) -> dict[str, PrefixRecord] | None:
         return self.__prefix_records or self.load() or self.__prefix_records
 
-    def _load_single_record(self, prefix_record_json_path: PathType) -> None:
+    @staticmethod
+    def _read_records_summary(summary_path: Path) -> dict[str, Any]:
+        try:
+            summary = json.loads(summary_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.debug("Ignoring unreadable records summary %s: %s", summary_path, e)
+            return {}
+        if (
+            not isinstance(summary, dict)
+            or summary.get("version") != PREFIX_RECORDS_SUMMARY_VERSION
+        ):
+            return {}
+        return summary["records"]
+
+    @staticmethod
+    def _write_records_summary(summary_path: Path, records: dict[str, Any]) -> None:
+        try:
+            summary = {"version": PREFIX_RECORDS_SUMMARY_VERSION, "records": records}
+            with atomic_write(summary_path) as f:
+                f.write(json.dumps(summary, indent=None))
+        except OSError as e:
+            log.debug("Could not write records summary %s: %s", summary_path, e)
+
+    def _load_single_record(
+        self, prefix_record_json_path: PathType
+    ) -> dict[str, Any] | None:
         try:
             data = json.loads(Path(prefix_record_json_path).read_bytes())
         except (UnicodeDecodeError, json.JSONDecodeError):
@@ -650,10 +733,11 @@ class PrefixData(metaclass=PrefixDataType):
                 "Ignoring malformed prefix record at: %s", prefix_record_json_path
             )
             # TODO: consider just deleting here this record file in the future
-            return
+            return None
         # TODO: consider, at least in memory, storing prefix_record_json_path as part
         #       of PrefixRecord
         self.__prefix_records[name] = data
+        return data
 
     # endregion
     # region State and environment variables
@@ -0,0 +1,190 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""Cache of files with their prefix rewritten, for repeated installs into one prefix.
+
+Files with a prefix placeholder are rewritten for every environment they are linked
+into. When environments are recreated at the same prefix over and over (e.g. in CI),
+the rewritten files are identical every time. With ``prefix_rewrite_cache_max_mb``
+set, :class:`PrefixReplaceLinkAction <conda.core.path_actions.PrefixReplaceLinkAction>`
+keeps the files it rewrites in the ``prefix_rewrites`` directory of the package cache,
+keyed by the sha256 of the source file, the placeholder, the new prefix and the file
+mode, and hard links them into later environments instead of rewriting them again.
+
+Every entry is a rewritten file and a ``.json`` file with its size and sha256; the
+modification time of the latter is the time the entry was last used. Once the entries
+exceed the size limit, the least recently used ones are removed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from logging import getLogger
+from os.path import dirname, join
+from shutil import copy2
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from ..base.constants import CONDA_TEMP_EXTENSION
+from ..base.context import context
+from ..common.constants import TRACE
+from ..common.serialize import json
+from ..gateways.disk import mkdir_p
+from ..gateways.disk.read import compute_sum
+from ..gateways.disk.update import atomic_write
+
+if TYPE_CHECKING:
+    from ..models.enums import FileMode
+
+log = getLogger(__name__)
+
+PREFIX_REWRITE_CACHE_DIRNAME = "prefix_rewrites"
+
+#: Part of every key; bump it whenever rewriting a prefix may produce other contents.
+CACHE_VERSION = 1
+
+
+class PrefixRewriteCache:
+    """The prefix rewrite cache of a package cache directory."""
+
+    _cache_: dict[str, PrefixRewriteCache] = {}
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        # total size of the entries, computed when first needed
+        self._size: int | None = None
+
+    @classmethod
+    def for_pkgs_dir(cls, pkgs_dir: str) -> PrefixRewriteCache | None:
+        """Return the cache of ``pkgs_dir``, or None if the cache is disabled."""
+        if context.prefix_rewrite_cache_max_mb <= 0:
+            return None
+        cache_dir = join(pkgs_dir, PREFIX_REWRITE_CACHE_DIRNAME)
+        if (cache := cls._cache_.get(cache_dir)) is None:
+            cache = cls._cache_[cache_dir] = cls(cache_dir)
+        return cache
+
+    @property
+    def max_size(self) -> int:
+        return context.prefix_rewrite_cache_max_mb * 1024 * 1024
+
+    @staticmethod
+    def key(
+        source_sha256: str,
+        placeholder: str,
+        new_prefix: str,
+        file_mode: FileMode,
+        subdir: str,
+    ) -> str:
+        """Return the key of the rewritten contents of a source file."""
+        return hashlib.sha256(
+            "\0".join(
+                (
+                    str(CACHE_VERSION),
+                    source_sha256,
+                    placeholder,
+                    new_prefix,
+                    str(file_mode),
+                    subdir,
+                )
+            ).encode()
+        ).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return join(self.cache_dir, key[:2], key)
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        """
+        Return the path of the cached file and its sha256, or None if ``key`` is not
+        cached. With ``extra_safety_checks``, the sha256 of the file is verified.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(f"{path}.json") as fh:
+                entry = json.load(fh)
+            sha256 = entry["sha256"]
+            if os.lstat(path).st_size != entry["size"] or (
+                context.extra_safety_checks and compute_sum(path, "sha256") != sha256
+            ):
+                log.debug("Removing invalid prefix rewrite cache entry %s", path)
+                self._remove(path)
+                return None
+            os.utime(f"{path}.json")
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        log.log(TRACE, "prefix rewrite cache hit %s", path)
+        return path, sha256
+
+    def put(self, key: str, source: str, sha256: str) -> None:
+        """
+        Store the rewritten file at ``source`` under ``key``, hard linking it if
+        possible. Failures are logged, not raised: the cache is an optimization.
+        """
+        path = self._entry_path(key)
+        temp = f"{path}.{uuid4().hex}{CONDA_TEMP_EXTENSION}"
+        try:
+            mkdir_p(dirname(path))
+            try:
+                os.link(source, temp)
+            except OSError:
+                copy2(source, temp)
+            size = os.lstat(temp).st_size
+            os.replace(temp, path)
+            with atomic_write(f"{path}.json") as fh:
+                json.dump({"sha256": sha256, "size": size}, fh)
+        except OSError as e:
+            log.debug("Could not cache rewritten file %s: %r", source, e)
+            self._remove(temp)
+            self._remove(path)
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            if self._size is None or self._size > self.max_size:
+                self.trim()
+
+    def trim(self) -> None:
+        """Remove the least recently used entries until they fit the size limit."""
+        entries = []
+        for subdir in _scandir(self.cache_dir):
+            if not subdir.is_dir():
+                continue
+            for entry in _scandir(subdir.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                path = entry.path[: -len(".json")]
+                try:
+                    entries.append(
+                        (entry.stat().st_mtime, path, os.lstat(path).st_size)
+                    )
+                except OSError:
+                    continue
+        entries.sort()
+        size = sum(entry_size for _, _, entry_size in entries)
+        max_size = self.max_size
+        for _, path, entry_size in entries:
+            if size <= max_size:
+                break
+            log.log(TRACE, "evicting prefix rewrite cache entry %s", path)
+            self._remove(path)
+            size -= entry_size
+        self._size = size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        for name in (f"{path}.json", path):
+            try:
+                os.unlink(name)
+            except OSError:
+                pass
+
+
+def _scandir(path: str) -> list[os.DirEntry]:
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except OSError:
+        return []
@@ -18,10 +18,11 @@ from ..auxlib.ish import dals
 from ..base.constants import REPODATA_FN, UNKNOWN_CHANNEL, DepsModifier, UpdateModifier
 from ..base.context import context
 from ..common.constants import NULL, TRACE
-from ..common.io import dashlist, time_recorder
+from ..common.io import dashlist
 from ..common.iterators import groupby_to_dict as groupby
 from ..common.iterators import unique
 from ..common.path import get_major_minor_version, paths_equal
+from ..common.tracing import traced
 from ..exceptions import (
     NoChannelsConfiguredError,
     PackagesNotFoundInChannelsError,
@@ -41,17 +42,12 @@ from .link import PrefixSetup, UnlinkLinkTransaction
 from .prefix_data import PrefixData
 from .subdir_data import SubdirData
 
-try:
-    from frozendict import frozendict
-except ImportError:
-    from ..auxlib.collection import frozendict
-
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
     from typing import ClassVar
 
     from ..models.records import PackageRecord
-    from ..resolve import Resolve
+    from ..resolve import Resolve, SolveStats
 
 log = getLogger(__name__)
 
@@ -68,6 +64,8 @@ class BaseSolver:
 
     _index: ReducedIndex | None
     _r: Resolve | None
+    #: Statistics of the last solve, if the solver backend collects them.
+    solve_stats: SolveStats | None
 
     supports_exclude_newer_global: ClassVar[bool] = False
     supports_exclude_newer_channel: ClassVar[bool] = False
@@ -122,6 +120,7 @@ class BaseSolver:
         self.unmerged_specs_to_add = frozenset(MatchSpec(s) for s in specs_to_add)
         self.unmerged_specs_to_remove = frozenset(MatchSpec(s) for s in specs_to_remove)
         self.neutered_specs = ()
+        self.solve_stats = None
         self._command = command
 
         if unknown_subdirs := set(self.subdirs) - context.known_subdirs:
@@ -557,8 +556,6 @@ class Solver(BaseSolver):
 
             ssc = self._post_sat_handling(ssc)
 
-        time_recorder.log_totals()
-
         ssc.solution_precs = tuple(PrefixGraph(ssc.solution_precs).graph)
         log.debug(
             "solved prefix %s\n  solved_linked_dists:\n    %s\n",
@@ -654,7 +651,7 @@ class Solver(BaseSolver):
                     update_constrained = update_constrained | {pkg}
         return update_constrained
 
-    @time_recorder(module_name=__name__)
+    @traced()
     def _collect_all_metadata(self, ssc):
         if ssc.prune:
             # When pruning DO NOT consider history of already installed packages when solving.
@@ -762,12 +759,15 @@ class Solver(BaseSolver):
                 rec_has_a_feature = set(rec.features or ()) & feature_names
                 if rec_has_a_feature and rec.name in ssc.specs_from_history_map:
                     spec = ssc.specs_map.get(rec.name, MatchSpec(rec.name))
-                    spec._match_components = frozendict(
-                        {
+                    # MatchSpec instances are interned and shared, build a new one
+                    spec = MatchSpec(
+                        optional=spec.optional,
+                        target=spec.target,
+                        **{
                             key: value
                             for key, value in spec._match_components.items()
                             if key != "features"
-                        }
+                        },
                     )
                     ssc.specs_map[spec.name] = spec
                 else:
@@ -776,7 +776,7 @@ class Solver(BaseSolver):
             ssc.solution_precs = tuple(graph.graph)
         return ssc
 
-    @time_recorder(module_name=__name__)
+    @traced()
     def _find_inconsistent_packages(self, ssc):
         # We handle as best as possible environments in inconsistent states. To do this,
         # we remove now from consideration the set of packages causing inconsistencies,
@@ -1101,7 +1101,7 @@ class Solver(BaseSolver):
 
         return ssc
 
-    @time_recorder(module_name=__name__)
+    @traced()
     def _run_sat(self, ssc):
         final_environment_specs = dict.fromkeys(
             (
@@ -1134,6 +1134,7 @@ class Solver(BaseSolver):
             )
             or []
         )
+        conflict_retries = 0
         while conflicting_specs:
             specs_modified = False
             if log.isEnabledFor(DEBUG):
@@ -1178,6 +1179,7 @@ class Solver(BaseSolver):
                     final_environment_specs.setdefault(neutered_spec)
                     ssc.specs_map[spec.name] = neutered_spec
             if specs_modified:
+                conflict_retries += 1
                 conflicting_specs = set(
                     ssc.r.get_conflicting_specs(
                         tuple(final_environment_specs), self.specs_to_add
@@ -1202,6 +1204,8 @@ class Solver(BaseSolver):
                 history_specs=ssc.specs_from_history_map,
                 should_retry_solve=ssc.should_retry_solve,
             )
+            self.solve_stats = ssc.r.solve_stats
+            self.solve_stats.conflict_retries = conflict_retries
         else:
             # shortcut to raise an unsat error without needing another solve step when
             # unsatisfiable_hints is off
@@ -20,6 +20,7 @@ from ..base.context import context
 from ..common.io import DummyExecutor, ThreadLimitedThreadPoolExecutor
 from ..common.path import url_to_path
 from ..common.serialize import json
+from ..common.tracing import span
 from ..common.url import join_url
 from ..exceptions import ChannelError, CondaUpgradeError, UnavailableInvalidChannel
 from ..gateways.disk.delete import rm_rf
@@ -230,13 +231,9 @@ class SubdirData(metaclass=SubdirDataType):
         if isinstance(param, MatchSpec):
             if param.get_exact_value("name"):
                 package_name = param.get_exact_value("name")
-                for prec in self._iter_records_by_name(package_name):
-                    if param.match(prec):
-                        yield prec
+                yield from param.filter(self._iter_records_by_name(package_name))
             else:
-                for prec in self.iter_records():
-                    if param.match(prec):
-                        yield prec
+                yield from param.filter(self.iter_records())
         else:
             if not isinstance(param, PackageRecord):
                 raise TypeError("Query did not result in a record.")
@@ -377,7 +374,8 @@ class SubdirData(metaclass=SubdirDataType):
 
         This method loads the internal state of the SubdirData instance.
         """
-        _internal_state = self._load()
+        with span("subdir_data_load", "repodata", url=self.url_w_repodata_fn):
+            _internal_state = self._load()
         if _internal_state.get("repodata_version", 0) > MAX_REPODATA_VERSION:
             raise CondaUpgradeError(
                 dals(
@@ -437,8 +435,10 @@ class SubdirData(metaclass=SubdirDataType):
         """
         try:
             fetcher = self.repo_fetch
-            repodata, state = fetcher.fetch_latest_parsed()
-            return self._process_raw_repodata(repodata, state)
+            with span("repodata_fetch", "repodata"):
+                repodata, state = fetcher.fetch_latest_parsed()
+            with span("repodata_process", "repodata"):
+                return self._process_raw_repodata(repodata, state)
         except UnavailableInvalidChannel:
             if self.repodata_fn != REPODATA_FN:
                 self.repodata_fn = REPODATA_FN
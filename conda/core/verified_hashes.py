@@ -0,0 +1,175 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""Remembered sha256 values of the files of extracted packages.
+
+With ``extra_safety_checks``, :class:`LinkPathAction
+<conda.core.path_actions.LinkPathAction>` verifies the sha256 of every file it links
+against the package's ``info/paths.json``. The files of an extracted package do not
+change between installs, yet they were hashed again for every environment the
+package was linked into. The sha256 values computed for an extracted package are
+kept in its ``info/verified_hashes.json``, together with the size, modification time
+and inode of each file, and a file is only hashed again once these changed.
+
+Before the link actions of a transaction are verified one by one,
+:func:`hash_in_bulk` hashes all files without a remembered value on a thread pool,
+reading them with large buffers, for which ``hashlib`` releases the GIL.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from logging import getLogger
+from os.path import join
+from typing import TYPE_CHECKING
+
+from .. import CondaError
+from ..base.context import context
+from ..common.io import DummyExecutor, ThreadLimitedThreadPoolExecutor
+from ..common.serialize import json
+from ..gateways.disk.read import compute_sum
+from ..gateways.disk.update import atomic_write
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+log = getLogger(__name__)
+
+VERIFIED_HASHES_FILENAME = "verified_hashes.json"
+
+#: Part of the file; bump it whenever its format changes.
+VERIFIED_HASHES_VERSION = 1
+
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+class VerifiedHashes:
+    """The remembered sha256 values of the files of an extracted package."""
+
+    _cache_: dict[str, VerifiedHashes] = {}
+
+    def __init__(self, extracted_package_dir: str):
+        self.extracted_package_dir = extracted_package_dir
+        self._lock = threading.Lock()
+        # short path -> [size, modification time, inode, sha256]; loaded when needed
+        self._files: dict[str, list] | None = None
+        self._changed = False
+
+    @classmethod
+    def for_package(cls, extracted_package_dir: str) -> VerifiedHashes:
+        if (hashes := cls._cache_.get(extracted_package_dir)) is None:
+            hashes = cls._cache_.setdefault(
+                extracted_package_dir, cls(extracted_package_dir)
+            )
+        return hashes
+
+    @property
+    def path(self) -> str:
+        return join(self.extracted_package_dir, "info", VERIFIED_HASHES_FILENAME)
+
+    def _load(self) -> dict[str, list]:
+        if self._files is None:
+            try:
+                with open(self.path) as fh:
+                    data = json.load(fh)
+                if data["version"] != VERIFIED_HASHES_VERSION:
+                    raise ValueError(data["version"])
+                self._files = dict(data["files"])
+            except (OSError, ValueError, KeyError, TypeError):
+                self._files = {}
+        return self._files
+
+    @staticmethod
+    def _stat_key(stat: os.stat_result) -> list[int]:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def get(self, short_path: str) -> str | None:
+        """
+        Return the remembered sha256 of a file of the package, or None if there is
+        none or the file changed since.
+        """
+        try:
+            stat = os.stat(join(self.extracted_package_dir, short_path))
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(short_path)
+        if entry and entry[:3] == self._stat_key(stat):
+            return entry[3]
+        return None
+
+    def sha256(self, short_path: str) -> str:
+        """Return the sha256 of a file of the package, hashing it unless remembered."""
+        if (sha256 := self.get(short_path)) is not None:
+            return sha256
+        path = join(self.extracted_package_dir, short_path)
+        # stat before hashing, so that a file changed meanwhile is hashed again
+        stat = os.stat(path)
+        sha256 = compute_sum(path, "sha256", buffer_size=HASH_BUFFER_SIZE)
+        with self._lock:
+            self._load()[short_path] = [*self._stat_key(stat), sha256]
+            self._changed = True
+        return sha256
+
+    def save(self) -> None:
+        """
+        Write the remembered values if any were added. Failures, e.g. in a read-only
+        package cache, are logged, not raised.
+        """
+        with self._lock:
+            if not self._changed:
+                return
+            data = {"version": VERIFIED_HASHES_VERSION, "files": dict(self._files)}
+            self._changed = False
+        try:
+            with atomic_write(self.path) as fh:
+                json.dump(data, fh)
+        except OSError as e:
+            log.debug("Could not write %s: %r", self.path, e)
+
+
+def _hash(hashes_and_short_path: tuple[VerifiedHashes, str]) -> None:
+    hashes, short_path = hashes_and_short_path
+    try:
+        hashes.sha256(short_path)
+    except (OSError, CondaError) as e:
+        # reported by the verification of the file
+        log.debug("Could not hash %s: %r", short_path, e)
+
+
+def hash_in_bulk(files: Iterable[tuple[str, str]]) -> None:
+    """
+    Hash the (extracted package directory, short path) files that have no remembered
+    sha256 on a thread pool, and remember the values in their packages.
+    """
+    packages: dict[str, VerifiedHashes] = {}
+    missing = []
+    for extracted_package_dir, short_path in dict.fromkeys(files):
+        if (hashes := packages.get(extracted_package_dir)) is None:
+            hashes = packages[extracted_package_dir] = VerifiedHashes.for_package(
+                extracted_package_dir
+            )
+        if hashes.get(short_path) is None:
+            missing.append((hashes, short_path))
+    if not missing:
+        return
+
+    # largest first, so that no thread is left hashing a large file at the end
+    missing.sort(key=lambda item: _size(*item), reverse=True)
+    executor = (
+        DummyExecutor()
+        if context.verify_threads == 1
+        else ThreadLimitedThreadPoolExecutor(context.verify_threads)
+    )
+    with executor:
+        for _ in executor.map(_hash, missing):
+            pass
+    for hashes in packages.values():
+        hashes.save()
+
+
+def _size(hashes: VerifiedHashes, short_path: str) -> int:
+    try:
+        return os.stat(join(hashes.extracted_package_dir, short_path)).st_size
+    except OSError:
+        return 0
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Protocol, runtime_checkable
 from requests import ConnectionError, HTTPError, Session  # noqa: F401, TID253
 from requests.adapters import (  # noqa: F401, TID253
     DEFAULT_POOLBLOCK,
+    DEFAULT_POOLSIZE,
     BaseAdapter,
     HTTPAdapter,
 )
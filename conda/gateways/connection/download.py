@@ -18,7 +18,7 @@ from ...auxlib.ish import dals
 from ...auxlib.logz import stringify
 from ...base.constants import CONDA_HOMEPAGE_URL, PARTIAL_EXTENSION
 from ...base.context import context
-from ...common.io import time_recorder
+from ...common.tracing import span
 from ...common.url import join_url
 from ...exceptions import (
     BasicClobberError,
@@ -54,7 +54,6 @@ def disable_ssl_verify_warning():
     warnings.simplefilter("ignore", InsecureRequestWarning)
 
 
-@time_recorder("download")
 def download(
     url,
     target_full_path,
@@ -62,16 +61,29 @@ def download(
     sha256=None,
     size=None,
     progress_update_callback=None,
+    chunk_callback=None,
 ):
+    """
+    Download ``url`` to ``target_full_path``, verifying its checksum and size.
+
+    ``chunk_callback``, if given, is called with the offset and the bytes of every
+    chunk written to the file as it is downloaded.
+    """
     if exists(target_full_path):
         maybe_raise(BasicClobberError(target_full_path, url, context), context)
     if not context.ssl_verify:
         disable_ssl_verify_warning()
 
-    with download_http_errors(url):
+    with download_http_errors(url), span("download", "fetch", url=url, size=size):
         try:
             download_inner(
-                url, target_full_path, md5, sha256, size, progress_update_callback
+                url,
+                target_full_path,
+                md5,
+                sha256,
+                size,
+                progress_update_callback,
+                chunk_callback,
             )
         except ChecksumMismatchError as e:
             if not e._kwargs["partial_download"]:
@@ -79,11 +91,25 @@ def download(
 
             log.warning("Retry failed partial download %s", target_full_path)
             download_inner(
-                url, target_full_path, md5, sha256, size, progress_update_callback
+                url,
+                target_full_path,
+                md5,
+                sha256,
+                size,
+                progress_update_callback,
+                chunk_callback,
             )
 
 
-def download_inner(url, target_full_path, md5, sha256, size, progress_update_callback):
+def download_inner(
+    url,
+    target_full_path,
+    md5,
+    sha256,
+    size,
+    progress_update_callback,
+    chunk_callback=None,
+):
     timeout = context.remote_connect_timeout_secs, context.remote_read_timeout_secs
     session = get_session(url)
 
@@ -146,11 +172,14 @@ def download_inner(url, target_full_path, md5, sha256, size, progress_update_cal
             # chunk could be the decompressed form of the real data
             # but we want the exact number of bytes read till now
             streamed_bytes = resp.raw.tell()
+            offset = target.tell()
             try:
                 target.write(chunk)
             except OSError as e:
                 message = "Failed to write to %(target_path)s\n  errno: %(errno)d"
                 raise CondaError(message, target_path=target.name, errno=e.errno)
+            if chunk_callback:
+                chunk_callback(offset, chunk)
             size_builder += len(chunk)
 
             if total_content_length and 0 <= streamed_bytes <= content_length:
@@ -24,6 +24,7 @@ from ...exceptions import OfflineError, PluginError, ProxyError
 from ...models.channel import Channel
 from ..anaconda_client import read_binstar_tokens
 from . import (
+    DEFAULT_POOLSIZE,
     AuthBase,
     BaseAdapter,
     CaseInsensitiveDict,
@@ -292,7 +293,11 @@ class CondaSession(Session, metaclass=CondaSessionType):
                 raise_on_status=False,
                 respect_retry_after_header=False,
             )
-            http_adapter = HTTPAdapter(max_retries=retry, ssl_context=ssl_context)
+            # keep alive a connection for each repodata (shard) download thread
+            pool_maxsize = max(DEFAULT_POOLSIZE, context.repodata_threads or 0)
+            http_adapter = HTTPAdapter(
+                max_retries=retry, ssl_context=ssl_context, pool_maxsize=pool_maxsize
+            )
             self.mount("http://", http_adapter)
             self.mount("https://", http_adapter)
             self.mount("ftp://", FTPAdapter())
@@ -94,6 +94,9 @@ deprecated.constant(
 # in __init__.py to help with circular imports
 mkdir_p = mkdir_p
 
+# ioctl cloning a file on Linux, _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
 python_entry_point_template = dals(
     r"""
 # -*- coding: utf-8 -*-
@@ -276,6 +279,39 @@ def _do_copy(src, dst):
         log.debug("%r", e)
 
 
+def reflink(src, dst):
+    """
+    Create ``dst`` as a reflink (copy-on-write clone) of the file ``src``. Raise
+    OSError if the file system does not support reflinks.
+    """
+    log.log(TRACE, "reflinking %s => %s", src, dst)
+    if sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        # clonefile(2) copies the metadata too; CLONE_NOFOLLOW = 1
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 1):
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), src, None, dst)
+        return
+    if not sys.platform.startswith("linux"):
+        raise OSError(f"reflinks are not supported on {sys.platform}")
+
+    import fcntl
+
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.unlink(dst)
+            raise
+    try:
+        copystat(src, dst)
+    except OSError as e:  # pragma: no cover
+        log.debug("%r", e)
+
+
 def create_link(src, dst, link_type=LinkType.hardlink, force=False):
     if link_type == LinkType.directory:
         # A directory is technically not a link.  So link_type is a misnomer.
@@ -323,6 +359,23 @@ def create_link(src, dst, link_type=LinkType.hardlink, force=False):
         _do_softlink(src, dst)
     elif link_type == LinkType.copy:
         copy(src, dst)
+    elif link_type == LinkType.reflink:
+        if islink(src):
+            copy(src, dst)
+            return
+        try:
+            reflink(src, dst)
+        except OSError as e:
+            log.debug(
+                "reflink failed. falling back to copy\n"
+                "  error: %r\n"
+                "  src: %s\n"
+                "  dst: %s",
+                e,
+                src,
+                dst,
+            )
+            copy(src, dst)
     else:
         raise CondaError(f"Did not expect linktype={link_type!r}")
 
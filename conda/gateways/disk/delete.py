@@ -8,6 +8,7 @@ import fnmatch
 import os
 import shutil
 import sys
+import threading
 from logging import getLogger
 from os.path import (
     abspath,
@@ -21,13 +22,15 @@ from os.path import (
     split,
     splitext,
 )
+from queue import Queue
 from subprocess import STDOUT, CalledProcessError, check_output
+from uuid import uuid4
 
 from ...base.constants import CONDA_TEMP_EXTENSION
 from ...base.context import context
 from ...common.compat import on_win
 from ...common.constants import TRACE
-from . import MAX_TRIES
+from . import MAX_TRIES, mkdir_p
 from .link import islink, lexists
 from .permissions import make_writable
 
@@ -37,6 +40,10 @@ if not on_win:
 
 log = getLogger(__name__)
 
+#: Directory of an environment or package cache holding the paths that are deleted
+#: in the background; see :func:`rm_rf_in_background`.
+TRASH_DIRNAME = ".trash"
+
 
 def rmtree(path):
     # subprocessing to delete large folders can be quite a bit faster
@@ -238,7 +245,8 @@ def rm_rf(path: str | os.PathLike, clean_empty_parents: bool = False) -> bool:
 def delete_trash(prefix):
     if not prefix:
         prefix = sys.prefix
-    exclude = {"envs", "pkgs"}
+    empty_trash_dir(join(prefix, TRASH_DIRNAME))
+    exclude = {"envs", "pkgs", TRASH_DIRNAME}
     for root, dirs, files in os.walk(prefix, topdown=True):
         dirs[:] = [d for d in dirs if d not in exclude]
         for fn in files:
@@ -253,6 +261,129 @@ def delete_trash(prefix):
                     log.debug("%r errno %d\nCannot unlink %s.", e, e.errno, filename)
 
 
+class _BackgroundDeleter:
+    """Daemon threads deleting the entries of trash directories."""
+
+    def __init__(self, threads: int):
+        self._threads = threads
+        self._started = 0
+        self._queue: Queue[str] = Queue()
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, path: str) -> None:
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+            if self._started < self._threads:
+                threading.Thread(
+                    target=self._work, name=f"conda-delete-{self._started}", daemon=True
+                ).start()
+                self._started += 1
+        self._queue.put(path)
+
+    def _work(self) -> None:
+        while True:
+            path = self._queue.get()
+            try:
+                _delete_trash_entry(path)
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+                self._queue.task_done()
+
+    def join(self) -> None:
+        self._queue.join()
+
+
+_background_deleter: _BackgroundDeleter | None = None
+_background_deleter_lock = threading.Lock()
+
+
+def _get_background_deleter() -> _BackgroundDeleter:
+    global _background_deleter
+    with _background_deleter_lock:
+        if _background_deleter is None:
+            _background_deleter = _BackgroundDeleter(context.execute_threads)
+        return _background_deleter
+
+
+def _delete_trash_entry(path: str) -> None:
+    # errors are ignored; whatever is left is deleted by the next empty_trash_dir()
+    log.log(TRACE, "deleting trash %s", path)
+    if isdir(path) and not islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.unlink(path)
+        except OSError as e:
+            log.debug("Cannot delete trash %s: %r", path, e)
+    try:
+        os.rmdir(dirname(path))
+    except OSError:
+        pass
+
+
+def move_to_trash(path: str, trash_dir: str) -> str | None:
+    """
+    Atomically rename ``path`` into ``trash_dir``, which must be on the same file
+    system; return its new path, or None if it cannot be renamed.
+    """
+    trash_path = join(trash_dir, uuid4().hex)
+    try:
+        mkdir_p(trash_dir)
+        os.rename(path, trash_path)
+    except OSError as e:
+        log.debug("Cannot move %s to trash: %r", path, e)
+        return None
+    log.log(TRACE, "moved %s to trash %s", path, trash_path)
+    return trash_path
+
+
+def rm_rf_in_background(
+    path: str | os.PathLike, trash_dir: str, clean_empty_parents: bool = False
+) -> bool:
+    """
+    Like :func:`rm_rf`, but with ``delete_in_background``, move ``path`` into
+    ``trash_dir``, a directory on the same file system, and delete it on a
+    background thread. Falls back to :func:`rm_rf` if ``path`` cannot be moved.
+    """
+    path = abspath(path)
+    if not context.delete_in_background or not lexists(path):
+        return rm_rf(path, clean_empty_parents)
+    if (trash_path := move_to_trash(path, trash_dir)) is None:
+        return rm_rf(path, clean_empty_parents)
+    _get_background_deleter().submit(trash_path)
+    if clean_empty_parents:
+        remove_empty_parent_paths(path)
+    return True
+
+
+def empty_trash_dir(trash_dir: str) -> None:
+    """
+    Delete the entries left in ``trash_dir``, e.g. by an earlier process that
+    exited before its background threads deleted them; in the background with
+    ``delete_in_background``.
+    """
+    try:
+        entries = os.listdir(trash_dir)
+    except OSError:
+        return
+    for entry in entries:
+        path = join(trash_dir, entry)
+        if context.delete_in_background:
+            _get_background_deleter().submit(path)
+        else:
+            _delete_trash_entry(path)
+
+
+def wait_for_background_deletion() -> None:
+    """Wait until the paths submitted for deletion in the background are deleted."""
+    if _background_deleter is not None:
+        _background_deleter.join()
+
+
 def backoff_rmdir(dirpath, max_tries=MAX_TRIES):
     if not isdir(dirpath):
         return
@@ -277,6 +408,8 @@ def path_is_clean(path):
     clean = not exists(path)
     if not clean:
         for root, dirs, fns in os.walk(path):
+            # the trash directory is being deleted in the background
+            dirs[:] = [d for d in dirs if d != TRASH_DIRNAME]
             for fn in fns:
                 if not (
                     fnmatch.fnmatch(fn, "*.conda_trash*")
@@ -64,7 +64,11 @@ def yield_lines(path):
             raise
 
 
-def compute_sum(path: str | os.PathLike, algo: Literal["md5", "sha256"]) -> str:
+def compute_sum(
+    path: str | os.PathLike,
+    algo: Literal["md5", "sha256"],
+    buffer_size: int = 8192,
+) -> str:
     path = Path(path)
     if not path.is_file():
         raise PathNotFoundError(path)
@@ -72,7 +76,7 @@ def compute_sum(path: str | os.PathLike, algo: Literal["md5", "sha256"]) -> str:
     # FUTURE: Python 3.11+, replace with hashlib.file_digest
     hasher = hashlib.new(algo)
     with path.open("rb") as fh:
-        for chunk in iter(partial(fh.read, 8192), b""):
+        for chunk in iter(partial(fh.read, buffer_size), b""):
             hasher.update(chunk)
     return hasher.hexdigest()
 
@@ -205,6 +209,23 @@ def read_paths_json(extracted_package_directory):
     return paths_data
 
 
+def read_placeholder_offsets(extracted_package_directory) -> dict[str, dict]:
+    """
+    Return where the placeholder occurs in the binary files of an extracted package,
+    by path, as recorded at extraction; empty if nothing was recorded.
+    """
+    path = join(extracted_package_directory, "info", "placeholder_offsets.json")
+    try:
+        with open_utf8(path) as fh:
+            data = json.load(fh)
+    except (OSError, ValueError) as e:
+        log.debug("No placeholder offsets in %s: %r", extracted_package_directory, e)
+        return {}
+    if not isinstance(data, dict) or data.get("version") != 1:
+        return {}
+    return data.get("paths") or {}
+
+
 def read_has_prefix(path):
     """Reads `has_prefix` file and return dict mapping filepaths to tuples(placeholder, FileMode).
 
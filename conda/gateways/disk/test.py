@@ -4,14 +4,14 @@
 
 from functools import cache
 from logging import getLogger
-from os import W_OK, access
+from os import W_OK, access, stat
 from os.path import basename, dirname, isdir, isfile, join
 from uuid import uuid4
 
 from ...common.constants import TRACE
 from ...common.path import expand
 from ...models.enums import LinkType
-from .create import create_link
+from .create import create_link, reflink
 from .delete import rm_rf
 from .link import islink, lexists
 
@@ -87,3 +87,36 @@ def softlink_supported(source_file, dest_dir):
         return False
     finally:
         rm_rf(test_path)
+
+
+# (device of the source file system, destination directory) to reflink support
+_reflink_support: dict[tuple[int, str], bool] = {}
+
+
+def reflink_supported(source_file, dest_dir) -> bool:
+    """
+    Return whether files can be reflinked from the file system of ``source_file`` into
+    ``dest_dir``. Probed once per source file system and ``dest_dir``, so once per
+    package cache and prefix rather than once per package.
+    """
+    key = (stat(source_file).st_dev, dest_dir)
+    if (supported := _reflink_support.get(key)) is None:
+        supported = _reflink_support[key] = _probe_reflink(source_file, dest_dir)
+    return supported
+
+
+def _probe_reflink(source_file, dest_dir) -> bool:
+    test_path = join(dest_dir, f".tmp.{basename(source_file)}.{str(uuid4())[:8]}")
+    if not isdir(dest_dir):
+        raise OSError(f"Path {dest_dir} is not a directory")
+    try:
+        reflink(source_file, test_path)
+    except OSError as e:
+        log.log(TRACE, "reflink IS NOT supported for %s => %s", source_file, dest_dir)
+        log.debug("%r", e)
+        return False
+    else:
+        log.log(TRACE, "reflink supported for %s => %s", source_file, dest_dir)
+        return True
+    finally:
+        rm_rf(test_path)
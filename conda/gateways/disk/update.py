@@ -7,14 +7,15 @@ from __future__ import annotations
 import os
 import re
 import tempfile
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from errno import EINVAL, EPERM, EXDEV
+from functools import cache
 from logging import getLogger
 from os.path import basename, dirname, exists, isdir, join, split
 from shutil import move
 from subprocess import PIPE, Popen
 
-from ...base.constants import DRY_RUN_PREFIX
+from ...base.constants import CONDA_TEMP_EXTENSION, DRY_RUN_PREFIX
 from ...base.context import context
 from ...common.compat import on_win
 from ...common.constants import TRACE
@@ -132,6 +133,44 @@ def rename_context(source: str, destination: str | None = None, dry_run: bool =
         raise exc
 
 
+@cache
+def _umask() -> int:
+    # reading the umask means setting it; do it once rather than racing other threads
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+@contextmanager
+def atomic_write(path, mode: str = "w"):
+    """
+    Open a temporary file next to ``path`` for writing, and move it onto ``path`` once
+    the block completes, so that a concurrent reader never sees a partial file. The
+    temporary file is removed if the block raises.
+
+    Unlike with :func:`tempfile.mkstemp` alone, the file gets the permissions a plain
+    ``open()`` would have given it.
+
+    Example:
+        with atomic_write(path) as fh:
+            fh.write(data)
+    """
+    directory, name = split(os.fspath(path))
+    fd, temp = tempfile.mkstemp(
+        dir=directory or None, prefix=f".{name}.", suffix=CONDA_TEMP_EXTENSION
+    )
+    try:
+        with os.fdopen(fd, mode) as fh:
+            yield fh
+        if not on_win:
+            os.chmod(temp, 0o666 & ~_umask())
+        os.replace(temp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temp)
+        raise
+
+
 def backoff_rename(source_path, destination_path, force=False):
     exp_backoff_fn(rename, source_path, destination_path, force)
 
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import re
@@ -14,7 +15,7 @@ from ast import literal_eval
 from errno import EACCES, EPERM, EROFS
 from itertools import islice
 from operator import itemgetter
-from os.path import isdir, isfile, join
+from os.path import isdir, join
 from textwrap import dedent
 from typing import TYPE_CHECKING
 
@@ -22,21 +23,29 @@ from . import __version__ as CONDA_VERSION
 from .auxlib.ish import dals
 from .base.constants import DEFAULTS_CHANNEL_NAME
 from .base.context import context
-from .common.compat import ensure_text_type, open_utf8
+from .common.compat import ensure_text_type
 from .common.iterators import groupby_to_dict as groupby
 from .common.path import paths_equal
+from .common.serialize import json
 from .core.prefix_data import PrefixData
 from .exceptions import CondaHistoryError, NotWritableError
-from .gateways.disk.update import touch
+from .gateways.disk.update import atomic_write, touch
 from .models.dist import dist_str_to_quad
 from .models.match_spec import MatchSpec
 from .models.version import VersionOrder, version_relation_re
 
 if TYPE_CHECKING:
+    from typing import Any
+
     from .common.path import PathType
 
 log = logging.getLogger(__name__)
 
+#: Bump when the layout of the history index changes.
+HISTORY_INDEX_VERSION = 1
+#: Bytes at the start and at the end of the indexed history used to detect rewrites.
+HISTORY_INDEX_CHECK_SIZE = 4096
+
 
 class CondaHistoryWarning(Warning):
     pass
@@ -91,6 +100,7 @@ class History:
         self.prefix = prefix
         self.meta_dir = join(prefix, "conda-meta")
         self.path = join(self.meta_dir, "history")
+        self.index_path = join(self.meta_dir, "history.index")
 
     def __enter__(self):
         self.init_log_file()
@@ -129,25 +139,133 @@ class History:
 
         Comments appearing before the first section header (e.g. ``==> 2024-01-01 00:00:00 <==``)
         in the history file will be ignored.
+
+        Revisions are read from the history index (see :meth:`_load_index`), so
+        only the lines appended since the index was last written are parsed.
         """
-        res = []
-        if not isfile(self.path):
-            return res
+        return [tuple(revision) for revision in self._load_index()["revisions"]]
+
+    @staticmethod
+    def _parse_lines(lines: list[str], revisions: list[list]) -> None:
+        """Parse history lines, appending to the revisions parsed so far."""
         sep_pat = re.compile(r"==>\s*(.+?)\s*<==")
-        with open_utf8(self.path) as f:
-            lines = f.read().splitlines()
         for line in lines:
             line = line.strip()
             if not line:
                 continue
             m = sep_pat.match(line)
             if m:
-                res.append((m.group(1), set(), []))
-            elif line.startswith("#") and res:
-                res[-1][2].append(line)
-            elif res:
-                res[-1][1].add(line)
-        return res
+                revisions.append([m.group(1), set(), []])
+            elif line.startswith("#") and revisions:
+                revisions[-1][2].append(line)
+            elif revisions:
+                revisions[-1][1].add(line)
+
+    @staticmethod
+    def _index_check(f, size: int) -> str:
+        """Fingerprint the first ``size`` bytes of the history file by its ends."""
+        f.seek(0)
+        head = f.read(min(size, HISTORY_INDEX_CHECK_SIZE))
+        f.seek(max(size - HISTORY_INDEX_CHECK_SIZE, 0))
+        tail = f.read(size - f.tell())
+        return hashlib.sha256(head + tail).hexdigest()
+
+    def _read_index(self) -> dict[str, Any] | None:
+        try:
+            with open(self.index_path, "rb") as f:
+                index = json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.debug("Ignoring unreadable history index %s: %s", self.index_path, e)
+            return None
+        if not isinstance(index, dict) or index.get("version") != HISTORY_INDEX_VERSION:
+            return None
+        for revision in index["revisions"]:
+            revision[1] = set(revision[1])
+        return index
+
+    def _write_index(self, index: dict[str, Any]) -> None:
+        try:
+            with atomic_write(self.index_path) as f:
+                f.write(
+                    json.dumps(
+                        {
+                            **index,
+                            "revisions": [
+                                (date, sorted(content), comments)
+                                for date, content, comments in index["revisions"]
+                            ],
+                        },
+                        indent=None,
+                    )
+                )
+        except OSError as e:
+            log.debug("Could not write history index %s: %s", self.index_path, e)
+
+    def _load_index(self, write: bool = False) -> dict[str, Any]:
+        """Return the history index, brought up to date with the history file.
+
+        The index (``conda-meta/history.index``) holds the parsed revisions and
+        the requested specs of all but the last revision (which may still grow),
+        up to the ``size`` of the history file it was built from. The history is
+        only ever appended to, so only the bytes past ``size`` are parsed. The
+        index is rebuilt when the indexed part of the history changed.
+
+        The index is only written when ``write`` is true, i.e. by
+        :meth:`write_changes` and :meth:`write_specs`, so reading the history of
+        a read-only environment never writes to it.
+        """
+        index = {
+            "version": HISTORY_INDEX_VERSION,
+            "size": 0,
+            "check": None,
+            "revisions": [],
+            "closed": 0,
+            "specs": {},
+        }
+        try:
+            with open(self.path, "rb") as f:
+                cached = self._read_index()
+                if (
+                    cached
+                    and cached["size"] <= os.fstat(f.fileno()).st_size
+                    and cached["check"] == self._index_check(f, cached["size"])
+                ):
+                    index = cached
+                f.seek(index["size"])
+                data = f.read()
+                # only index whole lines, the history is written a line at a time
+                end = data.rfind(b"\n") + 1
+                if end:
+                    self._parse_lines(
+                        data[:end].decode("utf-8").splitlines(), index["revisions"]
+                    )
+                    self._close_revisions(index)
+                    index["size"] += end
+                    index["check"] = self._index_check(f, index["size"])
+                    if write:
+                        self._write_index(index)
+        except FileNotFoundError:
+            return index
+        if rest := data[end:]:
+            self._parse_lines(rest.decode("utf-8").splitlines(), index["revisions"])
+        return index
+
+    def _close_revisions(self, index: dict[str, Any]) -> None:
+        """Fold the requested specs of revisions that cannot grow into the index."""
+        last = len(index["revisions"]) - 1
+        if index["specs"] is not None and index["closed"] < last:
+            try:
+                for revision in index["revisions"][index["closed"] : last]:
+                    self._update_requested_specs(
+                        index["specs"], self._revision_request(*revision)
+                    )
+            except Exception as e:
+                # get_requested_specs_map replays (and reports) the broken request
+                log.debug("Not indexing requested specs of %s: %s", self.path, e)
+                index["specs"] = None
+        index["closed"] = max(last, 0)
 
     @staticmethod
     def _parse_old_format_specs_string(specs_string):
@@ -226,18 +344,10 @@ class History:
         """
         res = []
         for dt, unused_cont, comments in self.parse():
-            item = {"date": dt}
-            for line in comments:
-                comment_items = self._parse_comment_line(line)
-                item.update(comment_items)
-
+            item = self._revision_request(dt, unused_cont, comments)
             if "cmd" in item:
                 res.append(item)
 
-            dists = groupby(itemgetter(0), unused_cont)
-            item["unlink_dists"] = dists.get("-", ())
-            item["link_dists"] = dists.get("+", ())
-
         conda_versions_from_history = tuple(
             x["conda_version"] for x in res if "conda_version" in x
         )
@@ -285,26 +395,53 @@ class History:
 
         return res
 
+    @classmethod
+    def _revision_request(cls, dt, content, comments) -> dict[str, Any]:
+        """Return the user request recorded by a revision."""
+        item = {"date": dt}
+        for line in comments:
+            comment_items = cls._parse_comment_line(line)
+            item.update(comment_items)
+
+        dists = groupby(itemgetter(0), content)
+        item["unlink_dists"] = dists.get("-", ())
+        item["link_dists"] = dists.get("+", ())
+        return item
+
+    @staticmethod
+    def _update_requested_specs(spec_map: dict[str, str], request) -> None:
+        """Apply a user request to a map of package names to spec strings."""
+        if "cmd" not in request:
+            return
+        for spec in request.get("remove_specs", ()):
+            spec_map.pop(MatchSpec(spec).name, None)
+        for spec in request.get("update_specs", ()):
+            spec_map[MatchSpec(spec).name] = spec
+        # here is where the neutering takes effect, overriding past values
+        for spec in request.get("neutered_specs", ()):
+            spec_map[MatchSpec(spec).name] = spec
+
     def get_requested_specs_map(self):
         # keys are package names and values are specs
-        spec_map = {}
-        for request in self.get_user_requests():
-            remove_specs = (MatchSpec(spec) for spec in request.get("remove_specs", ()))
-            for spec in remove_specs:
-                spec_map.pop(spec.name, None)
-            update_specs = (MatchSpec(spec) for spec in request.get("update_specs", ()))
-            spec_map.update((s.name, s) for s in update_specs)
-            # here is where the neutering takes effect, overriding past values
-            neutered_specs = (
-                MatchSpec(spec) for spec in request.get("neutered_specs", ())
-            )
-            spec_map.update((s.name, s) for s in neutered_specs)
+        index = self._load_index()
+        if index["specs"] is None:
+            spec_map = {}
+            revisions = index["revisions"]
+        else:
+            spec_map = dict(index["specs"])
+            revisions = index["revisions"][index["closed"] :]
+        for revision in revisions:
+            self._update_requested_specs(spec_map, self._revision_request(*revision))
 
         # Conda hasn't always been good about recording when specs have been removed from
         # environments.  If the package isn't installed in the current environment, then we
         # shouldn't try to force it here.
         prefix_recs = {_.name for _ in PrefixData(self.prefix).iter_records()}
-        return {name: spec for name, spec in spec_map.items() if name in prefix_recs}
+        return {
+            name: MatchSpec(spec)
+            for name, spec in spec_map.items()
+            if name in prefix_recs
+        }
 
     def construct_states(self):
         """Return a list of tuples(datetime strings, set of distributions)."""
@@ -402,6 +539,7 @@ class History:
                 fo.write(f"-{fn}\n")
             for fn in sorted(current_state - last_state):
                 fo.write(f"+{fn}\n")
+        self._load_index(write=True)
 
     def write_specs(self, remove_specs=(), update_specs=(), neutered_specs=()):
         remove_specs = [str(MatchSpec(s)) for s in remove_specs]
@@ -415,6 +553,7 @@ class History:
                     fh.write(f"# update specs: {update_specs}\n")
                 if neutered_specs:
                     fh.write(f"# neutered specs: {neutered_specs}\n")
+            self._load_index(write=True)
 
 
 if __name__ == "__main__":
@@ -83,6 +83,9 @@ class LinkType(Enum):
     softlink = 2
     copy = 3
     directory = 4
+    # a copy sharing the data blocks of its source until either is modified
+    # (copy-on-write), on file systems supporting it (e.g. btrfs, XFS, APFS)
+    reflink = 5
 
     def __int__(self):
         return self.value
@@ -15,8 +15,11 @@ Object inheritance:
 
 from __future__ import annotations
 
+from logging import getLogger
 from os.path import basename, join
 from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
 
 from boltons.timeutils import dt_to_timestamp, isoparse
 
@@ -33,11 +36,19 @@ from ..auxlib.entity import (
 )
 from ..base.context import context
 from ..common.compat import isiterable
+from ..common.serialize import json
 from ..exceptions import PathNotFoundError
 from .channel import Channel
 from .enums import FileMode, LinkType, NoarchType, PackageType, PathEnum, Platform
 from .match_spec import MatchSpec
 
+if TYPE_CHECKING:
+    from typing import Any
+
+    from ..common.path import PathType
+
+log = getLogger(__name__)
+
 
 class LinkTypeField(EnumField):
     def box(self, instance, instance_type, val):
@@ -679,6 +690,31 @@ class SolvedRecord(PackageRecord):
         return dumped
 
 
+#: Serializes :meth:`PrefixRecord._load_manifest` across threads.
+_manifest_lock = Lock()
+
+
+class _ManifestFieldMixin:
+    """
+    Field of the file manifest of a :class:`PrefixRecord`, read from its
+    ``conda-meta`` JSON file on first access when the record was created
+    with :meth:`PrefixRecord.from_summary`.
+    """
+
+    def __get__(self, instance, instance_type):
+        if instance is not None and "_manifest_path" in instance.__dict__:
+            instance._load_manifest()
+        return super().__get__(instance, instance_type)
+
+
+class ManifestListField(_ManifestFieldMixin, ListField):
+    pass
+
+
+class ManifestComposableField(_ManifestFieldMixin, ComposableField):
+    pass
+
+
 class PrefixRecord(SolvedRecord):
     """Representation of a package that is installed in a local conda environmnet.
 
@@ -699,10 +735,10 @@ class PrefixRecord(SolvedRecord):
     extracted_package_dir = StringField(required=False)
     """The path to the extracted package directory, usually in the local cache."""
 
-    files = ListField(str, default=(), required=False)
+    files = ManifestListField(str, default=(), required=False)
     """The list of all files comprising the package as relative paths from the prefix root."""
 
-    paths_data = ComposableField(
+    paths_data = ManifestComposableField(
         PathsData, required=False, nullable=True, default_in_dump=False
     )
     """List with additional information about the files, e.g. checksums and link type."""
@@ -717,6 +753,40 @@ class PrefixRecord(SolvedRecord):
     auth = StringField(required=False, nullable=True)
     """Authentication information."""
 
+    #: Fields only read from ``conda-meta`` when accessed, see :meth:`from_summary`.
+    manifest_fields = ("files", "paths_data")
+
+    @classmethod
+    def from_summary(
+        cls, summary: dict[str, Any], manifest_path: PathType
+    ) -> PrefixRecord:
+        """
+        Create a record from the contents of a ``conda-meta`` JSON file without
+        its :attr:`manifest_fields`, which are read from ``manifest_path`` when
+        first accessed.
+        """
+        record = cls(**summary)
+        record.__dict__["_manifest_path"] = manifest_path
+        return record
+
+    def _load_manifest(self) -> None:
+        with _manifest_lock:
+            # another thread may have loaded it while we waited for the lock
+            manifest_path = self.__dict__.get("_manifest_path")
+            if manifest_path is None:
+                return
+            try:
+                data = json.loads(Path(manifest_path).read_bytes())
+            except (OSError, ValueError) as e:
+                log.debug("Could not read file manifest %s: %s", manifest_path, e)
+                data = {}
+            for name in self.manifest_fields:
+                if name in data and name not in self.__dict__:
+                    setattr(self, name, data[name])
+            # only drop the path once the fields are set, so that readers that do
+            # not see it also see the loaded fields
+            self.__dict__.pop("_manifest_path", None)
+
     def _get_json_fn(self) -> str:
         return f"{self.name}-{self.version}-{self.build}.json"
 
@@ -4,6 +4,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import sys
 import traceback
 from logging import getLogger
@@ -15,19 +17,29 @@ from ....common.path import (
     get_python_site_packages_short_path,
     win_path_ok,
 )
-from ....core.prefix_data import get_conda_anchor_files_and_records
+from ....common.serialize import json
+from ....core.prefix_data import PrefixRecordDict, get_conda_anchor_files_and_records
 from ....gateways.disk.delete import rm_rf
+from ....gateways.disk.update import atomic_write
 from ....models.prefix_graph import PrefixGraph
 from ... import hookimpl
 from ...types import CondaPrefixDataLoader
 from .pkg_format import get_site_packages_anchor_files, read_python_record
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any
+
     from ....common.path import PathType
     from ....models.records import PrefixRecord
 
 log = getLogger(__name__)
 
+#: Bump when the cache layout or the way records are synthesized changes.
+PYPI_RECORDS_CACHE_VERSION = 1
+#: Not a ``.json`` file, which conda-meta reserves for the records of packages.
+PYPI_RECORDS_CACHE_FILE = ".pypi-records-cache"
+
 
 def resolved_short_path(short_path: str, prefix_path: Path) -> str:
     """Return short_path with any symlinks resolved."""
@@ -35,6 +47,79 @@ def resolved_short_path(short_path: str, prefix_path: Path) -> str:
     return resolved_path.relative_to(prefix_path.resolve()).as_posix()
 
 
+def get_pypi_records_cache_path(prefix_path: Path) -> Path:
+    """
+    Return the file caching the non-conda python records of a prefix. It is kept
+    in conda-meta, so that it goes away with the environment.
+    """
+    return prefix_path / "conda-meta" / PYPI_RECORDS_CACHE_FILE
+
+
+def _conda_records_key(prefix_path: Path, records: Iterable[str]) -> str | None:
+    """
+    Identify the conda-meta state that decides which anchor files are conda's,
+    by the name and stat of every record file (without parsing them) and the
+    names of the records loaded in memory.
+    """
+    try:
+        with os.scandir(prefix_path / "conda-meta") as entries:
+            stats = sorted(
+                f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size}"
+                for entry in entries
+                if entry.name.endswith(".json") and (stat := entry.stat())
+            )
+    except OSError:
+        return None
+    stats.extend(sorted(records))
+    return hashlib.sha256("\n".join(stats).encode()).hexdigest()
+
+
+def _anchor_file_key(prefix_path: Path, anchor_file: str) -> list[int] | None:
+    """
+    Identify the state of a distribution's metadata by the stat of its anchor
+    file and, for metadata directories, of the directory holding it.
+
+    Return None for distributions that should not be cached: egg-links point
+    outside of the prefix to metadata that changes without touching the link.
+    """
+    if anchor_file.endswith(".egg-link"):
+        return None
+    path = prefix_path / win_path_ok(anchor_file)
+    try:
+        stat = path.stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        if path.parent.name == "EGG-INFO" or path.parent.name.endswith(
+            (".dist-info", ".egg-info")
+        ):
+            key.append(path.parent.stat().st_mtime_ns)
+    except OSError:
+        return None
+    return key
+
+
+def _read_pypi_records_cache(cache_path: Path) -> dict[str, Any]:
+    try:
+        cache = json.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.debug("Ignoring unreadable pypi records cache %s: %s", cache_path, e)
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    if cache.get("version") != PYPI_RECORDS_CACHE_VERSION:
+        return {}
+    return cache
+
+
+def _write_pypi_records_cache(cache_path: Path, cache: dict[str, Any]) -> None:
+    try:
+        with atomic_write(cache_path) as fh:
+            fh.write(json.dumps(cache))
+    except OSError as e:
+        log.debug("Could not write pypi records cache %s: %s", cache_path, e)
+
+
 def load_site_packages(
     prefix: PathType, records: dict[str, PrefixRecord]
 ) -> dict[str, PrefixRecord]:
@@ -49,6 +134,11 @@ def load_site_packages(
 
     Packages clobbering conda packages (i.e. the conda-meta record) are
     removed from the in memory representation.
+
+    Results are cached per prefix (see :func:`get_pypi_records_cache_path`):
+    which anchor files belong to conda packages is reused while the conda
+    records are unchanged, and a synthesized record is reused while the stat
+    of its anchor file is unchanged, so only changed distributions are parsed.
     """
     python_pkg_record = records.get("python")
     if not python_pkg_record or not python_pkg_record.version:
@@ -73,22 +163,38 @@ def load_site_packages(
     if not resolved_site_packages_path.is_dir():
         return {}
 
-    # Get anchor files for corresponding conda (handled) python packages
-    prefix_graph = PrefixGraph(records.values())
-    python_records = prefix_graph.all_descendants(python_pkg_record)
-    conda_python_packages = get_conda_anchor_files_and_records(
-        resolved_site_packages_dir, python_records
-    )
+    cache_path = get_pypi_records_cache_path(prefix_path)
+    cache = _read_pypi_records_cache(cache_path)
+    if (
+        cache.get("site_packages") != resolved_site_packages_dir
+        or cache.get("python_version") != python_pkg_record.version
+    ):
+        cache = {}
+    conda_records_key = _conda_records_key(prefix_path, records)
 
-    if resolved_site_packages_dir != site_packages_dir:
-        # The short site-packages directory is a symlink to another path.
-        # It is possible that conda installed files through the symlink.
-        # Find those files and resolve them for comparison.
-        symlinked_conda_python_packages = get_conda_anchor_files_and_records(
-            site_packages_dir, python_records
+    if conda_records_key and cache.get("conda_records") == conda_records_key:
+        conda_python_packages = {
+            anchor_file: records[name]
+            for anchor_file, name in cache["conda_anchor_files"].items()
+        }
+    else:
+        # Get anchor files for corresponding conda (handled) python packages
+        prefix_graph = PrefixGraph(records.values())
+        python_records = prefix_graph.all_descendants(python_pkg_record)
+        conda_python_packages = get_conda_anchor_files_and_records(
+            resolved_site_packages_dir, python_records
         )
-        for anchor_file, pkg in symlinked_conda_python_packages.items():
-            conda_python_packages[resolved_short_path(anchor_file, prefix_path)] = pkg
+
+        if resolved_site_packages_dir != site_packages_dir:
+            # The short site-packages directory is a symlink to another path.
+            # It is possible that conda installed files through the symlink.
+            # Find those files and resolve them for comparison.
+            symlinked_conda_python_packages = get_conda_anchor_files_and_records(
+                site_packages_dir, python_records
+            )
+            for anchor_file, pkg in symlinked_conda_python_packages.items():
+                short_path = resolved_short_path(anchor_file, prefix_path)
+                conda_python_packages[short_path] = pkg
 
     # Get all anchor files and compare against conda anchor files to find clobbered conda
     # packages and python packages installed via other means (not handled by conda)
@@ -116,8 +222,26 @@ def load_site_packages(
             log.debug("removed due to stale information: %s", prefix_rec_json_path)
 
     # Create prefix records for python packages not handled by conda
-    new_packages = {}
+    cached_records = cache.get("pypi_records", {})
+    pypi_records: dict[str, dict[str, Any]] = {}
+    new_packages = PrefixRecordDict()
     for af in non_conda_anchor_files:
+        key = _anchor_file_key(prefix_path, af)
+        if key is not None and (cached := cached_records.get(af)) and (
+            cached["key"] == key
+        ):
+            pypi_records[af] = cached
+            if cached["record"] is None:
+                continue
+            # box lazily, like the records read from conda-meta
+            name = cached["record"]["name"]
+            new_packages.data[name] = cached["record"]
+            if isinstance(records, PrefixRecordDict):
+                records.data[name] = cached["record"]
+            else:
+                records[name] = new_packages[name]
+            continue
+
         try:
             python_record = read_python_record(
                 prefix_path, af, python_pkg_record.version
@@ -137,11 +261,30 @@ def load_site_packages(
             )
             log.debug("ValidationError: \n%s\n", "\n".join(tb))
             continue
+        if key is not None:
+            pypi_records[af] = {
+                "key": key,
+                "record": python_record.dump() if python_record else None,
+            }
         if not python_record:
             continue
         records[python_record.name] = python_record
         new_packages[python_record.name] = python_record
 
+    new_cache = {
+        "version": PYPI_RECORDS_CACHE_VERSION,
+        "site_packages": resolved_site_packages_dir,
+        "python_version": python_pkg_record.version,
+        "conda_records": conda_records_key,
+        "conda_anchor_files": {
+            anchor_file: prec.name
+            for anchor_file, prec in conda_python_packages.items()
+        },
+        "pypi_records": pypi_records,
+    }
+    if new_cache != cache:
+        _write_pypi_records_cache(cache_path, new_cache)
+
     return new_packages
 
 
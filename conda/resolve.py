@@ -8,7 +8,9 @@ See conda.core.solver.Solver for the high-level API.
 from __future__ import annotations
 
 import itertools
+import time
 from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
 from functools import cache
 from logging import DEBUG, getLogger
 from typing import TYPE_CHECKING
@@ -20,17 +22,19 @@ from .auxlib.decorators import memoizemethod
 from .base.constants import MAX_CHANNEL_PRIORITY, ChannelPriority, SatSolverChoice
 from .base.context import context
 from .common.compat import on_win
-from .common.io import dashlist, time_recorder
+from .common.io import dashlist
 from .common.iterators import groupby_to_dict as groupby
 from .common.logic import (
     TRUE,
     Clauses,
     PycoSatSolver,
+    PortfolioSatSolver,
     PyCryptoSatSolver,
     PySatSolver,
     minimal_unsatisfiable_subset,
 )
 from .common.toposort import toposort
+from .common.tracing import traced
 from .deprecations import deprecated
 from .exceptions import (
     CondaDependencyError,
@@ -66,6 +70,7 @@ _sat_solvers = {
     SatSolverChoice.PYCOSAT: PycoSatSolver,
     SatSolverChoice.PYCRYPTOSAT: PyCryptoSatSolver,
     SatSolverChoice.PYSAT: PySatSolver,
+    SatSolverChoice.PORTFOLIO: PortfolioSatSolver,
 }
 
 
@@ -124,6 +129,39 @@ def exactness_and_number_of_deps(resolve_obj, ms):
     return value
 
 
+@dataclass
+class MinimizeStats:
+    """Statistics of one ``minimize`` pass of :meth:`Resolve.solve`."""
+
+    objective: str
+    terms: int
+    value: int
+    sat_calls: int
+    seconds: float
+
+
+@dataclass
+class SolveStats:
+    """
+    Statistics of a :meth:`Resolve.solve` call, included in the ``--json``
+    output of ``conda create``, ``install`` and ``update``.
+    """
+
+    sat_solver: str | None = None
+    reduced_index_size: int = 0
+    variables: int = 0
+    clauses: int = 0
+    minimize: list[MinimizeStats] = field(default_factory=list)
+    #: Number of solutions found after the last ``minimize`` pass, at most 11.
+    solutions: int = 0
+    #: Rounds of relaxing conflicting specs before the solve, see ``Solver``.
+    conflict_retries: int = 0
+    seconds: float = 0.0
+
+    def dump(self) -> dict:
+        return asdict(self)
+
+
 class Resolve:
     def __init__(self, index, processed=False, channels=()):
         self.index = index
@@ -152,9 +190,13 @@ class Resolve:
         self.trackers = trackers  # dict[track_feature, set[PackageRecord]]
         self._cached_find_matches = {}  # dict[MatchSpec, set[PackageRecord]]
         self.ms_depends_ = {}  # dict[PackageRecord, list[MatchSpec]]
+        self._depends_ms_cache = {}  # dict[PackageRecord, tuple[MatchSpec, ...]]
+        self._version_key_cache = {}  # dict[PackageRecord, tuple]
+        self._valid_depends_cache = {}  # dict[tuple[PackageRecord, MatchSpec], bool]
         self._reduced_index_cache = {}
         self._pool_cache = {}
         self._strict_channel_cache = {}
+        self.solve_stats: SolveStats | None = None  # of the last solve()
 
         self._system_precs = {
             _
@@ -243,17 +285,22 @@ class Resolve:
     def valid2(self, spec_or_prec, filter_out, optional=True):
         def is_valid(_spec_or_prec):
             if isinstance(_spec_or_prec, MatchSpec):
-                return is_valid_spec(_spec_or_prec)
+                return is_valid_spec(None, _spec_or_prec)
             else:
                 return is_valid_prec(_spec_or_prec)
 
-        @memoizemethod
-        def is_valid_spec(_spec):
-            return (
-                optional
-                and _spec.optional
-                or any(is_valid_prec(_prec) for _prec in self.find_matches(_spec))
-            )
+        def is_valid_spec(_parent, _spec):
+            # MatchSpec instances are interned, so results are remembered per
+            # depending record rather than on the (shared) spec itself
+            key = (_parent, _spec)
+            val = self._valid_depends_cache.get(key)
+            if val is None:
+                val = self._valid_depends_cache[key] = (
+                    optional
+                    and _spec.optional
+                    or any(is_valid_prec(_prec) for _prec in self.find_matches(_spec))
+                )
+            return val
 
         def is_valid_prec(prec):
             val = filter_out.get(prec)
@@ -261,7 +308,7 @@ class Resolve:
                 filter_out[prec] = False
                 try:
                     has_valid_deps = all(
-                        is_valid_spec(ms) for ms in self.ms_depends(prec)
+                        is_valid_spec(prec, ms) for ms in self.ms_depends(prec)
                     )
                 except InvalidSpec:
                     val = filter_out[prec] = "invalid dep specs"
@@ -438,16 +485,16 @@ class Resolve:
         self, root_spec, target_name, dep_graph, num_targets=1
     ):
         """Return shorted path from root_spec to target_name"""
-        queue = []
+        queue = deque()
         queue.append([root_spec])
-        visited = []
+        visited = set()
         target_paths = []
         while queue:
-            path = queue.pop(0)
+            path = queue.popleft()
             node = path[-1]
             if node in visited:
                 continue
-            visited.append(node)
+            visited.add(node)
             if node.name == target_name:
                 if len(target_paths) == 0:
                     target_paths.append(path)
@@ -478,26 +525,34 @@ class Resolve:
     def build_graph_of_deps(self, spec):
         dep_graph = {spec: {}}
         all_deps = set()
-        queue = [[spec]]
+        queue = deque([[spec]])
         while queue:
-            path = queue.pop(0)
+            path = queue.popleft()
             sub_graph = dep_graph
             for p in path:
                 sub_graph = sub_graph[p]
             parent_node = path[-1]
             matches = self.find_matches(parent_node)
             for mat in matches:
-                if len(mat.depends) > 0:
-                    for i in mat.depends:
-                        new_node = MatchSpec(i)
-                        sub_graph.update({new_node: {}})
-                        all_deps.add(new_node)
-                        new_path = list(path)
-                        new_path.append(new_node)
-                        if len(new_path) <= context.unsatisfiable_hints_check_depth:
-                            queue.append(new_path)
+                for new_node in self._depends_match_specs(mat):
+                    sub_graph.update({new_node: {}})
+                    all_deps.add(new_node)
+                    new_path = list(path)
+                    new_path.append(new_node)
+                    if len(new_path) <= context.unsatisfiable_hints_check_depth:
+                        queue.append(new_path)
         return dep_graph, all_deps
 
+    def _depends_match_specs(self, prec: PackageRecord) -> tuple[MatchSpec, ...]:
+        # Same records show up under many paths of the dependency graphs built
+        # for conflict reports; parse their depends only once.
+        deps = self._depends_ms_cache.get(prec)
+        if deps is None:
+            deps = self._depends_ms_cache[prec] = tuple(
+                MatchSpec(dep) for dep in prec.depends
+            )
+        return deps
+
     def build_conflict_map(
         self,
         specs: Iterable[MatchSpec],
@@ -530,7 +585,33 @@ class Resolve:
             The purpose of this code, then, is to identify packages (like numpy
             above) that all of the specs depend on *but in different ways*. We
             then identify the dependency chains that lead to those packages.
+
+            The analysis stops once ``context.unsatisfiable_hints_timeout_secs``
+            have elapsed (if set) and reports the conflicts found so far.
         """
+        timeout = context.unsatisfiable_hints_timeout_secs
+        deadline = time.monotonic() + timeout if timeout else None
+        timed_out = False
+
+        def out_of_time():
+            nonlocal timed_out
+            timed_out = timed_out or (
+                deadline is not None and time.monotonic() > deadline
+            )
+            return timed_out
+
+        # The same (root, target) chains are searched for many conflicting
+        # packages; memoize them for the duration of this analysis.
+        chain_cache = {}
+
+        def dep_chains(root, target_name, num_targets):
+            key = (root, target_name, num_targets)
+            if key not in chain_cache:
+                chain_cache[key] = self.breadth_first_search_for_dep_graph(
+                    root, target_name, dep_graph, num_targets
+                )
+            return [list(chain) for chain in chain_cache[key]]
+
         # if only a single package matches the spec use the packages depends
         # rather than the spec itself
         strict_channel_priority = context.channel_priority == ChannelPriority.STRICT
@@ -555,6 +636,8 @@ class Resolve:
             disable=context.json,
         ) as t:
             for spec in specs:
+                if out_of_time():
+                    break
                 t.set_description(f"Examining {spec}")
                 t.update()
                 dep_graph_for_spec, all_deps_for_spec = self.build_graph_of_deps(spec)
@@ -590,6 +673,8 @@ class Resolve:
             disable=context.json,
         ) as t:
             for roots, nodes in conflicting_pkgs_pkgs.items():
+                if out_of_time():
+                    break
                 t.set_description(
                     "Examining conflict for {}".format(" ".join(_.name for _ in roots))
                 )
@@ -607,16 +692,12 @@ class Resolve:
                         if root != chains[0][0]:
                             search_node = shortest_node.name
                             num_occurances = dep_list[search_node].count(root)
-                            c = self.breadth_first_search_for_dep_graph(
-                                root, search_node, dep_graph, num_occurances
-                            )
+                            c = dep_chains(root, search_node, num_occurances)
                             chains.extend(c)
                 else:
                     for node in nodes:
                         num_occurances = dep_list[node].count(lroots[0])
-                        chain = self.breadth_first_search_for_dep_graph(
-                            lroots[0], node, dep_graph, num_occurances
-                        )
+                        chain = dep_chains(lroots[0], node, num_occurances)
                         chains.extend(chain)
                         if len(current_shortest_chain) == 0 or len(chain) < len(
                             current_shortest_chain
@@ -625,11 +706,15 @@ class Resolve:
                             shortest_node = node
                     for root in lroots[1:]:
                         num_occurances = dep_list[shortest_node].count(root)
-                        c = self.breadth_first_search_for_dep_graph(
-                            root, shortest_node, dep_graph, num_occurances
-                        )
+                        c = dep_chains(root, shortest_node, num_occurances)
                         chains.extend(c)
 
+        if timed_out:
+            log.warning(
+                "Conflict analysis stopped after %ss (unsatisfiable_hints_timeout_secs); "
+                "the reported conflicts may be incomplete.",
+                timeout,
+            )
         return self._classify_bad_deps(
             chains,
             specs_to_add,
@@ -676,7 +761,7 @@ class Resolve:
             self._pool_cache[specs] = pool
         return pool
 
-    @time_recorder(module_name=__name__)
+    @traced()
     def get_reduced_index(
         self, explicit_specs, sort_by_exactness=True, exit_on_conflict=False
     ):
@@ -933,7 +1018,7 @@ class Resolve:
         else:
             candidate_precs = self.index.values()
 
-        res = tuple(p for p in candidate_precs if spec.match(p))
+        res = tuple(spec.filter(candidate_precs))
         self._cached_find_matches[spec] = res
         return res
 
@@ -946,12 +1031,16 @@ class Resolve:
         return deps
 
     def version_key(self, prec, vtype=None):
+        vkey = self._version_key_cache.get(prec)
+        if vkey is not None:
+            return vkey
         channel = prec.channel
         channel_priority = self._channel_priorities_map.get(
             channel.name, 1
         )  # TODO: ask @mcg1969 why the default value is 1 here
         valid = 1 if channel_priority < MAX_CHANNEL_PRIORITY else 0
-        version_comparator = VersionOrder(prec.get("version", ""))
+        # the plain tuple key orders like VersionOrder but compares much faster
+        version_comparator = VersionOrder(prec.get("version", "")).sort_key
         build_number = prec.get("build_number", 0)
         build_string = prec.get("build")
         noarch = -int(prec.subdir == "noarch")
@@ -963,6 +1052,7 @@ class Resolve:
             vkey.append(build_string)
         else:
             vkey.extend((prec.get("timestamp", 0), build_string))
+        vkey = self._version_key_cache[prec] = tuple(vkey)
         return vkey
 
     @staticmethod
@@ -1044,7 +1134,7 @@ class Resolve:
             tgroup = libs = self.index.keys()
             simple = False
         if not simple:
-            libs = [fkey for fkey in tgroup if spec.match(fkey)]
+            libs = list(spec.filter(tgroup))
         if len(libs) == len(tgroup):
             if spec.optional:
                 m = TRUE
@@ -1060,7 +1150,7 @@ class Resolve:
         C.name_var(m, sat_name)
         return sat_name
 
-    @time_recorder(module_name=__name__)
+    @traced()
     def gen_clauses(self):
         C = Clauses(sat_solver=_get_sat_solver_cls(context.sat_solver))
         for name, group in self.groups.items():
@@ -1444,7 +1534,7 @@ class Resolve:
         self.restore_bad(pkgs, preserve)
         return pkgs
 
-    @time_recorder(module_name=__name__)
+    @traced()
     def solve(
         self,
         specs: list,
@@ -1465,6 +1555,8 @@ class Resolve:
             )
             log.debug("Solving for: %s", dlist)
 
+        start = time.perf_counter()
+        self.solve_stats = stats = SolveStats()
         if not specs:
             return []
 
@@ -1475,6 +1567,7 @@ class Resolve:
         reduced_index = self.get_reduced_index(
             specs, exit_on_conflict=not context.unsatisfiable_hints
         )
+        stats.reduced_index_size = len(reduced_index)
         if not reduced_index:
             # something is intrinsically unsatisfiable - either not found or
             # not the right version
@@ -1505,6 +1598,20 @@ class Resolve:
             constraints = r2.generate_spec_constraints(C, specs)
             return C.sat(constraints, add_if)
 
+        def minimize(objective_name, objective, solution, trymax=False):
+            sat_calls, minimize_start = C.sat_calls, time.perf_counter()
+            solution, value = C.minimize(objective, solution, trymax=trymax)
+            stats.minimize.append(
+                MinimizeStats(
+                    objective_name,
+                    len(objective),
+                    value,
+                    C.sat_calls - sat_calls,
+                    time.perf_counter() - minimize_start,
+                )
+            )
+            return solution, value
+
         # Return a solution of packages
         def clean(sol):
             return [
@@ -1529,6 +1636,9 @@ class Resolve:
 
         r2 = Resolve(reduced_index, True, channels=self.channels)
         C = r2.gen_clauses()
+        stats.sat_solver = C.sat_solver
+        stats.variables = C.m
+        stats.clauses = C.get_clause_count()
         solution = mysat(specs, True)
         if not solution:
             if should_retry_solve:
@@ -1562,7 +1672,7 @@ class Resolve:
         log.debug("Solve: minimize removed packages")
         if _remove:
             eq_optional_c = r2.generate_removal_count(C, speco)
-            solution, obj7 = C.minimize(eq_optional_c, solution)
+            solution, obj7 = minimize("removal_count", eq_optional_c, solution)
             log.debug("Package removal metric: %d", obj7)
 
         # Requested packages: maximize versions
@@ -1570,14 +1680,14 @@ class Resolve:
         eq_req_c, eq_req_v, eq_req_b, eq_req_a, eq_req_t = r2.generate_version_metrics(
             C, specr
         )
-        solution, obj3a = C.minimize(eq_req_c, solution)
-        solution, obj3 = C.minimize(eq_req_v, solution)
+        solution, obj3a = minimize("requested_channels", eq_req_c, solution)
+        solution, obj3 = minimize("requested_versions", eq_req_v, solution)
         log.debug("Initial package channel/version metric: %d/%d", obj3a, obj3)
 
         # Track features: minimize feature count
         log.debug("Solve: minimize track_feature count")
         eq_feature_count = r2.generate_feature_count(C)
-        solution, obj1 = C.minimize(eq_feature_count, solution)
+        solution, obj1 = minimize("feature_count", eq_feature_count, solution)
         log.debug("Track feature count: %d", obj1)
 
         # Featured packages: minimize number of featureless packages
@@ -1588,30 +1698,32 @@ class Resolve:
         # environment, but not 'feat2'. In this case, the 'feat2' version of foo is
         # considered "featureless."
         eq_feature_metric = r2.generate_feature_metric(C)
-        solution, obj2 = C.minimize(eq_feature_metric, solution)
+        solution, obj2 = minimize("feature_metric", eq_feature_metric, solution)
         log.debug("Package misfeature count: %d", obj2)
 
         # Requested packages: maximize builds
         log.debug("Solve: maximize build numbers of requested packages")
-        solution, obj4 = C.minimize(eq_req_b, solution)
+        solution, obj4 = minimize("requested_builds", eq_req_b, solution)
         log.debug("Initial package build metric: %d", obj4)
 
         # prefer arch packages where available for requested specs
         log.debug("Solve: prefer arch over noarch for requested packages")
-        solution, noarch_obj = C.minimize(eq_req_a, solution)
+        solution, noarch_obj = minimize("requested_noarch", eq_req_a, solution)
         log.debug("Noarch metric: %d", noarch_obj)
 
         # Optional installations: minimize count
         if not _remove:
             log.debug("Solve: minimize number of optional installations")
             eq_optional_install = r2.generate_install_count(C, speco)
-            solution, obj49 = C.minimize(eq_optional_install, solution)
+            solution, obj49 = minimize(
+                "optional_install_count", eq_optional_install, solution
+            )
             log.debug("Optional package install metric: %d", obj49)
 
         # Dependencies: minimize the number of packages that need upgrading
         log.debug("Solve: minimize number of necessary upgrades")
         eq_u = r2.generate_update_count(C, speca)
-        solution, obj50 = C.minimize(eq_u, solution)
+        solution, obj50 = minimize("update_count", eq_u, solution)
         log.debug("Dependency update count: %d", obj50)
 
         # Remaining packages: maximize versions, then builds
@@ -1620,10 +1732,10 @@ class Resolve:
             "Prefer arch over noarch where equivalent."
         )
         eq_c, eq_v, eq_b, eq_a, eq_t = r2.generate_version_metrics(C, speca)
-        solution, obj5a = C.minimize(eq_c, solution)
-        solution, obj5 = C.minimize(eq_v, solution)
-        solution, obj6 = C.minimize(eq_b, solution)
-        solution, obj6a = C.minimize(eq_a, solution)
+        solution, obj5a = minimize("channels", eq_c, solution)
+        solution, obj5 = minimize("versions", eq_v, solution)
+        solution, obj6 = minimize("builds", eq_b, solution)
+        solution, obj6a = minimize("noarch", eq_a, solution)
         log.debug(
             "Additional package channel/version/build/noarch metrics: %d/%d/%d/%d",
             obj5a,
@@ -1635,13 +1747,13 @@ class Resolve:
         # Prune unnecessary packages
         log.debug("Solve: prune unnecessary packages")
         eq_c = r2.generate_package_count(C, specm)
-        solution, obj7 = C.minimize(eq_c, solution, trymax=True)
+        solution, obj7 = minimize("package_count", eq_c, solution, trymax=True)
         log.debug("Weak dependency count: %d", obj7)
 
         if not is_converged(solution):
             # Maximize timestamps
             eq_t.update(eq_req_t)
-            solution, obj6t = C.minimize(eq_t, solution)
+            solution, obj6t = minimize("timestamps", eq_t, solution)
             log.debug("Timestamp metric: %d", obj6t)
 
         log.debug("Looking for alternate solutions")
@@ -1660,6 +1772,7 @@ class Resolve:
                 break
             psolution = clean(solution)
             psolutions.append(psolution)
+        stats.solutions = nsol
 
         if nsol > 1:
             psols2 = list(map(set, psolutions))
@@ -1681,6 +1794,7 @@ class Resolve:
         #     return sol.split('[')[0]
 
         new_index = {self.to_sat_name(prec): prec for prec in self.index.values()}
+        stats.seconds = time.perf_counter() - start
 
         if returnall:
             if len(psolutions) > 1:
@@ -1,6 +1,6 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
-"""Verify the extraction worker module stays import-light."""
+"""Verify the extraction worker module stays import-light, and streaming extraction."""
 
 from __future__ import annotations
 
@@ -8,10 +8,12 @@ import subprocess
 import sys
 from concurrent.futures import ProcessPoolExecutor
 from multiprocessing import get_context
+from pathlib import Path
 
 import pytest
 
-from conda._private.extract import extract_conda_package_archive
+from conda._private.extract import StreamingExtraction, extract_conda_package_archive
+from conda.testing.helpers import CHANNEL_DIR_V1
 
 
 class _UnpickleableError(Exception):
@@ -69,3 +71,48 @@ def test_process_extract_normalizes_unpickleable_errors(tmp_path) -> None:
             match=r"_UnpickleableError: Could not extract archive\.conda to destination",
         ):
             future.result()
+
+
+@pytest.mark.parametrize(
+    "fn", ("zlib-1.2.11-h62dcd97_3.conda", "zlib-1.2.11-h62dcd97_3.tar.bz2")
+)
+@pytest.mark.parametrize("chunk_size", (1 << 14, 1000))
+def test_streaming_extraction(tmp_path: Path, fn: str, chunk_size: int) -> None:
+    source = Path(CHANNEL_DIR_V1, "win-64", fn)
+    data = source.read_bytes()
+    extract_conda_package_archive(source, tmp_path / "expected")
+
+    streaming = StreamingExtraction(source, tmp_path / "streamed")
+    for offset in range(0, len(data), chunk_size):
+        streaming.feed(offset, data[offset : offset + chunk_size])
+    assert streaming.close(), streaming.error
+
+    expected = {
+        path.relative_to(tmp_path / "expected"): path.read_bytes()
+        for path in (tmp_path / "expected").rglob("*")
+        if path.is_file()
+    }
+    assert expected
+    assert {
+        path.relative_to(tmp_path / "streamed"): path.read_bytes()
+        for path in (tmp_path / "streamed").rglob("*")
+        if path.is_file()
+    } == expected
+
+
+@pytest.mark.parametrize(
+    "fn", ("zlib-1.2.11-h62dcd97_3.conda", "zlib-1.2.11-h62dcd97_3.tar.bz2")
+)
+def test_streaming_extraction_fails(tmp_path: Path, fn: str) -> None:
+    data = Path(CHANNEL_DIR_V1, "win-64", fn).read_bytes()
+
+    truncated = StreamingExtraction(tmp_path / fn, tmp_path / "truncated")
+    truncated.feed(0, data[: len(data) // 2])
+    assert not truncated.close()
+
+    # bytes that do not continue the previous ones, e.g. from a retried download
+    restarted = StreamingExtraction(tmp_path / fn, tmp_path / "restarted")
+    restarted.feed(0, data[:1000])
+    restarted.feed(0, data)
+    assert not restarted.close()
+    assert isinstance(restarted.error, ValueError)
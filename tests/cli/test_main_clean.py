@@ -17,10 +17,15 @@ from conda.base.constants import (
     PARTIAL_EXTENSION,
 )
 from conda.base.context import context
-from conda.cli.main_clean import _get_size
+from conda.cli.main_clean import _get_size, find_pkgs
+from conda.common.compat import on_win
+from conda.core.content_store import CONTENT_STORE_DIRNAME
 from conda.core.subdir_data import create_cache_dir
+from conda.gateways.disk.delete import TRASH_DIRNAME
 from conda.gateways.logging import set_log_level
 
+from ..core.test_content_store import make_package
+
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
@@ -428,3 +433,77 @@ def test_get_size_list():
     with pytest.raises(NotImplementedError):
         _get_size("not-a-file", warnings=warnings)
     assert warnings
+
+
+# conda clean --deduplicate
+@pytest.mark.skipif(on_win, reason="checks hard link counts")
+def test_clean_deduplicate(conda_cli: CondaCLIFixture, tmp_pkgs_dir: Path):
+    shared = b"shared contents\n" * 100
+    for name in ("first", "second"):
+        make_package(tmp_pkgs_dir, name, {"lib/shared.py": shared})
+    first, second = (
+        tmp_pkgs_dir / f"{name}-1.0-0" / "lib" / "shared.py"
+        for name in ("first", "second")
+    )
+
+    stdout, _, _ = conda_cli("clean", "--deduplicate", "--yes", "--json")
+    assert json.loads(stdout)["deduplicate"] == {
+        "packages": 2,
+        "saved_size": len(shared),
+        "removed_blobs": 0,
+    }
+    assert first.samefile(second)
+
+    # links within the package cache do not mean the packages are in use
+    pkgs = find_pkgs()
+    assert pkgs["pkgs_dirs"] == {str(tmp_pkgs_dir): ("first-1.0-0", "second-1.0-0")}
+    # the shared file is released once
+    paths_json = sum(
+        (tmp_pkgs_dir / f"{name}-1.0-0" / "info" / "paths.json").stat().st_size
+        for name in ("first", "second")
+    )
+    assert pkgs["total_size"] == len(shared) + paths_json
+
+    # along with its blob
+    stdout, _, _ = conda_cli("clean", "--packages", "--yes", "--json")
+    assert json.loads(stdout)["packages"]["total_size"] == len(shared) + paths_json
+    assert not any((tmp_pkgs_dir / CONTENT_STORE_DIRNAME).rglob("*-*"))
+
+
+@pytest.mark.skipif(on_win, reason="checks hard link counts")
+def test_clean_packages_shared_with_used_package(
+    conda_cli: CondaCLIFixture, tmp_pkgs_dir: Path, tmp_path: Path
+):
+    shared = b"shared contents\n" * 100
+    used = make_package(
+        tmp_pkgs_dir, "used", {"lib/shared.py": shared, "lib/used.py": b"used"}
+    )
+    make_package(tmp_pkgs_dir, "unused", {"lib/shared.py": shared})
+    conda_cli("clean", "--deduplicate", "--yes")
+    # linked into an environment
+    (tmp_path / "used.py").hardlink_to(used / "lib" / "used.py")
+
+    # the shared file is not released
+    pkgs = find_pkgs()
+    assert pkgs["pkgs_dirs"] == {str(tmp_pkgs_dir): ("unused-1.0-0",)}
+    paths_json = tmp_pkgs_dir / "unused-1.0-0" / "info" / "paths.json"
+    assert pkgs["total_size"] == paths_json.stat().st_size
+
+    conda_cli("clean", "--packages", "--yes")
+    assert not (tmp_pkgs_dir / "unused-1.0-0").exists()
+    # linked from the used package and the blob
+    assert (used / "lib" / "shared.py").stat().st_nlink == 2
+
+
+def test_clean_packages_in_background(
+    conda_cli: CondaCLIFixture, tmp_pkgs_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("CONDA_DELETE_IN_BACKGROUND", "true")
+    package = make_package(tmp_pkgs_dir, "package", {"lib/module.py": b"data"})
+    # left by an earlier clean that exited before deleting it
+    leftover = tmp_pkgs_dir / TRASH_DIRNAME / "0123456789abcdef"
+    leftover.mkdir(parents=True)
+
+    conda_cli("clean", "--packages", "--yes")
+    assert not package.exists()
+    assert not (tmp_pkgs_dir / TRASH_DIRNAME).exists()
@@ -52,6 +52,36 @@ def test_install_freezes_env_by_default(
             assert prefix_data.get(pkg["name"]).version == pkg["version"]
 
 
+def test_install_json_solver_stats(
+    test_recipes_channel: Path,
+    tmp_env: TmpEnvFixture,
+    conda_cli: CondaCLIFixture,
+):
+    with tmp_env() as prefix:
+        stdout, _, _ = conda_cli(
+            "install",
+            f"--prefix={prefix}",
+            "--solver=classic",
+            "dependent=2.0",
+            "--json",
+            "--dry-run",
+            raises=DryRunExit,
+        )
+
+    stats = json_loads(stdout)["solver_stats"]
+    assert stats["sat_solver"] == str(context.sat_solver)
+    assert stats["reduced_index_size"] > 0
+    assert stats["variables"] > 0
+    assert stats["clauses"] > 0
+    assert stats["solutions"] == 1
+    assert stats["conflict_retries"] == 0
+    assert stats["seconds"] > 0
+    objectives = {entry["objective"]: entry for entry in stats["minimize"]}
+    assert {"requested_versions", "versions", "package_count"} <= set(objectives)
+    assert objectives["requested_versions"]["value"] == 0
+    assert all(entry["sat_calls"] >= 0 for entry in stats["minimize"])
+
+
 def test_conda_pip_interop_dependency_satisfied_by_pip(
     monkeypatch: MonkeyPatch,
     tmp_env: TmpEnvFixture,
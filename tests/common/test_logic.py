@@ -1,10 +1,17 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
+import os
 from itertools import chain, combinations, permutations, product
 
 import pytest
 
-from conda.common.logic import FALSE, TRUE, Clauses, minimal_unsatisfiable_subset
+from conda.common.logic import (
+    FALSE,
+    TRUE,
+    Clauses,
+    PortfolioSatSolver,
+    minimal_unsatisfiable_subset,
+)
 from conda.testing.helpers import raises
 
 # These routines implement logical tests with short-circuiting
@@ -419,3 +426,70 @@ def test_minimal_unsatisfiable_subset():
         res = minimal_unsatisfiable_subset(perm, sat)
         assert sorted(res) in ([[-1], [1]], [[-2], [2]])
         assert not sat(res)
+
+
+@pytest.mark.parametrize("in_process", [True, False])
+def test_portfolio_sat_solver(monkeypatch, in_process):
+    from conda.common._logic import _PortfolioSatSolver
+
+    # race several copies of the same backend to exercise the process path
+    monkeypatch.setattr(_PortfolioSatSolver, "backends", ("pycosat",) * 2)
+    monkeypatch.setattr(_PortfolioSatSolver, "min_clause_count", 10**9 * in_process)
+
+    C = Clauses(sat_solver=PortfolioSatSolver)
+    C.new_var("x1")
+    C.new_var("x2")
+    C.Require(C.ExactlyOne, [1, 2])
+    assert C.sat([(-1,)], names=True) == {"x2"}
+    assert C.sat([(-1,), (-2,)]) is None
+    assert C._clauses._sat_solver.winners == {"pycosat": 2}
+
+
+def test_minimal_unsatisfiable_subset_bisects():
+    # x1..x100 are specs; x1 conflicts with x2 and x4, x3 with x5
+    clauses = [(-1, -2), (-1, -4), (-3, -5)]
+    specs = [(k,) for k in range(1, 101)]
+    calls = []
+
+    def sat(specs, add_if=False):
+        calls.append(specs)
+        return Clauses(100).sat([*clauses, *specs])
+
+    for perm in (specs, specs[::-1]):
+        calls.clear()
+        res = minimal_unsatisfiable_subset(perm, sat, [])
+        assert len(calls) < len(specs) // 2
+        # the remaining specs are a maximal satisfiable subset
+        working_set = set(specs) - res
+        assert sat(working_set) is not None
+        assert all(sat(working_set | {spec}) is None for spec in res)
+        assert len(res) in (2, 3)
+
+
+def _crashing_portfolio_worker(sat_solver_str, clause_bytes, m, limit, queue):
+    # dies without putting an answer on the queue, like a segfault or an OOM kill
+    os._exit(3)
+
+
+def _failing_portfolio_worker(sat_solver_str, clause_bytes, m, limit, queue):
+    queue.put((sat_solver_str, None, None))
+
+
+@pytest.mark.parametrize(
+    "worker", [_crashing_portfolio_worker, _failing_portfolio_worker]
+)
+def test_portfolio_sat_solver_backends_fail(monkeypatch, worker):
+    from conda.common._logic import _PortfolioSatSolver
+
+    monkeypatch.setattr(_PortfolioSatSolver, "worker", staticmethod(worker))
+    monkeypatch.setattr(_PortfolioSatSolver, "backends", ("pycosat",) * 2)
+    monkeypatch.setattr(_PortfolioSatSolver, "min_clause_count", 0)
+    monkeypatch.setattr(_PortfolioSatSolver, "poll_interval", 0.05)
+
+    C = Clauses(sat_solver=PortfolioSatSolver)
+    C.new_var("x1")
+    C.new_var("x2")
+    C.Require(C.ExactlyOne, [1, 2])
+    # answered in-process once all backend processes failed
+    assert C.sat([(-1,)], names=True) == {"x2"}
+    assert C._clauses._sat_solver.winners == {"pycosat": 1}
@@ -0,0 +1,137 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from conda.common import tracing
+from conda.common.logic import Clauses
+from conda.common.serialize import json
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def tracer() -> Iterator[tracing.Tracer]:
+    previous = tracing._tracer
+    yield tracing.start_tracing()
+    tracing._tracer = previous
+
+
+def test_disabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    assert not tracing.is_tracing()
+
+    with tracing.span("outer", size=1) as span:
+        span.set(result=2)
+    assert span is tracing._NULL_SPAN
+
+    @tracing.traced()
+    def double(x):
+        return 2 * x
+
+    assert double(21) == 42
+    tracing.counter("bytes", value=1)
+
+
+def test_spans(tracer: tracing.Tracer):
+    @tracing.traced("work")
+    def work():
+        with tracing.span("inner", "test", size=3) as span:
+            span.set(result="done")
+
+    with tracing.span("outer"):
+        work()
+        work()
+    with pytest.raises(ValueError), tracing.span("failing"):
+        raise ValueError
+    tracing.counter("bytes", value=10)
+
+    spans = {}
+    for name, category, tid, start, duration, self_time, args in tracer.spans:
+        spans.setdefault(name, []).append((start, duration, self_time, args))
+        assert tid == threading.get_ident()
+        assert 0 <= self_time <= duration
+    assert [len(spans[name]) for name in ("outer", "work", "inner")] == [1, 2, 2]
+    assert spans["inner"][0][3] == {"size": 3, "result": "done"}
+    assert spans["failing"][0][3] == {"error": "ValueError"}
+
+    # children are nested in their parent; self time excludes them
+    (outer_start, outer_duration, outer_self, _) = spans["outer"][0]
+    for start, duration, self_time, _ in spans["work"]:
+        assert outer_start <= start
+        assert start + duration <= outer_start + outer_duration
+    assert outer_self == outer_duration - sum(work[1] for work in spans["work"])
+
+    summary = tracer.summary().splitlines()
+    assert summary[0].split()[:2] == ["span", "calls"]
+    assert summary[1].split()[:2] == ["outer", "1"]
+    assert {line.split()[0]: line.split()[1] for line in summary[1:]} == {
+        "outer": "1",
+        "work": "2",
+        "inner": "2",
+        "failing": "1",
+    }
+
+
+def test_threads(tracer: tracing.Tracer):
+    def work():
+        with tracing.span("thread"):
+            pass
+
+    with tracing.span("main"):
+        thread = threading.Thread(target=work, name="worker")
+        thread.start()
+        thread.join()
+
+    (thread_span,) = (span for span in tracer.spans if span[0] == "thread")
+    (main_span,) = (span for span in tracer.spans if span[0] == "main")
+    # spans on other threads are not children of the main thread's span
+    assert thread_span[2] != main_span[2]
+    assert main_span[4] == main_span[5]
+    assert tracer.thread_names[thread_span[2]] == "worker"
+
+
+def test_chrome_trace(
+    tracer: tracing.Tracer, tmp_path: Path, capsys: pytest.CaptureFixture
+):
+    with tracing.span("outer", path=tmp_path):
+        with tracing.span("inner"):
+            pass
+    tracing.counter("bytes", value=10)
+    trace = tmp_path / "trace.json"
+    tracer.write(trace)
+
+    events = json.loads(trace.read_text())["traceEvents"]
+    phases = {event["ph"] for event in events}
+    assert phases == {"M", "X", "C"}
+    outer, inner = sorted(
+        (event for event in events if event["ph"] == "X"),
+        key=lambda event: event["ts"],
+    )
+    assert outer["name"] == "outer"
+    assert outer["args"] == {"path": str(tmp_path)}
+    assert "args" not in inner
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+    tracing.print_trace_summary(str(trace))
+    table = capsys.readouterr().out.splitlines()
+    assert [line.split()[:2] for line in table[1:]] == [["outer", "1"], ["inner", "1"]]
+
+
+def test_minimize_span(tracer: tracing.Tracer):
+    C = Clauses()
+    a, b = C.new_var("a"), C.new_var("b")
+    C.Require(C.Or, a, b)
+    solution, value = C.minimize({"a": 1, "b": 2})
+    assert value == 1
+
+    (minimize,) = (span for span in tracer.spans if span[0] == "minimize")
+    assert minimize[1] == "solver"
+    assert minimize[6] == {"terms": 2, "trymax": False, "value": 1}
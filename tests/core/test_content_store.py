@@ -0,0 +1,116 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from conda.base.context import reset_context
+from conda.common.compat import on_win
+from conda.core.content_store import CONTENT_STORE_DIRNAME, ContentStore
+from conda.core.package_cache_data import ProgressiveFetchExtract
+from conda.models.records import PackageRecord
+from conda.testing.helpers import CHANNEL_DIR_V1
+from conda.utils import url_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.skipif(on_win, reason="checks POSIX permission bits")
+
+
+def make_package(pkgs_dir: Path, name: str, files: dict[str, bytes]) -> Path:
+    """Write an extracted package with an info/paths.json listing ``files``."""
+    extracted = pkgs_dir / f"{name}-1.0-0"
+    (extracted / "info").mkdir(parents=True)
+    for path, data in files.items():
+        (extracted / path).parent.mkdir(parents=True, exist_ok=True)
+        (extracted / path).write_bytes(data)
+    paths = [
+        {
+            "_path": path,
+            "path_type": "hardlink",
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size_in_bytes": len(data),
+        }
+        for path, data in files.items()
+    ]
+    (extracted / "info" / "paths.json").write_text(
+        json.dumps({"paths_version": 1, "paths": paths})
+    )
+    return extracted
+
+
+def test_disabled_by_default(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    assert ContentStore.for_pkgs_dir(str(tmp_path)) is None
+    monkeypatch.setenv("CONDA_DEDUPLICATE_EXTRACTED_FILES", "true")
+    reset_context()
+    store = ContentStore.for_pkgs_dir(str(tmp_path))
+    assert store.store_dir == str(tmp_path / CONTENT_STORE_DIRNAME)
+
+
+def test_add_package(tmp_path: Path):
+    store = ContentStore(str(tmp_path / CONTENT_STORE_DIRNAME))
+    shared = os.urandom(1000)
+    first = make_package(
+        tmp_path, "first", {"lib/shared.py": shared, "lib/first.py": b"first"}
+    )
+    second = make_package(
+        tmp_path,
+        "second",
+        {"lib/shared.py": shared, "bin/shared": shared, "lib/empty.py": b""},
+    )
+    (second / "bin" / "shared").chmod(0o755)
+
+    assert store.add_package(str(first)) == 0  # the first copy becomes the blob
+    assert store.add_package(str(second)) == len(shared)
+    assert os.path.samefile(first / "lib/shared.py", second / "lib/shared.py")
+    # files with other permission bits are not the same blob
+    assert not os.path.samefile(first / "lib/shared.py", second / "bin/shared")
+    assert (second / "lib/shared.py").read_bytes() == shared
+    assert len(list(store.blobs())) == 3
+
+    # already deduplicated
+    assert store.add_package(str(second)) == 0
+
+    # no blob is removed while a package links to it
+    assert store.remove_unused() == 0
+    for path in first.rglob("*.py"):
+        path.unlink()
+    assert store.remove_unused() == 1
+    assert len(list(store.blobs())) == 2
+
+
+def test_add_checks_sha256(tmp_path: Path):
+    store = ContentStore(str(tmp_path / CONTENT_STORE_DIRNAME))
+    first = make_package(tmp_path, "first", {"file": b"contents"})
+    store.add_package(str(first))
+    second = make_package(tmp_path, "second", {"file": b"other contents"})
+
+    # a package with wrong metadata does not get the contents of another
+    assert store.add(str(second / "file"), hashlib.sha256(b"contents").hexdigest()) == 0
+    assert (second / "file").read_bytes() == b"other contents"
+    assert (first / "file").read_bytes() == b"contents"
+
+
+def test_deduplicated_at_extraction(
+    tmp_pkgs_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("CONDA_DEDUPLICATE_EXTRACTED_FILES", "true")
+    reset_context()
+    fn = "zlib-1.2.11-h62dcd97_3.conda"
+    record = PackageRecord.from_objects(
+        {"name": "zlib", "version": "1.2.11", "build": "h62dcd97_3"},
+        fn=fn,
+        url=f"{url_path(CHANNEL_DIR_V1)}/win-64/{fn}",
+        build_number=3,
+    )
+    ProgressiveFetchExtract((record,)).execute()
+
+    header = tmp_pkgs_dir / "zlib-1.2.11-h62dcd97_3" / "Library" / "include" / "zlib.h"
+    store = ContentStore(str(tmp_pkgs_dir / CONTENT_STORE_DIRNAME))
+    assert any(os.path.samefile(blob.path, header) for blob in store.blobs())
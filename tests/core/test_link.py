@@ -3,9 +3,15 @@
 
 import pytest
 
+from conda import CondaMultiError
+from conda.base.context import reset_context
+from conda.common.io import ThreadLimitedThreadPoolExecutor
+from conda.common.serialize import json
 from conda.core import link
-from conda.core.link import UnlinkLinkTransaction
-from conda.core.path_actions import RemoveLinkedPackageRecordAction
+from conda.core.link import ActionGroup, UnlinkLinkTransaction
+from conda.core.path_actions import RemoveLinkedPackageRecordAction, UnlinkPathAction
+from conda.core.prefix_data import PrefixData
+from conda.models.enums import LinkType
 from conda.models.records import PackageRecord, PrefixRecord
 
 
@@ -305,3 +311,121 @@ def test_execute_failure_removes_created_prefixes(tmp_path, mocker):
     assert not created.exists()
     assert not temp_dir.exists()
     assert preexisting.exists()
+
+
+@pytest.mark.parametrize("reflinks", [True, False])
+def test_determine_link_type_reflink(tmp_path, mocker, monkeypatch, reflinks):
+    extracted = tmp_path / "pkgs" / "foo-1.0-0"
+    (extracted / "info").mkdir(parents=True)
+    (extracted / "info" / "index.json").write_text("{}")
+    prefix = tmp_path / "prefix"
+    prefix.mkdir()
+    mocker.patch.object(link, "hardlink_supported", return_value=False)
+    mocker.patch.object(link, "reflink_supported", return_value=reflinks)
+    copy = LinkType.reflink if reflinks else LinkType.copy
+
+    assert link.determine_link_type(str(extracted), str(prefix)) == copy
+
+    monkeypatch.setenv("CONDA_ALWAYS_COPY", "true")
+    reset_context()
+    link.hardlink_supported.return_value = True
+    assert link.determine_link_type(str(extracted), str(prefix)) == copy
+
+
+def make_unlink_action_groups(prefix, files_per_package):
+    action_groups = []
+    for name, files in files_per_package.items():
+        for file in files:
+            (prefix / file).parent.mkdir(parents=True, exist_ok=True)
+            (prefix / file).write_text(name)
+        prefix_record = PrefixRecord(
+            name=name,
+            version="1.0",
+            build="0",
+            build_number=0,
+            channel="https://example.com/noarch",
+            subdir="noarch",
+            fn=f"{name}-1.0-0.tar.bz2",
+            files=files,
+        )
+        (prefix / "conda-meta").mkdir(exist_ok=True)
+        (prefix / "conda-meta" / f"{name}-1.0-0.json").write_text(
+            json.dumps(prefix_record.dump())
+        )
+        action_groups.append(
+            ActionGroup(
+                "unlink",
+                prefix_record,
+                link.make_unlink_actions({}, str(prefix), prefix_record),
+                str(prefix),
+            )
+        )
+    # loaded before the records are removed, as by the solver
+    PrefixData(str(prefix)).load()
+    return action_groups
+
+
+def test_split_path_actions(tmp_path):
+    (action_group,) = make_unlink_action_groups(
+        tmp_path, {"big": [f"lib/sub/file{q}" for q in range(5)]}
+    )
+    head, body, tail = link.split_path_actions(action_group.actions)
+    assert head == ()
+    assert [axn.target_short_path for axn in body] == [
+        f"lib/sub/file{q}" for q in range(5)
+    ]
+    assert [axn.target_short_path for axn in tail] == [
+        "lib/sub",
+        "lib",
+        "conda-meta/big-1.0-0.json",
+    ]
+
+
+def test_execute_path_action_groups_in_chunks(tmp_path, mocker):
+    mocker.patch.object(link, "EXECUTE_CHUNK_SIZE", 2)
+    files_per_package = {
+        "big": [f"lib/big{q}" for q in range(7)],
+        "small": ["lib/small"],
+    }
+    action_groups = make_unlink_action_groups(tmp_path, files_per_package)
+    txn = object.__new__(UnlinkLinkTransaction)
+    txn.execute_executor = ThreadLimitedThreadPoolExecutor(2)
+    execute_actions = mocker.spy(UnlinkLinkTransaction, "_execute_actions")
+
+    assert txn._execute_path_action_groups(action_groups) == []
+    # the head of the big package, four chunks and its tail; the small package
+    assert execute_actions.call_count == 6
+    for files in files_per_package.values():
+        for file in files:
+            assert not (tmp_path / file).exists()
+            assert (tmp_path / f"{file}.c~").exists()
+    assert not (tmp_path / "conda-meta" / "big-1.0-0.json").exists()
+
+
+def test_execute_path_action_groups_reverses_package(tmp_path, mocker):
+    mocker.patch.object(link, "EXECUTE_CHUNK_SIZE", 2)
+    files = [f"lib/big{q}" for q in range(7)]
+    action_groups = make_unlink_action_groups(
+        tmp_path, {"big": files, "small": ["lib/small"]}
+    )
+    txn = object.__new__(UnlinkLinkTransaction)
+    txn.execute_executor = ThreadLimitedThreadPoolExecutor(2)
+    execute = UnlinkPathAction.execute
+
+    def failing_execute(self):
+        if self.target_short_path == "lib/big5":
+            raise OSError("boom")
+        execute(self)
+
+    mocker.patch.object(UnlinkPathAction, "execute", failing_execute)
+
+    (exc,) = txn._execute_path_action_groups(action_groups)
+    assert isinstance(exc, CondaMultiError)
+    assert str(exc.errors[0]) == "boom"
+    assert exc.errors[1] is action_groups[0]
+    # the whole package is reversed and its record is kept; the other is unlinked
+    for file in files:
+        assert (tmp_path / file).exists()
+        assert not (tmp_path / f"{file}.c~").exists()
+    assert (tmp_path / "conda-meta" / "big-1.0-0.json").exists()
+    assert not (tmp_path / "lib" / "small").exists()
@@ -17,7 +17,7 @@ from conda.base.constants import PACKAGE_CACHE_MAGIC_FILE
 from conda.base.context import context, reset_context
 from conda.common.compat import on_win
 from conda.common.path import strip_pkg_extension
-from conda.core import package_cache_data
+from conda.core import package_cache_data, path_actions
 from conda.core.index import Index
 from conda.core.package_cache_data import (
     PackageCacheData,
@@ -828,3 +828,107 @@ def test_cover_extract_bad_package(tmp_path):
     with open(fullpath, "w") as archive:
         archive.write("")
     PackageCacheData.first_writable()._make_single_record(str(fullpath))
+
+
+@pytest.mark.parametrize(
+    "http_test_server", [str(Path(CHANNEL_DIR_V1, subdir))], indirect=True
+)
+@pytest.mark.parametrize("prec", fresh_zlib_records(), ids=("tar.bz2", "conda"))
+def test_extract_while_downloading(
+    http_test_server,
+    tmp_pkgs_dir: Path,
+    prec: PackageRecord,
+    monkeypatch: MonkeyPatch,
+    mocker,
+):
+    monkeypatch.setenv("CONDA_EXTRACT_WHILE_DOWNLOADING", "true")
+    reset_context()
+    assert context.extract_while_downloading
+    extract_package = mocker.patch.object(context.plugin_manager, "extract_package")
+    prec = PackageRecord.from_objects(prec, url=http_test_server.get_url(prec.fn))
+
+    ProgressiveFetchExtract((prec,)).execute()
+
+    extract_package.assert_not_called()
+    assert not (tmp_pkgs_dir / ".streaming" / zlib_base_fn).exists()
+    assert (tmp_pkgs_dir / zlib_base_fn / "info" / "repodata_record.json").is_file()
+    (pcrec,) = PackageCacheData(str(tmp_pkgs_dir)).query(MatchSpec(prec.url))
+    assert pcrec.extracted_package_dir == str(tmp_pkgs_dir / zlib_base_fn)
+
+
+@pytest.mark.parametrize(
+    "http_test_server", [str(Path(CHANNEL_DIR_V1, subdir))], indirect=True
+)
+def test_extract_while_downloading_bad_checksum(
+    http_test_server, tmp_pkgs_dir: Path, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setenv("CONDA_EXTRACT_WHILE_DOWNLOADING", "true")
+    reset_context()
+    _, prec = fresh_zlib_records()
+    prec = PackageRecord.from_objects(
+        prec, url=http_test_server.get_url(prec.fn), sha256="0" * 64
+    )
+
+    with pytest.raises(CondaMultiError):
+        ProgressiveFetchExtract((prec,)).execute()
+
+    # the package extracted while downloading was discarded
+    assert not (tmp_pkgs_dir / zlib_base_fn).exists()
+    assert not (tmp_pkgs_dir / ".streaming" / zlib_base_fn).exists()
+
+
+def test_extract_metadata_first(tmp_pkgs_dir: Path, mocker):
+    _, conda_prec = fresh_zlib_records()
+    extracted_dir = tmp_pkgs_dir / zlib_base_fn
+    metadata_extracted = Event()
+    extract = path_actions.extract_conda_package_archive
+
+    def extract_payload_later(*args, components=None, **kwargs):
+        if components == "pkg":
+            assert metadata_extracted.wait(timeout=10)
+        return extract(*args, components=components, **kwargs)
+
+    mocker.patch.object(
+        path_actions, "extract_conda_package_archive", side_effect=extract_payload_later
+    )
+
+    def metadata_callback():
+        # the package can be planned from, but is not marked as extracted on disk
+        pcrec = PackageCacheData.get_entry_to_link(conda_prec)
+        assert pcrec.extracted_package_dir == str(extracted_dir)
+        assert (extracted_dir / "info" / "paths.json").is_file()
+        assert not (extracted_dir / "Library").exists()
+        assert not (extracted_dir / "info" / "repodata_record.json").exists()
+        metadata_extracted.set()
+
+    ProgressiveFetchExtract((conda_prec,)).execute(metadata_callback=metadata_callback)
+
+    assert metadata_extracted.is_set()
+    assert (extracted_dir / "info" / "repodata_record.json").is_file()
+    assert (extracted_dir / "Library" / "include" / "zlib.h").is_file()
+
+
+def test_extract_metadata_first_payload_fails(tmp_pkgs_dir: Path, mocker):
+    _, conda_prec = fresh_zlib_records()
+    extract = path_actions.extract_conda_package_archive
+
+    def fail_payload(*args, components=None, **kwargs):
+        if components == "pkg":
+            raise OSError("payload failed")
+        return extract(*args, components=components, **kwargs)
+
+    mocker.patch.object(
+        path_actions, "extract_conda_package_archive", side_effect=fail_payload
+    )
+    metadata_callback = mocker.MagicMock()
+
+    with pytest.raises(CondaMultiError, match="payload failed"):
+        ProgressiveFetchExtract((conda_prec,)).execute(
+            metadata_callback=metadata_callback
+        )
+
+    metadata_callback.assert_called_once_with()
+    assert not (tmp_pkgs_dir / zlib_base_fn).exists()
+    assert not any(
+        PackageCacheData(str(tmp_pkgs_dir)).query(MatchSpec(conda_prec.url))
+    )
@@ -17,6 +17,7 @@ from conda.auxlib.ish import dals
 from conda.base.context import context
 from conda.common.compat import on_win
 from conda.common.iterators import groupby_to_dict as groupby
+from conda.common.serialize import json
 from conda.common.path import (
     BIN_DIRECTORY,
     get_python_noarch_target_path,
@@ -29,6 +30,7 @@ from conda.common.path import (
 from conda.core.path_actions import (
     CompileMultiPycAction,
     CreatePythonEntryPointAction,
+    ExtractPackageAction,
     LinkPathAction,
     UpdateHistoryAction,
 )
@@ -36,10 +38,10 @@ from conda.gateways.disk.create import create_link, mkdir_p
 from conda.gateways.disk.delete import rm_rf
 from conda.gateways.disk.link import islink
 from conda.gateways.disk.permissions import is_executable
-from conda.gateways.disk.read import compute_sum
+from conda.gateways.disk.read import compute_sum, read_placeholder_offsets
 from conda.gateways.disk.test import softlink_supported
 from conda.models.channel import Channel
-from conda.models.enums import LinkType, NoarchType, PathEnum
+from conda.models.enums import FileMode, LinkType, NoarchType, PathEnum
 from conda.models.package_info import Noarch, PackageInfo, PackageMetadata
 from conda.models.records import PackageRecord, PathDataV1, PathsData
 
@@ -607,3 +609,75 @@ def test_update_history_action_reverse_not_executed(prefix: Path):
     axn.reverse()
     assert history.is_file()
     assert history.read_text() == prior
+
+
+def test_placeholder_offsets_recorded_at_extraction(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    placeholder = "/opt/" + "placeholder_" * 30
+    extracted = tmp_path / "pkgs" / "test_foo-0-0"
+    (extracted / "info").mkdir(parents=True)
+    (extracted / "lib").mkdir()
+    (extracted / "lib" / "libfoo.so").write_bytes(
+        b"ELF" + f"{placeholder}/lib\0".encode() + b"\1" * 100
+    )
+    paths = [
+        PathDataV1(
+            _path="lib/libfoo.so",
+            path_type=PathEnum.hardlink,
+            prefix_placeholder=placeholder,
+            file_mode=FileMode.binary,
+        ),
+        PathDataV1(_path="lib/other", path_type=PathEnum.hardlink),
+    ]
+    (extracted / "info" / "paths.json").write_text(
+        json.dumps(
+            {"paths_version": 1, "paths": [path.dump() for path in paths]},
+        )
+    )
+    record = PackageRecord(
+        name="test_foo",
+        version="0",
+        build="0",
+        build_number=0,
+        channel="defaults",
+        subdir="linux-64",
+        fn="test_foo-0-0.tar.bz2",
+    )
+    package_info = PackageInfo(
+        extracted_package_dir=str(extracted),
+        package_tarball_full_path=str(extracted) + ".tar.bz2",
+        channel=Channel("defaults"),
+        repodata_record=record,
+        url="https://some.com/place/test_foo-0-0.tar.bz2",
+        index_json_record=record,
+        icondata=None,
+        package_metadata=None,
+        paths_data=PathsData(paths_version=1, paths=paths),
+    )
+    target = tmp_path / "target"
+    # the actions are created from the metadata, before the payload is extracted
+    action, _ = LinkPathAction.create_file_link_actions(
+        {"temp_dir": str(tmp_path / "temp")}, package_info, str(target), LinkType.copy
+    )
+    ExtractPackageAction(
+        str(tmp_path / "test_foo-0-0.tar.bz2"),
+        str(extracted.parent),
+        extracted.name,
+        None,
+        None,
+        None,
+        None,
+    )._write_placeholder_offsets("linux-64")
+    recorded = read_placeholder_offsets(str(extracted))
+    assert list(recorded) == ["lib/libfoo.so"]
+    end = 3 + len(f"{placeholder}/lib\0")
+    assert recorded["lib/libfoo.so"]["offsets"] == [[3, end, "utf-8"]]
+
+    monkeypatch.setattr("conda.core.portability._find_placeholder_offsets", pytest.fail)
+    action.verify()
+    (target / "lib").mkdir(parents=True)
+    action.execute()
+    new_string = f"{target}/lib".encode().ljust(end - 3, b"\0")
+    linked = (target / "lib" / "libfoo.so").read_bytes()
+    assert linked == b"ELF" + new_string + b"\1" * 100
@@ -0,0 +1,301 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""End-to-end benchmarks of the solve, fetch/extract and link phases.
+
+Each phase runs against a synthetic ``file://`` channel of 10, 100 and 1000
+packages, generated once per session: package ``pkgN`` comes in a few versions
+that depend on lower numbered packages, so requesting the highest numbered
+package installs every package of the channel. Runs locally with
+``pytest -m benchmark tests/core/test_phase_benchmarks.py``.
+
+Results are tracked (and regressions reported) by the benchmarks workflow like
+all ``benchmark`` tests. To compare against a local baseline, save one with
+``--benchmark-autosave`` and later run with ``--benchmark-compare
+--benchmark-compare-fail=mean:10%``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import shutil
+import tarfile
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from conda._private.shards.publish import publish_shards
+from conda._private.shards.subset import build_repodata_subset
+from conda.base.constants import PACKAGE_CACHE_MAGIC_FILE
+from conda.base.context import context, reset_context
+from conda.common.serialize import json
+from conda.common.url import path_to_url
+from conda.core.index import ReducedIndex
+from conda.core.link import PrefixSetup, UnlinkLinkTransaction
+from conda.core.package_cache_data import PackageCacheData, ProgressiveFetchExtract
+from conda.core.prefix_data import PrefixData
+from conda.core.subdir_data import SubdirData
+from conda.models.channel import Channel
+from conda.models.match_spec import MatchSpec
+from conda.models.records import PackageRecord
+from conda.resolve import Resolve
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytestmark = pytest.mark.benchmark
+
+#: Number of packages in the synthetic channels.
+CHANNEL_SIZES = (10, 100, 1000)
+#: Versions of each package; solves pick the latest of each.
+VERSIONS = 3
+#: Files installed by each package.
+FILES_PER_PACKAGE = 5
+
+
+def synthetic_repodata(num_packages: int, subdir: str) -> dict:
+    """
+    Return repodata (without checksums) of ``num_packages`` packages with
+    ``VERSIONS`` versions each. ``pkgN`` depends on ``pkgN-1``, ``pkgN/2``
+    and ``pkgN/3``, with lower bounds that rule out some older versions.
+    """
+    packages = {}
+    for i in range(num_packages):
+        depends = sorted({i - 1, i // 2, i // 3} - {i, -1})
+        for v in range(VERSIONS):
+            fn = f"pkg{i}-{v}.0-h0_0.tar.bz2"
+            packages[fn] = {
+                "name": f"pkg{i}",
+                "version": f"{v}.0",
+                "build": "h0_0",
+                "build_number": 0,
+                "depends": [f"pkg{j} >={max(v - 1, 0)}.0" for j in depends],
+                "license": "BSD-3-Clause",
+                "subdir": subdir,
+                "timestamp": 1700000000000 + v,
+            }
+    return {"info": {"subdir": subdir}, "packages": packages, "packages.conda": {}}
+
+
+def _write_package(path: Path, index: dict) -> None:
+    """Write a ``.tar.bz2`` package installing ``FILES_PER_PACKAGE`` files."""
+    files = {
+        f"share/{index['name']}/file{n}.txt": f"{path.name} {n}\n".encode()
+        for n in range(FILES_PER_PACKAGE)
+    }
+    paths = [
+        {
+            "_path": name,
+            "path_type": "hardlink",
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size_in_bytes": len(data),
+        }
+        for name, data in files.items()
+    ]
+    members = {
+        "info/index.json": json.dumps(index).encode(),
+        "info/files": "\n".join(files).encode(),
+        "info/paths.json": json.dumps({"paths_version": 1, "paths": paths}).encode(),
+        **files,
+    }
+    with tarfile.open(path, "w:bz2") as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture(scope="session")
+def synthetic_channels(tmp_path_factory: pytest.TempPathFactory):
+    """Return a function creating (once) the synthetic channel of a size."""
+
+    @cache
+    def synthetic_channel(num_packages: int) -> Channel:
+        channel_dir = tmp_path_factory.mktemp(f"channel-{num_packages}")
+        subdir = channel_dir / context.subdir
+        subdir.mkdir()
+        repodata = synthetic_repodata(num_packages, context.subdir)
+        for fn, index in repodata["packages"].items():
+            _write_package(subdir / fn, index)
+            data = (subdir / fn).read_bytes()
+            index["md5"] = hashlib.md5(data).hexdigest()
+            index["sha256"] = hashlib.sha256(data).hexdigest()
+            index["size"] = len(data)
+        (subdir / "repodata.json").write_text(json.dumps(repodata))
+        publish_shards(subdir, repodata)
+
+        noarch = channel_dir / "noarch"
+        noarch.mkdir()
+        empty = {"info": {"subdir": "noarch"}, "packages": {}, "packages.conda": {}}
+        (noarch / "repodata.json").write_text(json.dumps(empty))
+        publish_shards(noarch, empty)
+        return Channel(path_to_url(str(channel_dir)))
+
+    return synthetic_channel
+
+
+@pytest.fixture(params=CHANNEL_SIZES)
+def num_packages(request: pytest.FixtureRequest) -> int:
+    return request.param
+
+
+@pytest.fixture
+def channel(
+    synthetic_channels,
+    num_packages: int,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[Channel]:
+    """The synthetic channel of ``num_packages`` packages, with empty caches."""
+    pkgs_dir = tmp_path / "pkgs"
+    pkgs_dir.mkdir()
+    (pkgs_dir / PACKAGE_CACHE_MAGIC_FILE).touch()
+    monkeypatch.setenv("CONDA_PKGS_DIRS", str(pkgs_dir))
+    monkeypatch.setenv("CONDA_QUIET", "true")
+    reset_context()
+    channel = synthetic_channels(num_packages)
+    yield channel
+    SubdirData.clear_cached_local_channel_data(exclude_file=False)
+    PackageCacheData._cache_.pop(str(pkgs_dir), None)
+
+
+def _root_spec(num_packages: int) -> MatchSpec:
+    return MatchSpec(f"pkg{num_packages - 1}")
+
+
+def _solution(channel: Channel, num_packages: int) -> tuple[PackageRecord, ...]:
+    """The latest version of every package, in dependency order."""
+    index = ReducedIndex(
+        (_root_spec(num_packages),), channels=(channel,), prepend=False
+    )
+    r = Resolve(index, channels=(channel,))
+    return r.dependency_sort(
+        {prec.name: prec for prec in r.solve((_root_spec(num_packages),))}
+    )
+
+
+def test_subdir_data_load(
+    benchmark: BenchmarkFixture, channel: Channel, num_packages: int
+):
+    """Load the repodata of a subdir from the repodata cache."""
+    subdir_channel = Channel(f"{channel.base_url}/{context.subdir}")
+
+    def setup():
+        SubdirData.clear_cached_local_channel_data(exclude_file=False)
+        return (), {}
+
+    def load():
+        return SubdirData(subdir_channel).load()
+
+    subdir_data = benchmark.pedantic(load, setup=setup, rounds=5, warmup_rounds=1)
+    assert len(list(subdir_data.iter_records())) == num_packages * VERSIONS
+
+
+def test_reduced_index(
+    benchmark: BenchmarkFixture, channel: Channel, num_packages: int
+):
+    """Build the index reachable from the root package."""
+    specs = (_root_spec(num_packages),)
+
+    def reduced_index():
+        return ReducedIndex(specs, channels=(channel,), prepend=False)
+
+    index = benchmark.pedantic(reduced_index, rounds=3, warmup_rounds=1)
+    precs = [prec for prec in index.values() if prec.name.startswith("pkg")]
+    assert len(precs) == num_packages * VERSIONS
+
+
+def test_build_repodata_subset(
+    benchmark: BenchmarkFixture,
+    channel: Channel,
+    num_packages: int,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Traverse the sharded repodata reachable from the root package."""
+    channels = {channel.url(): channel}
+
+    def setup():
+        # every round starts from an empty shards cache
+        shards_cache = Path(context.pkgs_dirs[0], "cache")
+        shutil.rmtree(shards_cache, ignore_errors=True)
+        shards_cache.mkdir()
+        return (), {}
+
+    def build_subset():
+        return build_repodata_subset([f"pkg{num_packages - 1}"], channels)
+
+    channel_data = benchmark.pedantic(build_subset, setup=setup, rounds=3)
+    subsets = [shardlike.build_repodata() for shardlike in channel_data.values()]
+    assert sum(len(subset["packages"]) for subset in subsets) == (
+        num_packages * VERSIONS
+    )
+
+
+def test_resolve_solve(
+    benchmark: BenchmarkFixture, channel: Channel, num_packages: int
+):
+    """Solve for the latest version of every package."""
+    specs = (_root_spec(num_packages),)
+    index = ReducedIndex(specs, channels=(channel,), prepend=False)
+
+    def solve():
+        return Resolve(index, channels=(channel,)).solve(specs)
+
+    solution = benchmark.pedantic(solve, rounds=3)
+    assert len(solution) == num_packages
+    assert {prec.version for prec in solution} == {f"{VERSIONS - 1}.0"}
+
+
+def test_fetch_extract(
+    benchmark: BenchmarkFixture, channel: Channel, num_packages: int
+):
+    """Download and extract every package into an empty package cache."""
+    link_precs = _solution(channel, num_packages)
+    pkgs_dir = Path(context.pkgs_dirs[0])
+
+    def setup():
+        for path in pkgs_dir.glob("pkg*"):
+            shutil.rmtree(path) if path.is_dir() else path.unlink()
+        PackageCacheData._cache_.pop(str(pkgs_dir), None)
+        return (), {}
+
+    def fetch_extract():
+        ProgressiveFetchExtract(link_precs).execute()
+
+    benchmark.pedantic(fetch_extract, setup=setup, rounds=3)
+    assert len(list(PackageCacheData(pkgs_dir).query("pkg*"))) == num_packages
+
+
+def test_unlink_link_transaction(
+    benchmark: BenchmarkFixture,
+    channel: Channel,
+    num_packages: int,
+    tmp_path: Path,
+):
+    """Link every package into a new environment."""
+    link_precs = _solution(channel, num_packages)
+    ProgressiveFetchExtract(link_precs).execute()
+    prefixes = iter(tmp_path / f"env{n}" for n in range(1_000))
+
+    def setup():
+        prefix = next(prefixes)
+        setup = PrefixSetup(
+            target_prefix=str(prefix),
+            unlink_precs=(),
+            link_precs=link_precs,
+            remove_specs=(),
+            update_specs=(_root_spec(num_packages),),
+            neutered_specs=(),
+        )
+        return (UnlinkLinkTransaction(setup), prefix), {}
+
+    def link(transaction: UnlinkLinkTransaction, prefix: Path) -> Path:
+        transaction.execute()
+        return prefix
+
+    prefix = benchmark.pedantic(link, setup=setup, rounds=3)
+    assert len(PrefixData(prefix).reload()._prefix_records) == num_packages
@@ -1,6 +1,8 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
+import hashlib
 import os
+import random
 import re
 import subprocess
 
@@ -9,12 +11,20 @@ import pytest
 from conda.auxlib.ish import dals
 from conda.base.constants import PREFIX_PLACEHOLDER
 from conda.common.compat import on_mac, on_win
+from conda.common.serialize import json
 from conda.core.portability import (
     MAX_SHEBANG_LENGTH,
+    POPULAR_ENCODINGS,
     SHEBANG_REGEX,
+    _PaddingError,
+    _stream_binary_replace,
     batch_codesign_calls,
+    binary_replace,
     generate_shebang_for_entry_point,
+    placeholder_offsets,
     replace_long_shebang,
+    replace_prefix,
+    rewrite_prefix,
     update_prefix,
 )
 from conda.models.enums import FileMode
@@ -303,3 +313,189 @@ def test_update_prefix_batches_osx_arm64_codesign(tmp_path, mocker):
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
     )
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1 << 20], ids=["mmap", "read"])
+@pytest.mark.parametrize("mode", [FileMode.text, FileMode.binary])
+def test_rewrite_prefix(tmp_path, monkeypatch, mode, mmap_threshold):
+    monkeypatch.setattr("conda.core.portability.MMAP_THRESHOLD", mmap_threshold)
+    placeholder = "/opt/placeholder_for_a_long_prefix"
+    new_prefix = "/usr/local"
+    data = b"".join(
+        (
+            f"#!{placeholder}/bin/python\nlib={placeholder}\0".encode(),
+            *(f"{placeholder}/lib\0".encode(enc) for enc in POPULAR_ENCODINGS),
+            CONTENT,
+        )
+    )
+    source = tmp_path / "source"
+    source.write_bytes(data)
+    source.chmod(0o755)
+    # one pass per encoding, like replace_prefix used to do
+    expected = data
+    for encoding in POPULAR_ENCODINGS:
+        search, replacement = (
+            placeholder.encode(encoding),
+            new_prefix.encode(encoding),
+        )
+        if mode == FileMode.binary:
+            expected = binary_replace(expected, search, replacement, encoding)
+        else:
+            expected = expected.replace(search, replacement)
+
+    target = tmp_path / "target"
+    sha256 = rewrite_prefix(
+        str(source), str(target), new_prefix, placeholder, mode, subdir="linux-64"
+    )
+
+    assert target.read_bytes() == expected
+    assert sha256 == hashlib.sha256(target.read_bytes()).hexdigest()
+    assert source.read_bytes() == data
+    if not on_win:
+        assert os.stat(target).st_mode == os.stat(source).st_mode
+    for encoding in POPULAR_ENCODINGS:
+        assert f"{new_prefix}/lib".encode(encoding) in target.read_bytes()
+    if mode == FileMode.binary:
+        assert len(target.read_bytes()) == len(data)
+
+
+def test_rewrite_prefix_padding_error(tmp_path, monkeypatch):
+    monkeypatch.setattr("conda.core.portability.MMAP_THRESHOLD", 0)
+    source = tmp_path / "source"
+    source.write_bytes(b"xx/short/bin\0xx")
+
+    with pytest.raises(_PaddingError):
+        rewrite_prefix(
+            str(source),
+            str(tmp_path / "target"),
+            "/a/much/longer/prefix",
+            "/short",
+            FileMode.binary,
+            subdir="linux-64",
+        )
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1 << 20], ids=["mmap", "read"])
+def test_rewrite_prefix_recorded_offsets(tmp_path, monkeypatch, mmap_threshold):
+    monkeypatch.setattr("conda.core.portability.MMAP_THRESHOLD", mmap_threshold)
+    placeholder = "/opt/placeholder_for_a_long_prefix"
+    data = b"".join(
+        (
+            CONTENT,
+            f"{placeholder}/lib:{placeholder}/bin\0".encode(),
+            f"{placeholder}/lib\0".encode("utf-16-le"),
+            CONTENT,
+        )
+    )
+    source = tmp_path / "source"
+    source.write_bytes(data)
+    recorded = placeholder_offsets(str(source), placeholder)
+    assert [encoding for _, _, encoding in recorded["offsets"]] == [
+        "utf-8",
+        "utf-16-le",
+    ]
+    # stored as JSON in the package cache
+    recorded = json.loads(json.dumps(recorded))
+
+    def rewrite(target, recorded_offsets):
+        return rewrite_prefix(
+            str(source),
+            str(tmp_path / target),
+            "/usr/local",
+            placeholder,
+            FileMode.binary,
+            subdir="linux-64",
+            recorded_offsets=recorded_offsets,
+        )
+
+    sha256 = rewrite("scanned", None)
+    with monkeypatch.context() as m:
+        # the recorded offsets are used instead of scanning the file
+        m.setattr("conda.core.portability._find_placeholder_offsets", pytest.fail)
+        assert rewrite("recorded", recorded) == sha256
+    assert (tmp_path / "recorded").read_bytes() == (tmp_path / "scanned").read_bytes()
+
+    # offsets that no longer apply are ignored
+    stale = {**recorded, "mtime_ns": recorded["mtime_ns"] - 1}
+    assert rewrite("stale", stale) == sha256
+    moved = {**recorded, "offsets": [[0, 10, "utf-8"]]}
+    assert rewrite("moved", moved) == sha256
+
+
+def replace_prefix_per_encoding(mode, data, placeholder, new_prefix):
+    """replace_prefix() as it was before it skipped the encodings that do not occur"""
+    for encoding in POPULAR_ENCODINGS:
+        if mode == FileMode.text:
+            newline_pos = data.find(b"\n")
+            if newline_pos > -1:
+                shebang_line, rest_of_data = data[:newline_pos], data[newline_pos:]
+                shebang_placeholder = f"#!{placeholder}".encode(encoding)
+                if shebang_placeholder in shebang_line:
+                    escaped_shebang = f"#!{new_prefix}".replace(" ", "\\ ")
+                    shebang_line = shebang_line.replace(
+                        shebang_placeholder, escaped_shebang.encode(encoding)
+                    )
+                    data = shebang_line + rest_of_data
+            data = data.replace(
+                placeholder.encode(encoding), new_prefix.encode(encoding)
+            )
+        else:
+            data = binary_replace(
+                data,
+                placeholder.encode(encoding),
+                new_prefix.encode(encoding),
+                encoding=encoding,
+                subdir="linux-64",
+            )
+    return data
+
+
+def random_placeholder_data(rng: random.Random, placeholder: str) -> bytes:
+    """Placeholders of all encodings, close to each other and to null terminators."""
+    fragments = []
+    for _ in range(rng.randint(1, 8)):
+        encoding = rng.choice(POPULAR_ENCODINGS)
+        fragment = rng.choice(
+            (
+                f"{placeholder}/lib",
+                f"#!{placeholder}/bin/python",
+                f"{placeholder}:{placeholder}",
+                "\n",
+                "\0" * rng.randint(1, 4),
+                " ",
+                "x",
+            )
+        )
+        fragments.append(fragment.encode(encoding))
+        fragments.append(rng.randbytes(rng.randint(0, 2)))
+    return b"".join(fragments)
+
+
+@pytest.mark.parametrize("new_prefix", ["/usr/local", "/with space", "/u"])
+def test_replace_prefix_in_encoding_order(new_prefix):
+    placeholder = "/opt/placeholder"
+    rng = random.Random(new_prefix)
+    for _ in range(2000):
+        data = random_placeholder_data(rng, placeholder)
+        for mode in (FileMode.text, FileMode.binary):
+            expected = replace_prefix_per_encoding(mode, data, placeholder, new_prefix)
+            actual = replace_prefix(mode, data, placeholder, new_prefix, "linux-64")
+            assert actual == expected, data
+        chunks = []
+        _stream_binary_replace(
+            data,
+            lambda chunk: chunks.append(bytes(chunk)),
+            placeholder,
+            new_prefix,
+            "linux-64",
+        )
+        assert b"".join(chunks) == expected, data
+
+
+def test_replace_prefix_utf16_shebang():
+    # a utf-16-be placeholder starts one byte before the utf-16-le one
+    placeholder = "/opt/placeholder"
+    data = f"#!{placeholder}/bin/python\n".encode("utf-16-le")
+    assert replace_prefix(
+        FileMode.text, data, placeholder, "/with space", "linux-64"
+    ) == "#!/with\\ space/bin/python\n".encode("utf-16-le")
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import json
+import os
 import shutil
 import sys
 from contextlib import nullcontext
@@ -17,11 +18,16 @@ import pytest
 from conda.base.constants import PREFIX_PINNED_FILE, PREFIX_STATE_FILE
 from conda.common.compat import on_win
 from conda.common.path.python import get_python_site_packages_short_path
-from conda.core.prefix_data import PrefixData, get_conda_anchor_files_and_records
+from conda.core.prefix_data import (
+    PrefixData,
+    get_conda_anchor_files_and_records,
+    get_prefix_records_summary_path,
+)
 from conda.exceptions import CondaError, CondaValueError, CorruptedEnvironmentError
 from conda.models.enums import PackageType
 from conda.models.match_spec import MatchSpec
 from conda.models.records import PrefixRecord
+from conda.plugins.prefix_data_loaders import pypi as pypi_loader
 from conda.plugins.prefix_data_loaders.pypi import load_site_packages
 from conda.testing.helpers import record
 
@@ -283,6 +289,8 @@ def test_pip_interop(
     # test envs with packages installed using either `pip install <pth-to-wheel>` or
     # `python setup.py install`
     mocker.patch("conda.plugins.prefix_data_loaders.pypi.rm_rf")
+    mocker.patch("conda.plugins.prefix_data_loaders.pypi._write_pypi_records_cache")
+    mocker.patch.object(PrefixData, "_write_records_summary")
 
     prefixdata = PrefixData(path, interoperability=True)
     prefixdata.load()
@@ -332,6 +340,50 @@ def test_pypi_loader_removes_clobbered_record_json_by_prefix_record_name(
     )
 
 
+@pytest.mark.skipif(on_win, reason="Unix only")
+def test_pypi_loader_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    """
+    Repeat loads reuse the synthesized records and only reparse distributions
+    whose anchor file changed.
+    """
+    prefix = tmp_path / "env"
+    shutil.copytree(ENV_METADATA_DIR / "envpy37osx_whl", prefix, symlinks=True)
+    read_python_record = mocker.spy(pypi_loader, "read_python_record")
+    get_anchor_files = mocker.spy(pypi_loader, "get_conda_anchor_files_and_records")
+
+    def load() -> dict[str, dict]:
+        prefix_data = PrefixData(prefix, interoperability=True)
+        prefix_data.load()
+        return {rec.name: rec.dump() for rec in prefix_data.iter_records()}
+
+    load()  # removes the conda-meta records of clobbered conda packages
+    expected = load()
+    cache_path = pypi_loader.get_pypi_records_cache_path(prefix)
+    assert cache_path.is_file()
+    assert cache_path.parent == prefix / "conda-meta"
+
+    read_python_record.reset_mock()
+    get_anchor_files.reset_mock()
+    assert load() == expected
+    assert not read_python_record.called
+    assert not get_anchor_files.called
+
+    # a reinstalled distribution is parsed again
+    record_file = prefix / "lib/python3.7/site-packages/idna-2.7.dist-info/RECORD"
+    mtime_ns = record_file.stat().st_mtime_ns + 10**9
+    os.utime(record_file, ns=(mtime_ns, mtime_ns))
+    assert load() == expected
+    assert read_python_record.call_count == 1
+    assert not get_anchor_files.called
+
+    # a change in conda-meta recomputes the anchor files of conda packages
+    next((prefix / "conda-meta").glob("zlib-*.json")).unlink()
+    del expected["zlib"]
+    assert load() == expected
+    assert read_python_record.call_count == 1
+    assert get_anchor_files.called
+
+
 def test_get_conda_anchor_files_and_records():
     @dataclass
     class DummyPythonRecord:
@@ -1216,3 +1268,53 @@ def test_load_single_record_raises_on_corrupt_json(
 
     with pytest.raises(CorruptedEnvironmentError):
         pd.load()
+
+
+def test_load_records_summary(tmp_path: Path, mocker: MockerFixture) -> None:
+    """
+    Repeat loads create unchanged records from the summary and only read their
+    file manifest when accessed.
+    """
+    prefix = tmp_path / "env"
+    conda_meta = prefix / "conda-meta"
+    conda_meta.mkdir(parents=True)
+    record_data = {
+        "name": "numpy",
+        "version": "1.24.0",
+        "build": "py310h0000000_0",
+        "build_number": 0,
+        "channel": "defaults",
+        "subdir": "linux-64",
+        "fn": "numpy-1.24.0-py310h0000000_0.conda",
+        "depends": ["python >=3.10"],
+        "files": ["lib/numpy/__init__.py"],
+        "paths_data": {
+            "paths_version": 1,
+            "paths": [{"_path": "lib/numpy/__init__.py", "path_type": "hardlink"}],
+        },
+    }
+    record_path = conda_meta / "numpy-1.24.0-py310h0000000_0.json"
+    record_path.write_text(json.dumps(record_data))
+    PrefixData(prefix).load()
+    assert get_prefix_records_summary_path(prefix).is_file()
+    assert get_prefix_records_summary_path(prefix).parent == conda_meta
+
+    load_single_record = mocker.spy(PrefixData, "_load_single_record")
+    read_bytes = mocker.spy(Path, "read_bytes")
+    pd = PrefixData(prefix)
+    pd.load()
+    record = pd.get("numpy")
+    assert record.depends == ("python >=3.10",)
+    assert not load_single_record.called
+    assert record_path not in [call.args[0] for call in read_bytes.call_args_list]
+
+    assert record.files == ("lib/numpy/__init__.py",)
+    assert [path.path for path in record.paths_data.paths] == ["lib/numpy/__init__.py"]
+    assert list(record.dump()["files"]) == ["lib/numpy/__init__.py"]
+
+    # a changed record is read again
+    record_path.write_text(json.dumps({**record_data, "depends": []}))
+    os.utime(record_path, ns=(0, 0))
+    pd.load()
+    assert load_single_record.call_count == 1
+    assert pd.get("numpy").depends == ()
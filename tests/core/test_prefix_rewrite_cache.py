@@ -0,0 +1,187 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from conda.base.context import reset_context
+from conda.common.compat import on_win
+from conda.core.path_actions import PrefixReplaceLinkAction
+from conda.core.prefix_rewrite_cache import (
+    PREFIX_REWRITE_CACHE_DIRNAME,
+    PrefixRewriteCache,
+)
+from conda.models.channel import Channel
+from conda.models.enums import FileMode, PathEnum
+from conda.models.package_info import PackageInfo
+from conda.models.records import PackageRecord, PathDataV1, PathsData
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PLACEHOLDER = "/opt/" + "placeholder_" * 30
+
+
+@pytest.fixture
+def max_mb(monkeypatch: pytest.MonkeyPatch):
+    def set_max_mb(value: int) -> None:
+        monkeypatch.setenv("CONDA_PREFIX_REWRITE_CACHE_MAX_MB", str(value))
+        reset_context()
+
+    set_max_mb(1)
+    return set_max_mb
+
+
+def make_file(path: Path, size: int) -> str:
+    data = os.urandom(size)
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_disabled_by_default(tmp_path: Path):
+    assert PrefixRewriteCache.for_pkgs_dir(str(tmp_path)) is None
+
+
+def test_get_put(tmp_path: Path, max_mb, monkeypatch: pytest.MonkeyPatch):
+    cache = PrefixRewriteCache.for_pkgs_dir(str(tmp_path))
+    assert cache is PrefixRewriteCache.for_pkgs_dir(str(tmp_path))
+    assert cache.cache_dir == str(tmp_path / PREFIX_REWRITE_CACHE_DIRNAME)
+
+    key = PrefixRewriteCache.key("0" * 64, PLACEHOLDER, "/prefix", FileMode.text, "x")
+    assert key != PrefixRewriteCache.key(
+        "0" * 64, PLACEHOLDER, "/other", FileMode.text, "x"
+    )
+    assert cache.get(key) is None
+
+    rewritten = tmp_path / "rewritten"
+    sha256 = make_file(rewritten, 100)
+    cache.put(key, str(rewritten), sha256)
+    path, cached_sha256 = cache.get(key)
+    assert cached_sha256 == sha256
+    if not on_win:
+        assert os.path.samefile(path, rewritten)
+
+    # a modified entry is detected with extra_safety_checks
+    with open(path, "r+b") as fh:
+        fh.write(b"modified")
+    assert cache.get(key)
+    monkeypatch.setenv("CONDA_EXTRA_SAFETY_CHECKS", "true")
+    reset_context()
+    assert cache.get(key) is None
+    assert not os.path.exists(path)
+
+
+def test_trim_least_recently_used(tmp_path: Path, max_mb):
+    cache = PrefixRewriteCache(str(tmp_path / PREFIX_REWRITE_CACHE_DIRNAME))
+    size = 300 * 1024
+    keys = [hashlib.sha256(bytes([i])).hexdigest() for i in range(4)]
+    for age, key in enumerate(keys[:3]):
+        source = tmp_path / key
+        cache.put(key, str(source), make_file(source, size))
+        # used in order, one minute apart
+        mtime = 1_700_000_000 + 60 * age
+        os.utime(f"{cache._entry_path(key)}.json", (mtime, mtime))
+    assert all(cache.get(key) for key in keys[:2])  # the oldest is now keys[2]
+
+    source = tmp_path / keys[3]
+    cache.put(keys[3], str(source), make_file(source, size))
+    assert [bool(cache.get(key)) for key in keys] == [True, True, False, True]
+    assert cache._size == 3 * size
+
+    max_mb(0)
+    assert PrefixRewriteCache.for_pkgs_dir(str(tmp_path)) is None
+    cache.trim()
+    assert not any(cache.get(key) for key in keys)
+
+
+def test_prefix_replace_link_action(
+    tmp_path: Path, max_mb, monkeypatch: pytest.MonkeyPatch
+):
+    extracted = tmp_path / "pkgs" / "test_foo-0-0"
+    (extracted / "bin").mkdir(parents=True)
+    source = extracted / "bin" / "script"
+    source.write_text(f"#!/bin/sh\nexec {PLACEHOLDER}/bin/python\n")
+    record = PackageRecord(
+        name="test_foo",
+        version="0",
+        build="0",
+        build_number=0,
+        channel="defaults",
+        subdir="linux-64",
+        fn="test_foo-0-0.tar.bz2",
+    )
+    package_info = PackageInfo(
+        extracted_package_dir=str(extracted),
+        package_tarball_full_path=f"{extracted}.tar.bz2",
+        channel=Channel("defaults"),
+        repodata_record=record,
+        url="https://some.com/place/test_foo-0-0.tar.bz2",
+        index_json_record=record,
+        icondata=None,
+        package_metadata=None,
+        paths_data=PathsData(paths_version=1, paths=()),
+    )
+    source_path_data = PathDataV1(
+        _path="bin/script",
+        path_type=PathEnum.hardlink,
+        prefix_placeholder=PLACEHOLDER,
+        file_mode=FileMode.text,
+        sha256=hashlib.sha256(source.read_bytes()).hexdigest(),
+        size_in_bytes=source.stat().st_size,
+    )
+    prefix = tmp_path / "env"
+
+    def link(before_execute=lambda: None) -> PrefixReplaceLinkAction:
+        action = PrefixReplaceLinkAction(
+            {"temp_dir": str(prefix / ".condatmp")},
+            package_info,
+            str(extracted),
+            "bin/script",
+            str(prefix),
+            "bin/script",
+            None,
+            PLACEHOLDER,
+            FileMode.text,
+            source_path_data,
+        )
+        action.verify()
+        before_execute()
+        (prefix / "bin").mkdir(parents=True)
+        action.execute()
+        return action
+
+    def recreate() -> None:
+        (prefix / "bin" / "script").unlink()
+        (prefix / "bin").rmdir()
+
+    first = link()
+    expected = f"#!/bin/sh\nexec {prefix}/bin/python\n"
+    assert (prefix / "bin" / "script").read_text() == expected
+    sha256_in_prefix = first.prefix_path_data.sha256_in_prefix
+    assert sha256_in_prefix == hashlib.sha256(expected.encode()).hexdigest()
+
+    # recreate the environment at the same path
+    recreate()
+    cache = PrefixRewriteCache.for_pkgs_dir(str(tmp_path / "pkgs"))
+    monkeypatch.setattr("conda.core.path_actions.rewrite_prefix", pytest.fail)
+    second = link()
+    assert (prefix / "bin" / "script").read_text() == expected
+    assert second.prefix_path_data.sha256_in_prefix == sha256_in_prefix
+    _, key = second._prefix_rewrite_cache(str(prefix), "linux-64")
+    cached_path, _ = cache.get(key)
+    if not on_win:
+        assert os.path.samefile(second.intermediate_path, cached_path)
+
+    def evict() -> None:
+        max_mb(0)
+        cache.trim()
+        assert cache.get(key) is None
+
+    # the entry is evicted by another action between verify() and execute()
+    recreate()
+    link(evict)
+    assert (prefix / "bin" / "script").read_text() == expected
@@ -0,0 +1,121 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from conda.base.context import reset_context
+from conda.core import verified_hashes
+from conda.core.path_actions import LinkPathAction
+from conda.core.verified_hashes import (
+    VERIFIED_HASHES_FILENAME,
+    VerifiedHashes,
+    hash_in_bulk,
+)
+from conda.exceptions import SafetyError
+from conda.models.channel import Channel
+from conda.models.enums import LinkType, PathEnum
+from conda.models.package_info import PackageInfo
+from conda.models.records import PackageRecord, PathDataV1, PathsData
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_package(pkgs_dir: Path, name: str, files: dict[str, bytes]) -> Path:
+    extracted = pkgs_dir / f"{name}-1.0-0"
+    (extracted / "info").mkdir(parents=True)
+    for path, data in files.items():
+        (extracted / path).parent.mkdir(parents=True, exist_ok=True)
+        (extracted / path).write_bytes(data)
+    return extracted
+
+
+def test_sha256_remembered(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    data = os.urandom(1000)
+    extracted = make_package(tmp_path, "foo", {"lib/foo.so": data})
+    hashes = VerifiedHashes(str(extracted))
+    assert hashes.get("lib/foo.so") is None
+    assert hashes.sha256("lib/foo.so") == hashlib.sha256(data).hexdigest()
+    hashes.save()
+    assert (extracted / "info" / VERIFIED_HASHES_FILENAME).exists()
+
+    # remembered across processes while the file is unchanged
+    monkeypatch.setattr(verified_hashes, "compute_sum", pytest.fail)
+    hashes = VerifiedHashes(str(extracted))
+    assert hashes.sha256("lib/foo.so") == hashlib.sha256(data).hexdigest()
+
+    (extracted / "lib" / "foo.so").write_bytes(b"modified")
+    assert hashes.get("lib/foo.so") is None
+
+
+def test_hash_in_bulk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("CONDA_VERIFY_THREADS", "2")
+    reset_context()
+    files = {f"lib/file{q}": os.urandom(100 * q) for q in range(1, 5)}
+    packages = [make_package(tmp_path, name, files) for name in ("foo", "bar")]
+
+    hash_in_bulk(
+        (str(extracted), path)
+        for extracted in packages
+        for path in (*files, "lib/missing")
+    )
+    for extracted in packages:
+        assert (extracted / "info" / VERIFIED_HASHES_FILENAME).exists()
+        hashes = VerifiedHashes(str(extracted))
+        for path, data in files.items():
+            assert hashes.get(path) == hashlib.sha256(data).hexdigest()
+
+
+def test_link_path_action_verify(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("CONDA_EXTRA_SAFETY_CHECKS", "true")
+    reset_context()
+    data = b"contents\n"
+    extracted = make_package(tmp_path / "pkgs", "foo", {"lib/foo.py": data})
+    record = PackageRecord(
+        name="foo",
+        version="1.0",
+        build="0",
+        build_number=0,
+        channel="defaults",
+        subdir="linux-64",
+        fn="foo-1.0-0.tar.bz2",
+    )
+    package_info = PackageInfo(
+        extracted_package_dir=str(extracted),
+        package_tarball_full_path=f"{extracted}.tar.bz2",
+        channel=Channel("defaults"),
+        repodata_record=record,
+        url="https://some.com/place/foo-1.0-0.tar.bz2",
+        index_json_record=record,
+        icondata=None,
+        package_metadata=None,
+        paths_data=PathsData(paths_version=1, paths=()),
+    )
+
+    def verify(sha256: str) -> SafetyError | None:
+        return LinkPathAction(
+            {},
+            package_info,
+            str(extracted),
+            "lib/foo.py",
+            str(tmp_path / "env"),
+            "lib/foo.py",
+            LinkType.hardlink,
+            PathDataV1(
+                _path="lib/foo.py",
+                path_type=PathEnum.hardlink,
+                sha256=sha256,
+                size_in_bytes=len(data),
+            ),
+        ).verify()
+
+    assert verify(hashlib.sha256(data).hexdigest()) is None
+    VerifiedHashes.for_package(str(extracted)).save()
+    monkeypatch.setattr(verified_hashes, "compute_sum", pytest.fail)
+    assert verify(hashlib.sha256(data).hexdigest()) is None
+    assert isinstance(verify("0" * 64), SafetyError)
@@ -11,7 +11,17 @@ import pytest
 
 from conda.common.compat import on_win
 from conda.gateways.disk.create import TemporaryDirectory, create_link, mkdir_p
-from conda.gateways.disk.delete import backoff_rmdir, rm_rf, unlink_or_rename_to_trash
+from conda.base.context import reset_context
+from conda.gateways.disk.delete import (
+    TRASH_DIRNAME,
+    backoff_rmdir,
+    delete_trash,
+    path_is_clean,
+    rm_rf,
+    rm_rf_in_background,
+    unlink_or_rename_to_trash,
+    wait_for_background_deletion,
+)
 from conda.gateways.disk.link import islink, symlink
 from conda.gateways.disk.permissions import make_read_only
 from conda.gateways.disk.test import softlink_supported
@@ -21,6 +31,8 @@ from conda.models.enums import LinkType
 from .test_permissions import _try_open, tempdir
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pytest_mock import MockerFixture
 
 
@@ -207,3 +219,41 @@ def test_unlink_to_rename_to_trash_win_fallback(
     # The counter suffix must have been applied; dest filename should end with .conda_trash_1
     call_args = mock_check_output.call_args[0][0]
     assert call_args[-1].endswith(".conda_trash_1")
+
+
+@pytest.mark.parametrize("background", [True, False])
+def test_rm_rf_in_background(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, background: bool
+):
+    monkeypatch.setenv("CONDA_DELETE_IN_BACKGROUND", str(background))
+    reset_context()
+    prefix = tmp_path / "prefix"
+    package = prefix / "lib" / "package"
+    package.mkdir(parents=True)
+    (package / "module.py").write_text("data")
+    (prefix / "conda-meta").mkdir()
+
+    assert rm_rf_in_background(
+        package, str(prefix / TRASH_DIRNAME), clean_empty_parents=True
+    )
+    assert not (prefix / "lib").exists()
+    assert (prefix / TRASH_DIRNAME).exists() is background
+    assert path_is_clean(prefix / "lib")
+    wait_for_background_deletion()
+    assert not (prefix / TRASH_DIRNAME).exists()
+    assert (prefix / "conda-meta").exists()
+
+
+def test_delete_trash_resumes_deletion(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("CONDA_DELETE_IN_BACKGROUND", "true")
+    reset_context()
+    # left by a process that exited before deleting it
+    leftover = tmp_path / TRASH_DIRNAME / "0123456789abcdef" / "lib"
+    leftover.mkdir(parents=True)
+    (leftover / "module.py").write_text("data")
+
+    delete_trash(str(tmp_path))
+    wait_for_background_deletion()
+    assert not (tmp_path / TRASH_DIRNAME).exists()
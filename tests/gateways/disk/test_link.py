@@ -7,9 +7,11 @@ from pathlib import Path
 import pytest
 
 from conda.common.compat import on_win
+from conda.gateways.disk.create import create_link, reflink
 from conda.gateways.disk.link import islink, link, readlink, symlink
-from conda.gateways.disk.test import softlink_supported
+from conda.gateways.disk.test import reflink_supported, softlink_supported
 from conda.gateways.disk.update import touch
+from conda.models.enums import LinkType
 
 
 def test_hard_link(tmp_path: Path):
@@ -66,3 +68,35 @@ def test_soft_link(tmp_path: Path):
     os.unlink(path2_symlink)
     assert not lexists(path2_symlink)
     assert not exists(path2_symlink)
+
+
+def test_reflink(tmp_path: Path):
+    source = tmp_path / "source"
+    source.write_bytes(b"data")
+    source.chmod(0o755)
+    target = tmp_path / "target"
+
+    if reflink_supported(str(source), str(tmp_path)):
+        reflink(str(source), str(target))
+    else:
+        with pytest.raises(OSError):
+            reflink(str(source), str(target))
+        assert not lexists(target)
+        # falls back to a copy
+        create_link(str(source), str(target), LinkType.reflink)
+
+    assert target.read_bytes() == b"data"
+    assert os.lstat(source).st_ino != os.lstat(target).st_ino
+    assert os.lstat(source).st_mode == os.lstat(target).st_mode
+    target.write_bytes(b"modified")
+    assert source.read_bytes() == b"data"
+
+
+def test_reflink_supported_probed_once(tmp_path: Path, mocker):
+    probe = mocker.patch("conda.gateways.disk.test._probe_reflink", return_value=True)
+    mocker.patch.dict("conda.gateways.disk.test._reflink_support", clear=True)
+    for name in ("a", "b"):
+        touch(tmp_path / name)
+        assert reflink_supported(str(tmp_path / name), str(tmp_path))
+    # both files are on the same file system
+    assert probe.call_count == 1
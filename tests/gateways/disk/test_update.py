@@ -0,0 +1,47 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+from __future__ import annotations
+
+import os
+import stat
+from typing import TYPE_CHECKING
+
+import pytest
+
+from conda.common.compat import on_win
+from conda.gateways.disk.update import _umask, atomic_write
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_atomic_write(tmp_path: Path):
+    path = tmp_path / "file.json"
+    path.write_text("old")
+    with atomic_write(path) as fh:
+        fh.write("new")
+        assert path.read_text() == "old"
+    assert path.read_text() == "new"
+    assert os.listdir(tmp_path) == ["file.json"]
+
+    with atomic_write(str(path), "wb") as fh:
+        fh.write(b"bytes")
+    assert path.read_bytes() == b"bytes"
+
+
+def test_atomic_write_error(tmp_path: Path):
+    path = tmp_path / "file.json"
+    path.write_text("old")
+    with pytest.raises(ValueError), atomic_write(path) as fh:
+        fh.write("partial")
+        raise ValueError()
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["file.json"]
+
+
+@pytest.mark.skipif(on_win, reason="POSIX permissions")
+def test_atomic_write_permissions(tmp_path: Path):
+    path = tmp_path / "file.json"
+    with atomic_write(path) as fh:
+        fh.write("data")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~_umask()
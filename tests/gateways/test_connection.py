@@ -274,6 +274,24 @@ def test_get_session_returns_default():
     assert type(session_obj) is CondaSession
 
 
+@pytest.mark.parametrize("repodata_threads,pool_maxsize", [(0, 10), (4, 10), (32, 32)])
+def test_session_pool_maxsize(
+    monkeypatch: MonkeyPatch, repodata_threads: int, pool_maxsize: int
+):
+    """
+    The HTTP adapter keeps alive a connection for each repodata download thread.
+    """
+    monkeypatch.setattr(context, "_default_threads", 0)
+    monkeypatch.setattr(context, "_repodata_threads", repodata_threads)
+    # sessions are cached per thread, create one with the patched context
+    CondaSession.cache_clear()
+    try:
+        adapter = CondaSession().get_adapter("https://conda.anaconda.org/")
+        assert adapter._pool_maxsize == pool_maxsize
+    finally:
+        CondaSession.cache_clear()
+
+
 def test_get_session_with_channel_settings(mocker):
     """
     Tests to make sure the get_session function works when ``channel_settings``
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 from __future__ import annotations
 
+import pickle
 from typing import TYPE_CHECKING
 
 import pytest
@@ -10,7 +11,7 @@ from conda.base.constants import CONDA_PACKAGE_EXTENSION_V1, CONDA_PACKAGE_EXTEN
 
 if TYPE_CHECKING:
     from pytest_benchmark.fixture import BenchmarkFixture
-from conda.base.context import context
+from conda.base.context import context, reset_context
 from conda.cli.common import spec_from_line
 from conda.common.compat import on_win
 from conda.exceptions import InvalidMatchSpec, InvalidSpec
@@ -18,13 +19,12 @@ from conda.models.channel import Channel
 from conda.models.dist import Dist
 from conda.models.match_spec import (
     _BRACKETS_KV_RE,
-    _PARSE_CACHE,
     ChannelMatch,
     MatchSpec,
     _parse_spec_str,
 )
 from conda.models.records import PackageRecord
-from conda.models.version import VersionSpec
+from conda.models.version import VersionSpec, spec_cache_clear, spec_cache_info
 
 blas_value = "accelerate" if context.subdir == "osx-64" else "openblas"
 
@@ -32,9 +32,9 @@ blas_value = "accelerate" if context.subdir == "osx-64" else "openblas"
 @pytest.fixture
 def match_spec_v3(solver_rattler):
     """Activate the v3 MatchSpec parser by setting the solver to rattler."""
-    _PARSE_CACHE.clear()
+    spec_cache_clear()
     yield
-    _PARSE_CACHE.clear()
+    spec_cache_clear()
 
 
 def m(string) -> str:
@@ -130,6 +130,49 @@ def test_match_1(benchmark: BenchmarkFixture):
         MatchSpec((1, 2, 3))
 
 
+@pytest.mark.parametrize(
+    "spec_str",
+    [
+        "numpy",
+        "numpy 1.7*",
+        "numpy >=1.5,<2",
+        "numpy >1.8,<2|>=1.7.1",
+        "numpy * py27*",
+        "numpy 1.7.1 py27_0",
+        "numpy[build_number=1]",
+        "num*",
+        "*[version='>=1.7']",
+        "*",
+        "scipy",
+    ],
+)
+def test_filter(spec_str):
+    records = [
+        DPkg("numpy-1.7.1-py27_0.tar.bz2"),
+        DPkg("numpy-1.7.1-py26_1.tar.bz2"),
+        DPkg("numpy-1.8.0-py27_1.tar.bz2"),
+        DPkg("numpy-2.0.0-py27_0.tar.bz2"),
+        DPkg("numexpr-1.7.0-py27_0.tar.bz2"),
+        DPkg("python-2.7.5-0.tar.bz2"),
+    ]
+    spec = MatchSpec(spec_str)
+    expected = [rec for rec in records if spec.match(rec)]
+    assert list(spec.filter(records)) == expected
+    assert all(isinstance(spec.match(rec), bool) for rec in records)
+
+
+def test_pickle_after_match():
+    spec = MatchSpec("numpy >=1.5,<2 py27*")
+    record = DPkg("numpy-1.7.1-py27_0.tar.bz2")
+    assert spec.match(record)
+    assert list(spec.filter([record])) == [record]
+
+    unpickled = pickle.loads(pickle.dumps(spec))
+    assert unpickled == spec
+    assert unpickled.match(record)
+    assert not unpickled.match(DPkg("numpy-2.0.0-py27_0.tar.bz2"))
+
+
 def test_no_name_match_spec():
     ms = MatchSpec(track_features="mkl")
     assert str(ms) == "*[track_features=mkl]"
@@ -156,7 +199,8 @@ def test_hash():
     d = MatchSpec(c, optional=True)
     assert d.optional
     assert not c.optional
-    assert a is not b
+    # identical spec strings are interned
+    assert a is b
     assert a is not c
     assert a is not d
     assert a == b
@@ -2219,3 +2263,20 @@ def test_flags_serialization_is_sorted(match_spec_v3):
 )
 def test_parse_ecosystem_corpus(spec_str):
     MatchSpec(spec_str)
+
+
+def test_spec_cache_info():
+    spec_cache_clear()
+    for _ in range(3):
+        MatchSpec("numpy >=1.20,<2 py3*")
+    info = spec_cache_info()
+    assert info["MatchSpec"].misses == 1
+    assert info["MatchSpec"].hits == 2
+    assert info["_parse_spec_str"].misses == 1
+    # the version spec was parsed once when the MatchSpec was built
+    assert info["VersionSpec"].currsize >= 1
+    assert all(cache.maxsize for cache in info.values())
+
+    # reset_context() empties every spec cache, including the interned MatchSpecs
+    reset_context()
+    assert not any(cache.currsize for cache in spec_cache_info().values())
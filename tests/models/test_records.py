@@ -1,8 +1,12 @@
 # Copyright (C) 2012 Anaconda, Inc
 # SPDX-License-Identifier: BSD-3-Clause
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
 import pytest
 
 from conda.base.context import context
+from conda.common.serialize import json
 from conda.core.prefix_data import PrefixData
 from conda.models.channel import Channel
 from conda.models.enums import PackageType
@@ -243,6 +247,38 @@ def test_record_spec_strings_inheritance(record_class, extra_kwargs):
     assert hasattr(rec, "spec_no_build")
 
 
+def test_prefix_record_from_summary_threaded(tmp_path):
+    """
+    Threads reading the manifest fields of the same records at once all see the
+    files listed in ``conda-meta``.
+    """
+    threads = 8
+    files = tuple(f"lib/file-{i}.txt" for i in range(100))
+    records = []
+    for i in range(50):
+        summary = dict(
+            name=f"pkg-{i}",
+            version="1.0",
+            build="0",
+            build_number=0,
+            channel="defaults",
+            subdir="noarch",
+        )
+        manifest_path = tmp_path / f"pkg-{i}-1.0-0.json"
+        manifest_path.write_text(json.dumps({**summary, "files": files}))
+        records.append(PrefixRecord.from_summary(summary, manifest_path))
+    barrier = Barrier(threads)
+
+    def read_files():
+        barrier.wait()
+        return [record.files for record in records]
+
+    with ThreadPoolExecutor(threads) as executor:
+        results = [executor.submit(read_files) for _ in range(threads)]
+        for result in results:
+            assert result.result() == [files] * len(records)
+
+
 @pytest.mark.integration
 def test_requested_spec(tmp_env, test_recipes_channel):
     specs = ("dependent", "dependent[version='>=2']")
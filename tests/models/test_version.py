@@ -6,7 +6,14 @@ from random import shuffle
 import pytest
 
 from conda.exceptions import InvalidVersionSpec
-from conda.models.version import VersionOrder, VersionSpec, normalized_version, ver_eval
+from conda.models.version import (
+    OPERATOR_MAP,
+    VersionOrder,
+    VersionSpec,
+    normalized_version,
+    ver_eval,
+    version_relation_re,
+)
 
 
 def test_version_order():
@@ -95,6 +102,7 @@ def test_version_order():
 
     # check __lt__
     assert sorted(versions, key=lambda x: x[1]) == versions
+    assert sorted(versions, key=lambda x: x[1].sort_key) == versions
 
     # check startswith
     assert VersionOrder("0.4.1").startswith(VersionOrder("0"))
@@ -135,6 +143,25 @@ def test_openssl_convention():
     shuffled = copy(openssl)
     shuffle(shuffled)
     assert sorted(shuffled) == openssl
+    assert sorted(shuffled, key=lambda v: v.sort_key) == openssl
+
+
+@pytest.mark.parametrize(
+    "versions",
+    [
+        ("1.1a", "1.1", "1.1.0", "1.1.0.0.1", "1.1.0post", "1.1.1"),
+        ("1.0.0.a", "1.0.a", "1.0", "1.0.0.1", "1.0.1"),
+        ("1.0.dev", "1.0.0.0.b", "1.0", "1.0+a", "1.0+0.a", "1.0+0.0", "1.0+1"),
+        ("0", "0a", "0.0.0.1", "0.1", "0!9", "1!0"),
+    ],
+)
+def test_sort_key(versions):
+    versions = [VersionOrder(v) for v in versions]
+    for v1 in versions:
+        assert v1.sort_key is VersionOrder(str(v1)).sort_key
+        for v2 in versions:
+            assert (v1 < v2) == (v1.sort_key < v2.sort_key)
+            assert (v1 == v2) == (v1.sort_key == v2.sort_key)
 
 
 def test_pep440():
@@ -329,6 +356,24 @@ def test_match():
         assert m.match("1.7.1") == res, vspec
 
 
+@pytest.mark.parametrize(
+    "version",
+    ("1.6", "1.7", "1.7.0", "1.7.1", "1.7.1.post1", "1.7.1a", "1.8.0dev", "1!1.7.1"),
+)
+@pytest.mark.parametrize(
+    "vspec",
+    (">=1.7", "<1.7.1", "!=1.7", "==1.7.1", "1.7.1", ">1.7,<1.8", ">=1.7,<2,!=1.7.1"),
+)
+def test_match_sort_key(vspec, version):
+    # relational specs compare sort keys; make sure they agree with VersionOrder
+    ref = True
+    for part in vspec.split(","):
+        match = version_relation_re.match(part)
+        operator_str, vo_str = match.groups() if match else ("==", part)
+        ref &= OPERATOR_MAP[operator_str](VersionOrder(version), VersionOrder(vo_str))
+    assert VersionSpec(vspec).match(version) == ref
+
+
 def test_local_identifier():
     """The separator for the local identifier should be either `.` or `+`"""
     # a valid versionstr should match itself
@@ -0,0 +1,140 @@
+# Copyright (C) 2012 Anaconda, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+"""
+Test publishing monolithic repodata as shards.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+from typing import TYPE_CHECKING
+
+import msgpack
+import pytest
+
+from conda._private import zstd
+from conda._private.shards import cache as shards_cache
+from conda._private.shards.misc import ensure_hex_hash
+from conda._private.shards.publish import main, publish_shards
+from conda._private.shards.shards import (
+    ShardFetch,
+    Shards,
+    fetch_shards_index,
+    split_repodata,
+)
+from conda.base.constants import REPODATA_FN, REPODATA_SHARDS_FN
+from conda.base.context import reset_context
+from conda.common.compat import on_win
+from conda.common.url import path_to_url
+from conda.core.subdir_data import SubdirData
+from conda.models.channel import Channel
+
+from .conftest import FAKE_REPODATA, ensure_hex_hash as repodata_hex_hash
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def read_msgpack_zst(path: Path):
+    return msgpack.loads(zstd.decompress(path.read_bytes()))
+
+
+def test_publish_shards(tmp_path: Path):
+    subdir = tmp_path / "channel" / "noarch"
+    subdir.mkdir(parents=True)
+    repodata = repodata_hex_hash(FAKE_REPODATA)
+    (subdir / REPODATA_FN).write_text(json.dumps(repodata))
+
+    result = publish_shards(subdir)
+    assert sorted(result.written) == ["bar", "foo"]
+    assert not result.reused
+
+    index = read_msgpack_zst(subdir / REPODATA_SHARDS_FN)
+    assert index["info"]["subdir"] == "noarch"
+    assert index["info"]["shards_base_url"] == ""
+    assert sorted(index["shards"]) == ["bar", "foo"]
+
+    expected = split_repodata(repodata)
+    for package, digest in index["shards"].items():
+        shard = read_msgpack_zst(subdir / f"{digest.hex()}.msgpack.zst")
+        # hashes are stored as bytes, like other sharded channels
+        assert isinstance(shard["packages.conda"][f"{package}.conda"]["sha256"], bytes)
+        for group in ("packages", "packages.conda"):
+            for record in shard[group].values():
+                ensure_hex_hash(record)
+        assert shard == expected[package]
+
+
+def test_publish_shards_incremental(tmp_path: Path):
+    repodata = repodata_hex_hash(FAKE_REPODATA)
+    publish_shards(tmp_path, repodata)
+    before = read_msgpack_zst(tmp_path / REPODATA_SHARDS_FN)["shards"]
+
+    result = publish_shards(tmp_path, repodata)
+    assert not result.written
+    assert sorted(result.reused) == ["bar", "foo"]
+    assert read_msgpack_zst(tmp_path / REPODATA_SHARDS_FN)["shards"] == before
+
+    repodata["packages.conda"]["bar.conda"] = {
+        **repodata["packages.conda"]["bar.conda"],
+        "version": "2",
+    }
+    result = publish_shards(tmp_path, repodata)
+    assert result.written == ["bar"]
+    assert result.reused == ["foo"]
+    assert result.removed == [f"{before['bar'].hex()}.msgpack.zst"]
+    after = read_msgpack_zst(tmp_path / REPODATA_SHARDS_FN)["shards"]
+    assert after["foo"] == before["foo"]
+    assert after["bar"] != before["bar"]
+    expected = {f"{digest.hex()}.msgpack.zst" for digest in after.values()}
+    assert {path.name for path in tmp_path.glob("*.msgpack.zst")} == {
+        REPODATA_SHARDS_FN,
+        *expected,
+    }
+
+
+def test_publish_shards_main(tmp_path: Path, capsys: pytest.CaptureFixture):
+    (tmp_path / REPODATA_FN).write_text(json.dumps(repodata_hex_hash(FAKE_REPODATA)))
+    main([str(tmp_path), "--shards-base-url", "shards"])
+    assert "2 written, 0 reused, 0 removed" in capsys.readouterr().out
+    index = read_msgpack_zst(tmp_path / REPODATA_SHARDS_FN)
+    assert index["info"]["shards_base_url"] == "shards"
+    assert len(list((tmp_path / "shards").glob("*.msgpack.zst"))) == 2
+
+
+def test_fetch_published_shards(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    fetch_shards_index() picks up shards published into a file:// channel.
+    """
+    monkeypatch.setenv("CONDA_PKGS_DIRS", str(tmp_path / "pkgs"))
+    reset_context()
+
+    subdir = tmp_path / "channel" / "noarch"
+    subdir.mkdir(parents=True)
+    repodata = repodata_hex_hash(FAKE_REPODATA)
+    publish_shards(subdir, repodata, shards_base_url="shards")
+
+    found = fetch_shards_index(SubdirData(Channel(path_to_url(str(subdir)))))
+    assert isinstance(found, Shards)
+    assert sorted(found.package_names) == ["bar", "foo"]
+    assert found.shard_url("foo").startswith(path_to_url(str(subdir / "shards")))
+
+    with shards_cache.ShardCache(tmp_path) as cache:
+        shard = ShardFetch(found, "foo", cache).fetch()
+        assert cache.retrieve(found.shard_url("foo")) == shard
+    for record in shard["packages.conda"].values():
+        ensure_hex_hash(record)
+    assert shard == split_repodata(repodata)["foo"]
+
+
+@pytest.mark.skipif(on_win, reason="POSIX permissions")
+def test_publish_shards_permissions(tmp_path: Path):
+    umask = os.umask(0o022)
+    try:
+        publish_shards(tmp_path, repodata_hex_hash(FAKE_REPODATA))
+    finally:
+        os.umask(umask)
+    for path in tmp_path.glob("*.msgpack.zst"):
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
@@ -6,6 +6,7 @@ Test sharded repodata.
 
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
 import json
 import logging
@@ -28,6 +29,7 @@ from conda._private.shards import cache as shards_cache
 from conda._private.shards import shards
 from conda._private.shards import subset as shards_subset
 from conda._private.shards.shards import (
+    IndexedShardLike,
     ShardLike,
     Shards,
     _repodata_shards,
@@ -36,9 +38,13 @@ from conda._private.shards.shards import (
     batch_retrieve_from_cache,
     fetch_channels,
     fetch_shards_index,
+    load_shardlike,
+    read_shardlike_index,
     shard_mentioned_packages,
+    write_shardlike_index,
 )
 from conda.base.context import context, reset_context
+from conda.common.compat import on_win
 from conda.core.subdir_data import SubdirData
 from conda.exceptions import UnavailableInvalidChannel
 from conda.gateways.repodata import FORMAT_JSON, FORMAT_SHARDS
@@ -46,9 +52,11 @@ from conda.models.channel import Channel
 
 from .conftest import (
     CONDA_FORGE_WITH_SHARDS,
+    FAKE_REPODATA,
     ROOT_PACKAGES,
     _run_test_server,
     _timer,
+    ensure_hex_hash,
     expand_channels,
 )
 
@@ -896,6 +904,11 @@ def test_shard_cache_multiple(
     none_retrieved = cache.retrieve_multiple([])  # coverage
     assert none_retrieved == {}
 
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        assert cache.retrieve_multiple(
+            [shard.url for shard in fake_shards], executor
+        ) == cache.retrieve_multiple([shard.url for shard in fake_shards])
+
     start_multiple = time.monotonic_ns()
     retrieved = cache.retrieve_multiple([shard.url for shard in fake_shards])
     end_multiple = time.monotonic_ns()
@@ -1100,6 +1113,90 @@ def test_shardlike_repr():
     assert shardlike.url == url
 
 
+def test_shardlike_index_roundtrip(tmp_path: Path):
+    """
+    A ShardLike written as a sidecar index reads back lazily, per package.
+    """
+    url = "https://conda.anaconda.org/channel/noarch/repodata.json"
+    shardlike = ShardLike(ensure_hex_hash(FAKE_REPODATA), url)
+    path = tmp_path / "repodata.shardlike"
+    write_shardlike_index(path, shardlike, ["etag", "mod", 1])
+
+    assert read_shardlike_index(path, ["other", "mod", 1], url) is None
+    assert read_shardlike_index(tmp_path / "missing", ["etag", "mod", 1], url) is None
+
+    indexed = read_shardlike_index(path, ["etag", "mod", 1], url)
+    assert isinstance(indexed, IndexedShardLike)
+    assert sorted(indexed.package_names) == sorted(shardlike.package_names)
+    assert indexed.repodata_no_packages == shardlike.repodata_no_packages
+    assert indexed.shard_url("foo") == shardlike.shard_url("foo")
+    assert indexed.shard_loaded("foo")
+    with pytest.raises(KeyError):
+        indexed.shard_url("ghost")
+
+    assert not indexed.shards
+    assert indexed.visit_package("foo") == shardlike.visit_package("foo")
+    assert list(indexed.shards) == ["foo"]
+    assert dict(indexed.iter_records()) == dict(shardlike.iter_records())
+
+    path.write_bytes(b"garbage")
+    assert read_shardlike_index(path, ["etag", "mod", 1], url) is None
+    path.write_bytes(b"")
+    assert read_shardlike_index(path, ["etag", "mod", 1], url) is None
+
+
+@pytest.mark.skipif(on_win, reason="a mapped file cannot be replaced on Windows")
+def test_shardlike_index_replaced(tmp_path: Path):
+    """
+    An IndexedShardLike keeps decoding the index it was read from after the
+    sidecar is rewritten for newer repodata.
+    """
+    url = "https://conda.anaconda.org/channel/noarch/repodata.json"
+    shardlike = ShardLike(ensure_hex_hash(FAKE_REPODATA), url)
+    path = tmp_path / "repodata.shardlike"
+    write_shardlike_index(path, shardlike, ["etag", "mod", 1])
+    indexed = read_shardlike_index(path, ["etag", "mod", 1], url)
+    assert indexed
+
+    repodata = ensure_hex_hash(FAKE_REPODATA)
+    repodata["packages"] = {}
+    repodata["info"]["extra"] = "x" * 1000
+    write_shardlike_index(path, ShardLike(repodata, url), ["etag", "mod", 2])
+
+    for package in shardlike.package_names:
+        assert indexed.visit_package(package) == shardlike.visit_package(package)
+
+
+def test_load_shardlike_reuses_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    The second load of unchanged monolithic repodata skips parsing and grouping.
+    """
+    monkeypatch.setenv("CONDA_PKGS_DIRS", str(tmp_path / "pkgs"))
+    reset_context()
+
+    subdir = tmp_path / "channel" / "noarch"
+    subdir.mkdir(parents=True)
+    (subdir / "repodata.json").write_text(json.dumps(ensure_hex_hash(FAKE_REPODATA)))
+    channel = Channel(subdir.as_uri())
+    url = f"{channel.url()}/repodata.json"
+
+    first = load_shardlike(SubdirData(channel), url)
+    assert type(first) is ShardLike
+    second = load_shardlike(SubdirData(channel), url)
+    assert isinstance(second, IndexedShardLike)
+    assert second.url == url
+    for package in first.package_names:
+        assert second.visit_package(package) == first.visit_package(package)
+
+    # a changed repodata.json invalidates the index
+    repodata = ensure_hex_hash(FAKE_REPODATA)
+    repodata["packages"] = {}
+    (subdir / "repodata.json").write_text(json.dumps(repodata))
+    third = load_shardlike(SubdirData(channel), url)
+    assert type(third) is ShardLike
+    assert not third.visit_package("foo")["packages"]
+
+
 def test_shard_hash_as_array():
     """
     Test that shard hashes can be bytes or list[int], for rattler compatibility.
@@ -1641,7 +1738,7 @@ def test_fetch_channels_skips_classic_for_shards_only_url(
         fake_fetch_shards_index,
     )
 
-    spy = mocker.spy(RepodataFetch, "fetch_latest_parsed")
+    spy = mocker.spy(RepodataFetch, "fetch_latest")
     result = fetch_channels(
         {
             good_url: Channel(good_url),
@@ -710,22 +710,71 @@ def test_shards_cache_thread(
 
     cache_thread.start()
 
-    # combined into a single output batch
-    batch = shard_out_queue.get(timeout=QUEUE_TIMEOUT)
-    for node_id, shard in batch:
-        assert node_id in fake_nodes
+    # combined into a single batch, sent in chunks as they are decoded
+    received = {}
+    while len(received) < len(fake_nodes):
+        for node_id, shard in shard_out_queue.get(timeout=QUEUE_TIMEOUT):
+            assert node_id not in received
+            received[node_id] = shard
+    assert set(received) == set(fake_nodes)
+    for node_id, shard in received.items():
         assert shard == cache.retrieve(node_id.shard_url)
 
-    # no "done" sentinel in shard_out_queue
-    with pytest.raises(queue.Empty):
-        shard_out_queue.get_nowait()
-
     while notfound := network_out_queue.get(timeout=QUEUE_TIMEOUT):
         for node_id in notfound:
             assert node_id.shard_url.startswith("https://example.com/notfound")
 
     cache_thread.join(5)
 
+    # no "done" sentinel in shard_out_queue
+    with pytest.raises(queue.Empty):
+        shard_out_queue.get_nowait()
+
+
+def test_shards_cache_thread_corrupt_shard(
+    shard_cache_with_data: tuple[
+        shards_cache.ShardCache, list[shards_cache.AnnotatedRawShard]
+    ],
+):
+    """
+    A shard that fails to decode on the decode pool is reported on
+    shard_out_queue, and the other shards are still delivered.
+    """
+    cache, fake_shards = shard_cache_with_data
+    corrupt = shards_cache.AnnotatedRawShard(
+        "https://example.com/corrupt", "corrupt", b"not zstd"
+    )
+    cache.insert(corrupt)
+
+    in_queue: SimpleQueue[list[NodeId] | None] = SimpleQueue()
+    shard_out_queue: SimpleQueue = SimpleQueue()
+    network_out_queue: SimpleQueue[list[NodeId]] = SimpleQueue()
+
+    fake_nodes = [
+        NodeId(shard.package, channel="", shard_url=shard.url) for shard in fake_shards
+    ]
+    in_queue.put([*fake_nodes, NodeId("corrupt", channel="", shard_url=corrupt.url)])
+    in_queue.put(None)
+
+    shards_subset.cache_fetch_thread(
+        in_queue, shard_out_queue, network_out_queue, cache
+    )
+    assert network_out_queue.get_nowait() is None
+
+    received = []
+    errors = []
+    with suppress(queue.Empty):
+        while True:
+            item = shard_out_queue.get_nowait()
+            if isinstance(item, Exception):
+                errors.append(item)
+            else:
+                received.extend(node_id for node_id, _ in item)
+    assert len(errors) == 1
+    # only the corrupt shard's chunk is lost
+    assert received
+    assert set(received) <= set(fake_nodes)
+
 
 def test_shards_network_thread(http_server_shards, shard_cache_with_data, monkeypatch):
     """
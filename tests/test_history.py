@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from pathlib import Path
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
 import pytest
 
 from conda.history import History
+from conda.models.match_spec import MatchSpec
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
@@ -293,3 +295,30 @@ def test_history_malformed(tmp_history):
         results = history.parse()
 
         assert results == []
+
+
+def test_history_index(tmp_history: History, mocker: MockerFixture):
+    prefix_data = mocker.patch("conda.history.PrefixData").return_value
+    prefix_data.iter_records.return_value = [SimpleNamespace(name="python")]
+    history = tmp_history
+    history.init_log_file()
+    history.write_changes(set(), {"python-3.12.0-0"})
+    history.write_specs(update_specs=["python 3.12"])
+    assert Path(history.index_path).is_file()
+
+    # reading only parses what was appended since the index was written
+    with open(history.path, "a") as fh:
+        fh.write("==> 2024-01-01 00:00:00 <==\n# cmd: conda install numpy\n")
+    parse_lines = mocker.spy(History, "_parse_lines")
+    assert [rev[0] for rev in history.parse()][1:] == ["2024-01-01 00:00:00"]
+    assert parse_lines.call_args.args[0] == [
+        "==> 2024-01-01 00:00:00 <==",
+        "# cmd: conda install numpy",
+    ]
+    assert history.get_requested_specs_map() == {"python": MatchSpec("python 3.12")}
+
+    # rewritten history invalidates the index
+    with open(history.path, "w") as fh:
+        fh.write("==> 2024-01-02 00:00:00 <==\n+python-3.11.0-0\n")
+    assert history.parse() == [("2024-01-02 00:00:00", {"+python-3.11.0-0"}, [])]
+    assert history.get_requested_specs_map() == {}
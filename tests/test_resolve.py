@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from conda.base.context import context, reset_context
 from conda.common.compat import on_win
 from conda.exceptions import UnsatisfiableError
 from conda.models.match_spec import MatchSpec
@@ -72,3 +73,38 @@ def test_solve_wrong_version_calls_find_conflicts(
         "direct": set(),
         "virtual_package": set(),
     }
+
+
+def _conflicting_resolve() -> Resolve:
+    records = (
+        helpers.record(name="a", depends=["c 1.*"]),
+        helpers.record(name="b", depends=["c 2.*"]),
+        helpers.record(name="c", version="1.0"),
+        helpers.record(name="c", version="2.0"),
+    )
+    return Resolve({rec: rec for rec in records})
+
+
+def test_build_conflict_map_reports_chains() -> None:
+    bad_deps = _conflicting_resolve().build_conflict_map(
+        {MatchSpec("a"), MatchSpec("b")}
+    )
+    chains = {chain for chain, _ in bad_deps["direct"]}
+    assert chains == {
+        (MatchSpec("a"), MatchSpec("c 1.*")),
+        (MatchSpec("b"), MatchSpec("c 2.*")),
+    }
+
+
+def test_build_conflict_map_timeout(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setenv("CONDA_UNSATISFIABLE_HINTS_TIMEOUT_SECS", "1e-9")
+    reset_context()
+    assert context.unsatisfiable_hints_timeout_secs == 1e-9
+
+    bad_deps = _conflicting_resolve().build_conflict_map(
+        {MatchSpec("a"), MatchSpec("b")}
+    )
+    assert not any(bad_deps.values())
+    assert "may be incomplete" in caplog.text